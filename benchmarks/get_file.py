@@ -0,0 +1,96 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measure the download throughput of Client.get_file with and without pipelined chunk requests.
+
+The media DC is replaced by a local fake that answers upload.GetFile after a fixed round trip time, so that the
+numbers only depend on how many requests are kept in flight.
+
+Usage (from the repository root): python -m benchmarks.get_file
+"""
+
+import asyncio
+import os
+import time
+
+from kurimypyrogram import Client, raw
+from kurimypyrogram.file_id import FileId, FileType
+
+CHUNK_SIZE = 1024 * 1024
+FILE_SIZE = 32 * CHUNK_SIZE
+RTT = 0.05
+
+
+class FakeDC:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.requests = 0
+
+    async def invoke(self, query, *args, **kwargs):
+        self.requests += 1
+
+        await asyncio.sleep(RTT)
+
+        return raw.types.upload.File(
+            type=raw.types.storage.FilePartial(),
+            mtime=0,
+            bytes=self.data[query.offset:query.offset + query.limit]
+        )
+
+
+async def download(window: int, dc: FakeDC) -> float:
+    client = Client("benchmark", in_memory=True, download_window=window)
+
+    async def get_media_session(dc_id):
+        return dc
+
+    client.get_media_session = get_media_session
+
+    file_id = FileId(
+        file_type=FileType.DOCUMENT,
+        dc_id=2,
+        media_id=1,
+        access_hash=1,
+        file_reference=b""
+    )
+
+    start = time.perf_counter()
+    received = 0
+
+    async for chunk in client.get_file(file_id, FILE_SIZE):
+        received += len(chunk)
+
+    elapsed = time.perf_counter() - start
+
+    assert received == FILE_SIZE
+
+    return elapsed
+
+
+async def main():
+    dc = FakeDC(os.urandom(FILE_SIZE))
+
+    print(f"{FILE_SIZE // CHUNK_SIZE} MiB, {RTT * 1000:.0f} ms round trip")
+
+    for window in (1, 2, 4, 8):
+        elapsed = await download(window, dc)
+        print(f"window={window}: {elapsed:.2f} s ({FILE_SIZE / CHUNK_SIZE / elapsed:.1f} MiB/s)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
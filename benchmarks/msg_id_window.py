@@ -0,0 +1,73 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compare the replay-protection window against the sorted list it replaced.
+
+Usage (from the repository root): python -m benchmarks.msg_id_window
+"""
+
+import bisect
+import time
+import timeit
+
+from kurimypyrogram.session.internals import MsgIdWindow
+
+SIZE = 1000 * 2
+COUNT = 100_000
+
+
+def msg_ids():
+    base = int(time.time()) * 2 ** 32
+    return [base + i * 4 + 1 for i in range(COUNT)]
+
+
+def sorted_list(ids):
+    stored = []
+
+    for msg_id in ids:
+        if len(stored) > SIZE:
+            del stored[:SIZE // 2]
+
+        if stored:
+            if msg_id < stored[0]:
+                raise ValueError
+            if msg_id in stored:
+                raise ValueError
+
+        bisect.insort(stored, msg_id)
+
+
+def window(ids):
+    stored = MsgIdWindow(SIZE)
+
+    for msg_id in ids:
+        if stored:
+            if stored.is_below(msg_id):
+                raise ValueError
+            if msg_id in stored:
+                raise ValueError
+
+        stored.add(msg_id)
+
+
+if __name__ == "__main__":
+    ids = msg_ids()
+
+    for func in (sorted_list, window):
+        best = min(timeit.repeat(lambda: func(ids), number=1, repeat=5))
+        print(f"{func.__name__:>12}: {best / COUNT * 1e9:8.1f} ns/msg")
@@ -0,0 +1,65 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measure the time and memory taken by importing kurimypyrogram in a fresh interpreter.
+
+Usage (from the repository root): python -m benchmarks.startup
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+
+RUNS = 5
+
+CHILD = """
+import json, resource, time
+
+start = time.perf_counter()
+import kurimypyrogram
+{extra}
+elapsed = time.perf_counter() - start
+
+print(json.dumps([elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss]))
+"""
+
+# Resolves every constructor, as importing the whole raw API eagerly would
+LOAD_ALL = """
+from kurimypyrogram.raw.all import objects
+for i in objects:
+    kurimypyrogram.raw.objects[i]
+"""
+
+
+def measure(extra: str = "") -> tuple:
+    results = [
+        json.loads(subprocess.run(
+            [sys.executable, "-c", CHILD.format(extra=extra)],
+            capture_output=True, check=True, text=True
+        ).stdout)
+        for _ in range(RUNS)
+    ]
+
+    return statistics.median(r[0] for r in results), statistics.median(r[1] for r in results)
+
+
+if __name__ == "__main__":
+    for name, extra in (("import kurimypyrogram", ""), ("with every raw class loaded", LOAD_ALL)):
+        elapsed, rss = measure(extra)
+        print(f"{name:>28}: {elapsed * 1000:7.1f} ms, {rss / 1024:6.1f} MiB max RSS")
@@ -0,0 +1,113 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Measure the receive throughput of the TCP transports for 1 MiB frames.
+
+A local server streams abridged frames as fast as it can, the client reads them back with TCPAbridged. The previous
+StreamReader based loop (``data += chunk``) is timed on the same stream for comparison.
+
+Usage (from the repository root): python -m benchmarks.tcp_recv
+"""
+
+import asyncio
+import os
+import time
+
+from kurimypyrogram.connection.transport import TCPAbridged
+
+FRAME_SIZE = 1024 * 1024
+FRAMES = 256
+
+
+async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    await reader.readexactly(1)  # Abridged transport tag
+
+    length = FRAME_SIZE // 4
+    frame = b"\x7f" + length.to_bytes(3, "little") + os.urandom(FRAME_SIZE)
+
+    for _ in range(FRAMES):
+        writer.write(frame)
+        await writer.drain()
+
+    writer.close()
+
+
+async def legacy_recv(reader: asyncio.StreamReader, length: int) -> bytes:
+    data = b""
+
+    while len(data) < length:
+        chunk = await asyncio.wait_for(reader.read(length - len(data)), 10)
+
+        if not chunk:
+            raise ConnectionError
+
+        data += chunk
+
+    return data
+
+
+async def bench_legacy(port: int) -> float:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"\xef")
+
+    start = time.perf_counter()
+
+    for _ in range(FRAMES):
+        length = await legacy_recv(reader, 1)
+
+        if length == b"\x7f":
+            length = await legacy_recv(reader, 3)
+
+        await legacy_recv(reader, int.from_bytes(length, "little") * 4)
+
+    elapsed = time.perf_counter() - start
+    writer.close()
+
+    return elapsed
+
+
+async def bench_buffered(port: int) -> float:
+    tcp = TCPAbridged(ipv6=False, proxy=None)
+    await tcp.connect(("127.0.0.1", port))
+
+    start = time.perf_counter()
+
+    for _ in range(FRAMES):
+        frame = await tcp.recv()
+        assert len(frame) == FRAME_SIZE
+
+    elapsed = time.perf_counter() - start
+    await tcp.close()
+
+    return elapsed
+
+
+async def main():
+    server = await asyncio.start_server(serve, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    for name, bench in (("StreamReader", bench_legacy), ("FrameBuffer", bench_buffered)):
+        elapsed = await bench(port)
+        print(f"{name:>12}: {FRAMES * FRAME_SIZE / elapsed / 1024 / 1024:8.1f} MiB/s")
+
+    server.close()
+    await server.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
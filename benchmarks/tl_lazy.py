@@ -0,0 +1,75 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+"""Compare decoding update payloads eagerly against decoding them lazily, as done with Client(lazy_updates=True).
+
+Usage (from the repository root): python -m benchmarks.tl_lazy
+"""
+
+import timeit
+
+from kurimypyrogram import raw
+from kurimypyrogram.raw.all import updates as update_constructors
+from kurimypyrogram.raw.core import TLObject, tl_object
+from .tl_vector import user, message
+
+SIZES = (100, 1000, 5000)
+
+
+def updates(size: int) -> bytes:
+    # Mostly statuses and read receipts, one update in ten is a new message
+    return raw.types.Updates(
+        updates=[
+            raw.types.UpdateNewMessage(message=message(i), pts=i, pts_count=1) if i % 10 == 0
+            else raw.types.UpdateUserStatus(user_id=i, status=raw.types.UserStatusOnline(expires=i)) if i % 2
+            else raw.types.UpdateReadHistoryInbox(
+                peer=raw.types.PeerUser(user_id=i), max_id=i, still_unread_count=0, pts=i, pts_count=1
+            )
+            for i in range(size)
+        ],
+        users=[user(i) for i in range(size // 10)],
+        chats=[],
+        date=1700000000,
+        seq=0
+    ).write()
+
+
+def handle(data: bytes, consumed: tuple) -> None:
+    # Peers are always read, updates only when a handler consumes them
+    result, _ = TLObject.read_from(memoryview(data), 0)
+
+    for u in result.users:
+        u.access_hash
+
+    for update in result.updates:
+        if isinstance(update, consumed):
+            getattr(update, "pts", None)
+
+
+if __name__ == "__main__":
+    for name, consumed in (("nothing", ()), ("messages", (raw.types.UpdateNewMessage,)), ("everything", (TLObject,))):
+        for size in SIZES:
+            data = updates(size)
+
+            tl_object.lazy.clear()
+            eager = min(timeit.repeat(lambda: handle(data, consumed), number=1, repeat=20))
+
+            tl_object.lazy.update(update_constructors)
+            lazy = min(timeit.repeat(lambda: handle(data, consumed), number=1, repeat=20))
+
+            print(f"Consuming {name:>10}, {size:>5} updates ({len(data) / 1024:7.1f} KiB): "
+                  f"eager {eager * 1000:7.2f} ms, lazy {lazy * 1000:7.2f} ms ({eager / lazy:.2f}x)")
@@ -0,0 +1,58 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compare decoding responses from a BytesIO against decoding them from a memoryview with a cursor.
+
+Usage (from the repository root): python -m benchmarks.tl_read
+"""
+
+import timeit
+from io import BytesIO
+
+from kurimypyrogram import raw
+from kurimypyrogram.raw.core import TLObject
+from .tl_vector import history, difference
+
+SIZES = (100, 1000)
+
+
+def updates(size: int) -> bytes:
+    return raw.types.Updates(
+        updates=[
+            raw.types.UpdateReadHistoryInbox(
+                peer=raw.types.PeerUser(user_id=i), max_id=i, still_unread_count=0, pts=i, pts_count=1
+            )
+            for i in range(size)
+        ],
+        users=[],
+        chats=[],
+        date=1700000000,
+        seq=0
+    ).write()
+
+
+if __name__ == "__main__":
+    for name, payload in (("GetHistory", history), ("GetDifference", difference), ("Updates", updates)):
+        for size in SIZES:
+            data = payload(size)
+
+            bytes_io = min(timeit.repeat(lambda: TLObject.read(BytesIO(data)), number=1, repeat=10))
+            view = min(timeit.repeat(lambda: TLObject.read_from(memoryview(data), 0), number=1, repeat=10))
+
+            print(f"{name:>13} {size:>5} items ({len(data) / 1024:7.1f} KiB): "
+                  f"BytesIO {bytes_io * 1000:7.2f} ms, memoryview {view * 1000:7.2f} ms ({bytes_io / view:.2f}x)")
@@ -0,0 +1,105 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compare decoding large vector-heavy responses with and without draining the buffer to size vectors.
+
+Usage (from the repository root): python -m benchmarks.tl_vector
+"""
+
+import timeit
+from io import BytesIO
+
+from kurimypyrogram import raw
+from kurimypyrogram.raw.core import List, TLObject, Vector
+from kurimypyrogram.raw.core.primitives import Int
+
+SIZES = (100, 1000, 5000)
+
+
+def legacy_read(cls, data, t=None, *args):
+    # How vectors were read before element types were passed in by the generated code
+    if t is TLObject:
+        t = None
+
+    count = Int.read(data)
+    left = len(data.read())
+    size = (left / count) if count else 0
+    data.seek(-left, 1)
+
+    return List(
+        t.read(data) if t
+        else Vector.read_bare(data, size)
+        for _ in range(count)
+    )
+
+
+def user(i: int) -> raw.types.User:
+    return raw.types.User(id=i, access_hash=i, first_name=f"User {i}", username=f"user{i}")
+
+
+def message(i: int) -> raw.types.Message:
+    return raw.types.Message(
+        id=i,
+        peer_id=raw.types.PeerUser(user_id=i),
+        from_id=raw.types.PeerUser(user_id=i),
+        date=1700000000 + i,
+        message=f"Message number {i} " * 4,
+        entities=[raw.types.MessageEntityBold(offset=0, length=7), raw.types.MessageEntityItalic(offset=8, length=6)]
+    )
+
+
+def history(size: int) -> bytes:
+    return raw.types.messages.Messages(
+        messages=[message(i) for i in range(size)],
+        chats=[],
+        users=[user(i) for i in range(size)]
+    ).write()
+
+
+def difference(size: int) -> bytes:
+    return raw.types.updates.Difference(
+        new_messages=[message(i) for i in range(size)],
+        new_encrypted_messages=[],
+        other_updates=[raw.types.UpdateUserStatus(user_id=i, status=raw.types.UserStatusOnline(expires=i))
+                       for i in range(size)],
+        chats=[],
+        users=[user(i) for i in range(size)],
+        state=raw.types.updates.State(pts=1, qts=1, date=1, seq=1, unread_count=0)
+    ).write()
+
+
+def decode(data: bytes):
+    return TLObject.read(BytesIO(data))
+
+
+if __name__ == "__main__":
+    read = Vector.__dict__["read"]
+
+    for name, payload in (("GetHistory", history), ("GetDifference", difference)):
+        for size in SIZES:
+            data = payload(size)
+            times = []
+
+            for method in (classmethod(legacy_read), read):
+                Vector.read = method
+                times.append(min(timeit.repeat(lambda: decode(data), number=1, repeat=5)))
+
+            Vector.read = read
+
+            print(f"{name:>13} {size:>5} items ({len(data) / 1024:8.1f} KiB): "
+                  f"drain {times[0] * 1000:8.2f} ms, typed {times[1] * 1000:8.2f} ms")
@@ -0,0 +1,74 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Compare building the plaintext of outgoing packets by serializing bodies twice, to get their length and then to
+write them, against serializing them once into the shared buffer the packet is built in. Encryption is left out.
+
+Usage (from the repository root): python -m benchmarks.tl_write
+"""
+
+import timeit
+
+from kurimypyrogram import raw
+from kurimypyrogram.raw.core import Message, MsgContainer, Long
+from kurimypyrogram.session.internals import MsgFactory
+
+SIZES = (1, 10, 100)
+
+
+def query(i: int) -> raw.functions.messages.SendMessage:
+    return raw.functions.messages.SendMessage(
+        peer=raw.types.InputPeerUser(user_id=i, access_hash=i),
+        message=f"Message number {i} " * 16,
+        random_id=i,
+        entities=[raw.types.MessageEntityBold(offset=0, length=7)]
+    )
+
+
+def twice(queries: list) -> bytes:
+    # The body is serialized once by len() and once more while writing the packet
+    messages = [Message(q, 0, 0, len(q)) for q in queries]
+    body = messages[0] if len(messages) == 1 else MsgContainer(messages)
+
+    return Long(0) + bytes(8) + Message(body, 0, 0, len(body)).write()
+
+
+def once(queries: list) -> bytearray:
+    factory = MsgFactory()
+    messages = [factory(q) for q in queries]
+    message = messages[0] if len(messages) == 1 else factory(MsgContainer(messages))
+
+    data = bytearray(Long(0))
+    data += bytes(8)
+    message.write_into(data)
+
+    return data
+
+
+if __name__ == "__main__":
+    for size in SIZES:
+        queries = [query(i) for i in range(size)]
+        number = 1000 // size
+
+        results = [
+            min(timeit.repeat(lambda: func(queries), number=number, repeat=5)) / number
+            for func in (twice, once)
+        ]
+
+        print(f"{size:>4} queries: serialized twice {results[0] * 1e6:8.1f} us, "
+              f"once {results[1] * 1e6:8.1f} us ({results[0] / results[1]:.2f}x)")
@@ -41,6 +41,10 @@ FLAGS_RE_3 = re.compile(r"flags(\d?):#")
 INT_RE = re.compile(r"int(\d+)")
 
 CORE_TYPES = ["int", "long", "int128", "int256", "double", "bytes", "string", "Bool", "true"]
+# struct format of the fixed-size core types, consecutive ones are unpacked together
+FIXED_TYPES = {"int": "i", "long": "q", "double": "d"}
+# size of the core types that can be skipped without looking at their content
+SIZED_TYPES = {"int": 4, "long": 8, "double": 8, "int128": 16, "int256": 32, "Bool": 4}
 
 WARNING = """
 # # # # # # # # # # # # # # # # # # # # # # # #
@@ -149,6 +153,217 @@ def sort_args(args):
     return args + flags
 
 
+def get_struct(structs: dict, fmt: str) -> str:
+    """Get the name of the module-level struct unpacker for a format, adding it if needed"""
+    if fmt not in structs:
+        structs[fmt] = f"STRUCT_{len(structs)}"
+
+    return structs[fmt]
+
+
+def get_read_from(args, structs: dict) -> str:
+    """Build the body of a memoryview-based read_from() method"""
+    lines = []
+    run = []
+    deferred = []
+
+    def flush():
+        if run:
+            name = get_struct(structs, "<" + "".join(FIXED_TYPES[t] for _, t in run))
+            names = ", ".join(n for n, _ in run)
+
+            lines.append(f"{names}{',' if len(run) == 1 else ''} = {name}.unpack_from(b, cursor)")
+            lines.append(f"cursor += {name}.size")
+            run.clear()
+
+        lines.extend(deferred)
+        deferred.clear()
+
+    for arg_name, arg_type in args:
+        flag = FLAGS_RE_2.match(arg_type)
+
+        if re.match(r"flags\d?", arg_name) and arg_type == "#":
+            run.append((arg_name, "int"))
+        elif flag:
+            number, index, flag_type = flag.groups()
+            condition = f"flags{number} & (1 << {index})"
+
+            if flag_type == "true":
+                deferred.append(f"{arg_name} = True if {condition} else False")
+                continue
+
+            flush()
+
+            if flag_type in CORE_TYPES:
+                read, default = f"{flag_type.title()}.read_from(b, cursor)", "None"
+            elif "vector" in flag_type.lower():
+                sub_type = arg_type.split("<")[1][:-1]
+                read = "TLObject.read_from(b, cursor, {})".format(
+                    sub_type.title() if sub_type in CORE_TYPES else "TLObject"
+                )
+                default = "[]"
+            else:
+                read, default = "TLObject.read_from(b, cursor)", "None"
+
+            lines.append(f"{arg_name}, cursor = {read} if {condition} else ({default}, cursor)")
+        elif arg_type in FIXED_TYPES:
+            run.append((arg_name, arg_type))
+        else:
+            flush()
+
+            if arg_type in CORE_TYPES:
+                read = f"{arg_type.title()}.read_from(b, cursor)"
+            elif "vector" in arg_type.lower():
+                sub_type = arg_type.split("<")[1][:-1]
+                read = "TLObject.read_from(b, cursor, {})".format(
+                    sub_type.title() if sub_type in CORE_TYPES else "TLObject"
+                )
+            else:
+                read = "TLObject.read_from(b, cursor)"
+
+            lines.append(f"{arg_name}, cursor = {read}")
+
+    flush()
+
+    return "\n        ".join(lines)
+
+
+def get_skip_from(args, structs: dict) -> str:
+    """Build the body of a skip_from() method, which only finds where the object ends"""
+    lines = []
+    # Bytes of fixed-size fields not yet added to the cursor
+    size = 0
+
+    def flush():
+        nonlocal size
+
+        if size:
+            lines.append(f"cursor += {size}")
+            size = 0
+
+    for arg_name, arg_type in args:
+        flag = FLAGS_RE_2.match(arg_type)
+
+        if re.match(r"flags\d?", arg_name) and arg_type == "#":
+            name = get_struct(structs, "<i")
+            offset = f"cursor + {size}" if size else "cursor"
+
+            lines.append(f"{arg_name}, = {name}.unpack_from(b, {offset})")
+            size += 4
+        elif flag:
+            number, index, flag_type = flag.groups()
+
+            if flag_type == "true":
+                continue
+
+            flush()
+
+            if flag_type in SIZED_TYPES:
+                skip = f"cursor += {SIZED_TYPES[flag_type]}"
+            elif flag_type in CORE_TYPES:
+                skip = f"cursor = {flag_type.title()}.skip_from(b, cursor)"
+            elif "vector" in flag_type.lower():
+                sub_type = arg_type.split("<")[1][:-1]
+                skip = "cursor = Vector.skip_from(b, cursor + 4{})".format(
+                    f", {sub_type.title()}" if sub_type in CORE_TYPES else ", TLObject"
+                )
+            else:
+                skip = "cursor = TLObject.skip_from(b, cursor)"
+
+            lines.append(f"if flags{number} & (1 << {index}):\n            {skip}")
+        elif arg_type in SIZED_TYPES:
+            size += SIZED_TYPES[arg_type]
+        else:
+            flush()
+
+            if arg_type in CORE_TYPES:
+                lines.append(f"cursor = {arg_type.title()}.skip_from(b, cursor)")
+            elif "vector" in arg_type.lower():
+                sub_type = arg_type.split("<")[1][:-1]
+                lines.append("cursor = Vector.skip_from(b, cursor + 4{})".format(
+                    f", {sub_type.title()}" if sub_type in CORE_TYPES else ", TLObject"
+                ))
+            else:
+                lines.append("cursor = TLObject.skip_from(b, cursor)")
+
+    lines.append(f"return cursor + {size}" if size else "return cursor")
+
+    return "\n        ".join(lines)
+
+
+def get_write_into(args, structs: dict) -> str:
+    """Build the body of a write_into() method appending to a shared bytearray"""
+    lines = []
+    # The constructor id starts the first run of fixed-size fields
+    run = [("self.ID", "I")]
+
+    def flush():
+        if run:
+            name = get_struct(structs, "<" + "".join(fmt for _, fmt in run))
+            lines.append(f"b += {name}.pack({', '.join(value for value, _ in run)})")
+            run.clear()
+
+    # Flags only depend on the fields, they are computed up front so that they can be packed along with them
+    for arg_name, arg_type in args:
+        if re.match(r"flags\d?", arg_name) and arg_type == "#":
+            lines.append(f"{arg_name} = 0")
+
+            for i in args:
+                flag = FLAGS_RE_2.match(i[1])
+
+                if flag and arg_name == f"flags{flag.group(1)}":
+                    if flag.group(3) == "true" or flag.group(3).startswith("Vector"):
+                        lines.append(f"{arg_name} |= (1 << {flag.group(2)}) if self.{i[0]} else 0")
+                    else:
+                        lines.append(f"{arg_name} |= (1 << {flag.group(2)}) if self.{i[0]} is not None else 0")
+
+    if lines:
+        lines.append("")
+
+    for arg_name, arg_type in args:
+        flag = FLAGS_RE_2.match(arg_type)
+
+        if re.match(r"flags\d?", arg_name) and arg_type == "#":
+            run.append((arg_name, "I"))
+        elif flag:
+            number, index, flag_type = flag.groups()
+
+            if flag_type == "true":
+                continue
+
+            flush()
+
+            if flag_type in CORE_TYPES:
+                write = f"{flag_type.title()}.write_into(b, self.{arg_name})"
+            elif "vector" in flag_type.lower():
+                sub_type = arg_type.split("<")[1][:-1]
+                write = "Vector.write_into(b, self.{}{})".format(
+                    arg_name, f", {sub_type.title()}" if sub_type in CORE_TYPES else ""
+                )
+            else:
+                write = f"self.{arg_name}.write_into(b)"
+
+            lines.append(f"if self.{arg_name} is not None:\n            {write}")
+        elif arg_type in FIXED_TYPES:
+            run.append((f"self.{arg_name}", FIXED_TYPES[arg_type]))
+        else:
+            flush()
+
+            if arg_type in CORE_TYPES:
+                lines.append(f"{arg_type.title()}.write_into(b, self.{arg_name})")
+            elif "vector" in arg_type.lower():
+                sub_type = arg_type.split("<")[1][:-1]
+                lines.append("Vector.write_into(b, self.{}{})".format(
+                    arg_name, f", {sub_type.title()}" if sub_type in CORE_TYPES else ""
+                ))
+            else:
+                lines.append(f"self.{arg_name}.write_into(b)")
+
+    flush()
+
+    return "\n        ".join(lines).replace("\n        \n", "\n\n")
+
+
 def remove_whitespaces(source: str) -> str:
     """Remove whitespaces from blank lines"""
     lines = source.split("\n")
@@ -448,34 +663,12 @@ def start(format: bool = False):
                              f"            :nosignatures:\n\n" \
                              f"            " + references
 
-        write_types = read_types = "" if c.has_flags else "# No flags\n        "
+        read_types = "" if c.has_flags else "# No flags\n        "
 
         for arg_name, arg_type in c.args:
             flag = FLAGS_RE_2.match(arg_type)
 
             if re.match(r"flags\d?", arg_name) and arg_type == "#":
-                write_flags = []
-
-                for i in c.args:
-                    flag = FLAGS_RE_2.match(i[1])
-
-                    if flag:
-                        if arg_name != f"flags{flag.group(1)}":
-                            continue
-
-                        if flag.group(3) == "true" or flag.group(3).startswith("Vector"):
-                            write_flags.append(f"{arg_name} |= (1 << {flag.group(2)}) if self.{i[0]} else 0")
-                        else:
-                            write_flags.append(
-                                f"{arg_name} |= (1 << {flag.group(2)}) if self.{i[0]} is not None else 0")
-
-                write_flags = "\n        ".join([
-                    f"{arg_name} = 0",
-                    "\n        ".join(write_flags),
-                    f"b.write(Int({arg_name}))\n        "
-                ])
-
-                write_types += write_flags
                 read_types += f"\n        {arg_name} = Int.read(b)\n        "
 
                 continue
@@ -487,58 +680,39 @@ def start(format: bool = False):
                     read_types += "\n        "
                     read_types += f"{arg_name} = True if flags{number} & (1 << {index}) else False"
                 elif flag_type in CORE_TYPES:
-                    write_types += "\n        "
-                    write_types += f"if self.{arg_name} is not None:\n            "
-                    write_types += f"b.write({flag_type.title()}(self.{arg_name}))\n        "
-
                     read_types += "\n        "
                     read_types += f"{arg_name} = {flag_type.title()}.read(b) if flags{number} & (1 << {index}) else None"
                 elif "vector" in flag_type.lower():
                     sub_type = arg_type.split("<")[1][:-1]
 
-                    write_types += "\n        "
-                    write_types += f"if self.{arg_name} is not None:\n            "
-                    write_types += "b.write(Vector(self.{}{}))\n        ".format(
-                        arg_name, f", {sub_type.title()}" if sub_type in CORE_TYPES else ""
-                    )
-
                     read_types += "\n        "
-                    read_types += "{} = TLObject.read(b{}) if flags{} & (1 << {}) else []\n        ".format(
-                        arg_name, f", {sub_type.title()}" if sub_type in CORE_TYPES else "", number, index
+                    read_types += "{} = TLObject.read(b, {}) if flags{} & (1 << {}) else []\n        ".format(
+                        arg_name, sub_type.title() if sub_type in CORE_TYPES else "TLObject", number, index
                     )
                 else:
-                    write_types += "\n        "
-                    write_types += f"if self.{arg_name} is not None:\n            "
-                    write_types += f"b.write(self.{arg_name}.write())\n        "
-
                     read_types += "\n        "
                     read_types += f"{arg_name} = TLObject.read(b) if flags{number} & (1 << {index}) else None\n        "
             else:
                 if arg_type in CORE_TYPES:
-                    write_types += "\n        "
-                    write_types += f"b.write({arg_type.title()}(self.{arg_name}))\n        "
-
                     read_types += "\n        "
                     read_types += f"{arg_name} = {arg_type.title()}.read(b)\n        "
                 elif "vector" in arg_type.lower():
                     sub_type = arg_type.split("<")[1][:-1]
 
-                    write_types += "\n        "
-                    write_types += "b.write(Vector(self.{}{}))\n        ".format(
-                        arg_name, f", {sub_type.title()}" if sub_type in CORE_TYPES else ""
-                    )
-
                     read_types += "\n        "
-                    read_types += "{} = TLObject.read(b{})\n        ".format(
-                        arg_name, f", {sub_type.title()}" if sub_type in CORE_TYPES else ""
+                    read_types += "{} = TLObject.read(b, {})\n        ".format(
+                        arg_name, sub_type.title() if sub_type in CORE_TYPES else "TLObject"
                     )
                 else:
-                    write_types += "\n        "
-                    write_types += f"b.write(self.{arg_name}.write())\n        "
-
                     read_types += "\n        "
                     read_types += f"{arg_name} = TLObject.read(b)\n        "
 
+        structs = {}
+        read_from_types = get_read_from(c.args, structs)
+        write_into_types = get_write_into(c.args, structs)
+        skip_from_types = get_skip_from(c.args, structs)
+        structs = "\n".join(f'{name} = Struct("{fmt}")' for fmt, name in structs.items())
+
         slots = ", ".join([f'"{i[0]}"' for i in sorted_args])
         return_arguments = ", ".join([f"{i[0]}={i[0]}" for i in sorted_args])
 
@@ -553,7 +727,10 @@ def start(format: bool = False):
             arguments=arguments,
             fields=fields,
             read_types=read_types,
-            write_types=write_types,
+            structs=f"\n{structs}\n" if structs else "",
+            read_from_types=read_from_types,
+            skip_from_types=skip_from_types,
+            write_into_types=write_into_types,
             return_arguments=return_arguments
         )
 
@@ -578,53 +755,35 @@ def start(format: bool = False):
 
         d[c.namespace].append(c.name)
 
-    for namespace, types in namespaces_to_types.items():
-        with open(DESTINATION_PATH / "base" / namespace / "__init__.py", "w") as f:
-            f.write(f"{notice}\n\n")
-            f.write(f"{WARNING}\n\n")
-
-            for t in types:
-                module = t
+    for path, namespaces in (
+        ("base", namespaces_to_types),
+        ("types", namespaces_to_constructors),
+        ("functions", namespaces_to_functions)
+    ):
+        for namespace, types in namespaces.items():
+            with open(DESTINATION_PATH / path / namespace / "__init__.py", "w") as f:
+                f.write(f"{notice}\n\n")
+                f.write(f"{WARNING}\n\n")
 
-                if module == "Updates":
-                    module = "UpdatesT"
+                f.write("from kurimypyrogram.raw.core.lazy import lazy_attributes\n\n")
+                f.write("# Classes are imported from their own modules the first time they are accessed\n")
+                f.write("classes = {")
 
-                f.write(f"from .{snake(module)} import {t}\n")
+                for t in types:
+                    module = t
 
-            if not namespace:
-                f.write(f"from . import {', '.join(filter(bool, namespaces_to_types))}")
+                    if module == "Updates":
+                        module = "UpdatesT"
 
-    for namespace, types in namespaces_to_constructors.items():
-        with open(DESTINATION_PATH / "types" / namespace / "__init__.py", "w") as f:
-            f.write(f"{notice}\n\n")
-            f.write(f"{WARNING}\n\n")
+                    f.write(f'\n    "{t}": "{snake(module)}",')
 
-            for t in types:
-                module = t
+                f.write("\n}\n\n")
 
-                if module == "Updates":
-                    module = "UpdatesT"
+                sub_namespaces = list(filter(bool, namespaces)) if not namespace else []
 
-                f.write(f"from .{snake(module)} import {t}\n")
-
-            if not namespace:
-                f.write(f"from . import {', '.join(filter(bool, namespaces_to_constructors))}\n")
-
-    for namespace, types in namespaces_to_functions.items():
-        with open(DESTINATION_PATH / "functions" / namespace / "__init__.py", "w") as f:
-            f.write(f"{notice}\n\n")
-            f.write(f"{WARNING}\n\n")
-
-            for t in types:
-                module = t
-
-                if module == "Updates":
-                    module = "UpdatesT"
-
-                f.write(f"from .{snake(module)} import {t}\n")
-
-            if not namespace:
-                f.write(f"from . import {', '.join(filter(bool, namespaces_to_functions))}")
+                f.write("namespaces = [{}]\n\n".format(", ".join(f'"{n}"' for n in sub_namespaces)))
+                f.write("__all__ = [*classes, *namespaces]\n")
+                f.write("__getattr__, __dir__ = lazy_attributes(__name__, classes, namespaces)\n")
 
     with open(DESTINATION_PATH / "all.py", "w", encoding="utf-8") as f:
         f.write(notice + "\n\n")
@@ -644,6 +803,15 @@ def start(format: bool = False):
         f.write('\n    0x3072cfa1: "kurimypyrogram.raw.core.GzipPacked",')
         f.write('\n    0x5bb8e511: "kurimypyrogram.raw.core.Message",')
 
+        f.write("\n}\n\n")
+
+        # Constructors of the Update base type, which the lazy decoding mode defers
+        f.write("updates = {")
+
+        for c in combinators:
+            if c.section == "types" and c.qualtype == "Update":
+                f.write(f"\n    {c.id},")
+
         f.write("\n}\n")
 
 
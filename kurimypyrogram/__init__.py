@@ -20,8 +20,6 @@ __version__ = "2.1.22"
 __license__ = "GNU Lesser General Public License v3.0 (LGPL-3.0)"
 __copyright__ = "Copyright (C) 2017-present Dan <https://github.com/delivrance>"
 
-from concurrent.futures.thread import ThreadPoolExecutor
-
 
 class StopTransmission(Exception):
     pass
@@ -39,4 +37,14 @@ from . import raw, types, filters, handlers, emoji, enums
 from .client import Client
 from .sync import idle, compose
 
-crypto_executor = ThreadPoolExecutor(1, thread_name_prefix="CryptoWorker")
+from .crypto.scheduler import CryptoScheduler
+
+crypto_scheduler = CryptoScheduler()
+
+
+def __getattr__(name: str):
+    # The executor is replaced whenever the scheduler is resized, so it's always read from the scheduler
+    if name == "crypto_executor":
+        return crypto_scheduler.executor
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
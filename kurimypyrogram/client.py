@@ -19,12 +19,14 @@
 import asyncio
 import functools
 import inspect
+import itertools
 import logging
 import os
 import platform
 import re
 import shutil
 import sys
+from collections import deque
 from concurrent.futures.thread import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from hashlib import sha256
@@ -32,7 +34,8 @@ from importlib import import_module
 from io import StringIO, BytesIO
 from mimetypes import MimeTypes
 from pathlib import Path
-from typing import Union, List, Optional, Callable, AsyncGenerator, Type
+from typing import Union, List, Optional, Callable, AsyncGenerator, Type, BinaryIO
+from weakref import WeakValueDictionary
 
 import kurimypyrogram
 from kurimypyrogram import __version__, __license__
@@ -44,18 +47,20 @@ from kurimypyrogram.errors import CDNFileHashMismatch
 from kurimypyrogram.errors import (
     SessionPasswordNeeded,
     VolumeLocNotFound, ChannelPrivate,
-    BadRequest, AuthBytesInvalid,
-    FloodWait, FloodPremiumWait
+    BadRequest, AuthBytesInvalid, AuthKeyUnregistered,
+    FloodWait, FloodPremiumWait, FileReferenceExpired, MediaEmpty
 )
 from kurimypyrogram.handlers.handler import Handler
 from kurimypyrogram.methods import Methods
-from kurimypyrogram.session import Auth, Session
+from kurimypyrogram.session import Auth, Session, RetryPolicy, FloodControl, MediaSessionPool
 from kurimypyrogram.storage import Storage, FileStorage, MemoryStorage
 from kurimypyrogram.types import User, TermsOfService
 from kurimypyrogram.utils import ainput
 from .connection import Connection
 from .connection.transport import TCP, TCPAbridged
 from .dispatcher import Dispatcher
+from .download_sink import DownloadSink
+from .media_cache import MediaCache
 from .file_id import FileId, FileType, ThumbnailSource
 from .mime_types import mime_types
 from .parser import Parser
@@ -208,6 +213,62 @@ class Client(Methods):
         init_connection_params (:obj:`~kurimypyrogram.raw.base.JSONValue`, *optional*):
             Additional initConnection parameters.
             For now, only the tz_offset field is supported, for specifying timezone offset in seconds.
+
+        main_sessions (``int``, *optional*):
+            Number of parallel connections to open to the home DC once the client is initialized.
+            Requests are spread across them by picking the connection with the fewest requests in flight, while updates
+            are only received on the main one.
+            Defaults to 1.
+
+        max_media_sessions (``int``, *optional*):
+            Maximum number of parallel connections to open to each DC for uploads and downloads.
+            Connections are added on demand whenever all of them are busy and closed again after being idle for
+            *media_session_idle_timeout* seconds. Pass 1 to use a single connection per DC.
+            Defaults to 4.
+
+        media_session_idle_timeout (``float``, *optional*):
+            Number of seconds an additional media connection may stay unused before being closed.
+            Defaults to 60.
+
+        download_window (``int``, *optional*):
+            Number of file chunks requested ahead while downloading. Chunks are still delivered in order, but several
+            requests are kept in flight so that the download speed isn't bound to one chunk per round trip.
+            Pass 1 to request one chunk at a time.
+            Defaults to 4.
+
+        media_cache (:obj:`~kurimypyrogram.media_cache.MediaCache`, *optional*):
+            Pass a media cache to keep a copy of downloaded files on disk: :meth:`~kurimypyrogram.Client.download_media`
+            and :meth:`~kurimypyrogram.Client.stream_media` serve files found in the cache without contacting Telegram.
+            Defaults to None (no cache).
+
+        upload_cache (``bool``, *optional*):
+            Pass True to avoid uploading the same content twice: local files are hashed and, once sent, their file id
+            is kept in the session storage, so that sending identical bytes again reuses the file already on Telegram
+            servers. Files are uploaded again in case the stored file id can't be used anymore.
+            Defaults to False.
+
+        retry_policy (:obj:`~kurimypyrogram.session.RetryPolicy`, *optional*):
+            Pass a custom retry policy to control backoff, retry budgets per method and the per-DC circuit breaker
+            applied to requests failing due to network or server errors.
+            Defaults to a :obj:`~kurimypyrogram.session.RetryPolicy` with its default settings, which has no circuit
+            breaker.
+
+        flood_control (:obj:`~kurimypyrogram.session.FloodControl`, *optional*):
+            Pass a flood control instance to rate limit requests on the client side: calls are delayed to stay within
+            Telegram's sending limits and within the limits learnt from previous flood waits, instead of being rejected.
+            Defaults to None (no client-side rate limiting).
+
+        send_batch_window (``float``, *optional*):
+            Pass a time window in seconds to coalesce outgoing requests: messages queued within the window are packed
+            together (along with pending acknowledgements) and sent as a single encrypted container.
+            Useful for clients sending many small requests at once.
+            Defaults to None (every request is sent on its own).
+
+        lazy_updates (``bool``, *optional*):
+            Pass True to decode raw updates only when one of their fields is first accessed, so that updates no handler
+            consumes are never decoded. Messages of such updates are then left out of the message cache as well.
+            The setting applies to every client of the process, once enabled.
+            Defaults to False (updates are decoded as soon as they are received).
     """
 
     APP_VERSION = f"kurimypyrogram {__version__}"
@@ -228,6 +289,31 @@ class Client(Methods):
     UPDATES_WATCHDOG_INTERVAL = 15 * 60
 
     MAX_CONCURRENT_TRANSMISSIONS = 1
+    MAIN_SESSIONS = 1
+    MAX_MEDIA_SESSIONS = 4
+    MEDIA_SESSION_IDLE_TIMEOUT = 60
+    DOWNLOAD_WINDOW = 4
+    UPLOAD_HASHES_MAX_SIZE = 1024
+    CDN_HASH_PART_SIZE = 128 * 1024
+    # Times a file request is retried after the media session authorization was revoked
+    MEDIA_AUTH_RETRIES = 2
+
+    # Read-only queries that can be shared by concurrent callers when their serialized form is identical
+    SINGLE_FLIGHT_QUERIES = {
+        "functions.users.GetUsers",
+        "functions.users.GetFullUser",
+        "functions.channels.GetChannels",
+        "functions.channels.GetFullChannel",
+        "functions.channels.GetMessages",
+        "functions.messages.GetChats",
+        "functions.messages.GetFullChat",
+        "functions.messages.GetMessages",
+        "functions.contacts.ResolveUsername",
+        "functions.contacts.ResolvePhone",
+        "functions.messages.GetStickerSet",
+        "functions.messages.GetCustomEmojiDocuments",
+        "functions.help.GetConfig",
+    }
     MAX_MESSAGE_CACHE_SIZE = 10000
 
     mimetypes = MimeTypes()
@@ -268,7 +354,17 @@ class Client(Methods):
         client_platform: "enums.ClientPlatform" = enums.ClientPlatform.OTHER,
         init_connection_params: Optional["raw.base.JSONValue"] = None,
         connection_factory: Type[Connection] = Connection,
-        protocol_factory: Type[TCP] = TCPAbridged
+        protocol_factory: Type[TCP] = TCPAbridged,
+        main_sessions: int = MAIN_SESSIONS,
+        max_media_sessions: int = MAX_MEDIA_SESSIONS,
+        media_session_idle_timeout: float = MEDIA_SESSION_IDLE_TIMEOUT,
+        download_window: int = DOWNLOAD_WINDOW,
+        media_cache: Optional[MediaCache] = None,
+        upload_cache: bool = False,
+        retry_policy: Optional[RetryPolicy] = None,
+        flood_control: Optional[FloodControl] = None,
+        send_batch_window: Optional[float] = None,
+        lazy_updates: bool = False
     ):
         super().__init__()
 
@@ -305,6 +401,21 @@ class Client(Methods):
         self.init_connection_params = init_connection_params
         self.connection_factory = connection_factory
         self.protocol_factory = protocol_factory
+        self.main_sessions = main_sessions
+        self.max_media_sessions = max_media_sessions
+        self.media_session_idle_timeout = media_session_idle_timeout
+        self.download_window = max(1, download_window)
+        self.media_cache = media_cache
+        self.upload_cache = upload_cache
+        # Content hashes of local files, keyed by path, size and modification time
+        self.upload_hashes = {}
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.flood_control = flood_control
+        self.send_batch_window = send_batch_window
+        self.lazy_updates = lazy_updates
+
+        if self.lazy_updates:
+            raw.core.tl_object.lazy.update(raw.all.updates)
 
         self.executor = ThreadPoolExecutor(self.workers, thread_name_prefix="Handler")
 
@@ -326,6 +437,11 @@ class Client(Methods):
         self.parser: Parser = Parser(self)
 
         self.session: Optional[Session] = None
+        self.session_pool: List[Session] = []
+
+        self.inflight_queries = {}
+        self.single_flight_hits = 0
+        self.single_flight_misses = 0
 
         self.business_connections = {}
 
@@ -334,9 +450,13 @@ class Client(Methods):
 
         self.media_sessions = {}
         self.media_sessions_lock = asyncio.Lock()
+        self.media_session_locks = {}
+        self.cdn_sessions = {}
 
         self.save_file_semaphore = asyncio.Semaphore(self.max_concurrent_transmissions)
         self.get_file_semaphore = asyncio.Semaphore(self.max_concurrent_transmissions)
+        # Locks of the downloads in progress, keyed by temporary file path, gone once nobody uses them
+        self.download_locks = WeakValueDictionary()
 
         self.is_connected = None
         self.is_initialized = None
@@ -605,16 +725,20 @@ class Client(Methods):
             chats = {c.id: c for c in updates.chats}
 
             for update in updates.updates:
-                channel_id = getattr(
-                    getattr(
+                # The state is only read when needed, reading it decodes lazily read updates
+                if self.skip_updates and not is_min:
+                    channel_id = pts = pts_count = None
+                else:
+                    channel_id = getattr(
                         getattr(
-                            update, "message", None
-                        ), "peer_id", None
-                    ), "channel_id", None
-                ) or getattr(update, "channel_id", None)
+                            getattr(
+                                update, "message", None
+                            ), "peer_id", None
+                        ), "channel_id", None
+                    ) or getattr(update, "channel_id", None)
 
-                pts = getattr(update, "pts", None)
-                pts_count = getattr(update, "pts_count", None)
+                    pts = getattr(update, "pts", None)
+                    pts_count = getattr(update, "pts_count", None)
 
                 if pts and not self.skip_updates:
                     await self.storage.update_state(
@@ -859,36 +983,103 @@ class Client(Methods):
             else:
                 log.warning('[%s] No plugin loaded from "%s"', self.name, root)
 
-    async def handle_download(self, packet):
-        file_id, directory, file_name, in_memory, file_size, progress, progress_args = packet
+    async def handle_download(self, packet, semaphore: asyncio.Semaphore = None):
+        file_id, directory, file_name, in_memory, file_size, progress, progress_args, resume, refresh = packet
 
-        os.makedirs(directory, exist_ok=True) if not in_memory else None
-        temp_file_path = os.path.abspath(re.sub("\\\\", "/", os.path.join(directory, file_name))) + ".temp"
-        file = BytesIO() if in_memory else open(temp_file_path, "wb")
+        cached = await self.media_cache.get(file_id) if self.media_cache else None
 
-        try:
-            async for chunk in self.get_file(file_id, file_size, 0, 0, progress, progress_args):
-                file.write(chunk)
-        except BaseException as e:
-            if not in_memory:
-                file.close()
-                os.remove(temp_file_path)
+        if in_memory:
+            if cached:
+                file = BytesIO(await self.media_cache.read(cached))
+                file.name = file_name
+                return file
 
-            if isinstance(e, asyncio.CancelledError):
-                raise e
+            file = BytesIO()
 
-            if isinstance(e, (FloodWait, FloodPremiumWait)):
-                raise e
+            try:
+                async for chunk in self.get_file(file_id, file_size, 0, 0, progress, progress_args, semaphore=semaphore):
+                    file.write(chunk)
+            except BaseException as e:
+                if isinstance(e, (asyncio.CancelledError, FloodWait, FloodPremiumWait)):
+                    raise e
+
+                return None
+            else:
+                if self.media_cache and file.tell() > 0 and file_size in (0, file.tell()):
+                    await self.media_cache.put(file_id, file.getvalue())
 
-            return None
-        else:
-            if in_memory:
                 file.name = file_name
                 return file
+
+        os.makedirs(directory, exist_ok=True)
+        temp_file_path = os.path.abspath(re.sub("\\\\", "/", os.path.join(directory, file_name))) + ".temp"
+
+        if cached:
+            file_path = os.path.splitext(temp_file_path)[0]
+            await self.media_cache.copy(cached, file_path)
+            return file_path
+
+        # Downloads to the same path (e.g. the same media forwarded twice) would share the same file and chunk map
+        lock = self.download_locks.get(temp_file_path)
+
+        if lock is None:
+            lock = self.download_locks[temp_file_path] = asyncio.Lock()
+
+        async with lock:
+            sink = DownloadSink(temp_file_path, file_size, executor=self.executor, resumable=resume)
+
+            try:
+                await sink.open()
+
+                size = 0
+
+                # Give a download a second chance with a fresh file reference, in case the old one expired. The chunks
+                # already written are kept, whether the download is resumable or not
+                for attempt in range(2 if refresh else 1):
+                    if attempt > 0:
+                        file_id = await refresh()
+
+                    index = sink.first_missing()
+
+                    if sink.is_complete:
+                        break
+
+                    async for chunk in self.get_file(
+                        file_id, file_size, 0, index, progress, progress_args, semaphore=semaphore
+                    ):
+                        await sink.write(index, chunk)
+                        size = max(size, index * sink.chunk_size + len(chunk))
+                        index += 1
+
+                    if file_size == 0 or sink.is_complete:
+                        break
+                else:
+                    # The file ended early, a truncated download is never handed out as a complete one
+                    if resume:
+                        await sink.close()
+                    else:
+                        await sink.discard()
+
+                    return None
+            except BaseException as e:
+                if resume:
+                    await sink.close()
+                else:
+                    await sink.discard()
+
+                if isinstance(e, (asyncio.CancelledError, FloodWait, FloodPremiumWait)):
+                    raise e
+
+                return None
             else:
-                file.close()
+                await sink.finish(file_size if sink.is_complete else size)
+
                 file_path = os.path.splitext(temp_file_path)[0]
                 shutil.move(temp_file_path, file_path)
+
+                if self.media_cache and (sink.is_complete or file_size == 0 and size > 0):
+                    await self.media_cache.put(file_id, file_path)
+
                 return file_path
 
     async def get_file(
@@ -898,9 +1089,13 @@ class Client(Methods):
         limit: int = 0,
         offset: int = 0,
         progress: Callable = None,
-        progress_args: tuple = ()
+        progress_args: tuple = (),
+        start_byte: int = None,
+        end_byte: int = None,
+        semaphore: asyncio.Semaphore = None
     ) -> AsyncGenerator[bytes, None]:
-        async with self.get_file_semaphore:
+        # Batch downloads are throttled by their own scheduler instead of the client-wide semaphore
+        async with semaphore or self.get_file_semaphore:
             file_type = file_id.file_type
 
             if file_type == FileType.CHAT_PHOTO:
@@ -940,49 +1135,34 @@ class Client(Methods):
                     thumb_size=file_id.thumbnail_size
                 )
 
-            current = 0
-            total = abs(limit) or (1 << 31) - 1
             chunk_size = 1024 * 1024
-            offset_bytes = abs(offset) * chunk_size
+
+            if start_byte is None and end_byte is None:
+                parts = utils.get_file_parts(abs(offset) * chunk_size)
+
+                if limit:
+                    parts = itertools.islice(parts, abs(limit))
+            else:
+                start_byte = start_byte or 0
+                parts = utils.get_file_parts(start_byte, end_byte)
 
             dc_id = file_id.dc_id
 
-            try:
-                session = self.media_sessions.get(dc_id)
-                if not session:
-                    session = self.media_sessions[dc_id] = Session(
-                        self, dc_id,
-                        await Auth(self, dc_id, await self.storage.test_mode()).create()
-                        if dc_id != await self.storage.dc_id()
-                        else await self.storage.auth_key(),
-                        await self.storage.test_mode(),
-                        is_media=True
-                    )
-                    await session.start()
+            async def invoke(query: "raw.core.TLObject", is_cdn: bool = False, **kwargs):
+                for attempt in range(self.MEDIA_AUTH_RETRIES + 1):
+                    session = await (self.get_cdn_session(r.dc_id) if is_cdn else self.get_media_session(dc_id))
 
-                    if dc_id != await self.storage.dc_id():
-                        for _ in range(3):
-                            exported_auth = await self.invoke(
-                                raw.functions.auth.ExportAuthorization(
-                                    dc_id=dc_id
-                                )
-                            )
+                    try:
+                        return await session.invoke(query, **kwargs)
+                    except AuthKeyUnregistered as e:
+                        if attempt == self.MEDIA_AUTH_RETRIES:
+                            raise
 
-                            try:
-                                await session.invoke(
-                                    raw.functions.auth.ImportAuthorization(
-                                        id=exported_auth.id,
-                                        bytes=exported_auth.bytes
-                                    )
-                                )
-                            except AuthBytesInvalid:
-                                continue
-                            else:
-                                break
-                        else:
-                            raise AuthBytesInvalid
+                        # The session already forgot the revoked authorization, retry with a newly imported one
+                        log.warning("[%s] Retrying %s on a new media session: %s", self.name, query.QUALNAME, e)
 
-                r = await session.invoke(
+            async def get_chunk(offset_bytes: int, chunk_size: int) -> bytes:
+                r = await invoke(
                     raw.functions.upload.GetFile(
                         location=location,
                         offset=offset_bytes,
@@ -991,130 +1171,429 @@ class Client(Methods):
                     sleep_threshold=30
                 )
 
-                if isinstance(r, raw.types.upload.File):
-                    while True:
-                        chunk = r.bytes
+                return r.bytes
 
-                        yield chunk
+            # CDN file hashes by offset, shared by the whole download window
+            cdn_hashes = {}
+            cdn_hash_requests = {}
 
-                        current += 1
-                        offset_bytes += chunk_size
-
-                        if progress:
-                            func = functools.partial(
-                                progress,
-                                min(offset_bytes, file_size)
-                                if file_size != 0
-                                else offset_bytes,
-                                file_size,
-                                *progress_args
-                            )
+            async def fetch_cdn_hashes(offset_bytes: int):
+                hashes = await invoke(
+                    raw.functions.upload.GetCdnFileHashes(
+                        file_token=r.file_token,
+                        offset=offset_bytes
+                    )
+                )
 
-                            if inspect.iscoroutinefunction(progress):
-                                await func()
-                            else:
-                                await self.loop.run_in_executor(self.executor, func)
+                for h in hashes:
+                    cdn_hashes[h.offset] = h
+
+            async def get_cdn_hashes(offset_bytes: int, chunk_size: int) -> list:
+                hashes = []
+                offset = offset_bytes - offset_bytes % self.CDN_HASH_PART_SIZE
+
+                while offset < offset_bytes + chunk_size:
+                    if offset not in cdn_hashes:
+                        if offset not in cdn_hash_requests:
+                            cdn_hash_requests[offset] = self.loop.create_task(fetch_cdn_hashes(offset))
 
-                        if len(chunk) < chunk_size or current >= total:
+                        await asyncio.shield(cdn_hash_requests[offset])
+
+                        if offset not in cdn_hashes:
                             break
 
-                        r = await session.invoke(
-                            raw.functions.upload.GetFile(
-                                location=location,
-                                offset=offset_bytes,
-                                limit=chunk_size
-                            ),
-                            sleep_threshold=30
-                        )
+                    hashes.append(cdn_hashes[offset])
+                    offset += cdn_hashes[offset].limit
 
-                elif isinstance(r, raw.types.upload.FileCdnRedirect):
-                    cdn_session = Session(
-                        self, r.dc_id, await Auth(self, r.dc_id, await self.storage.test_mode()).create(),
-                        await self.storage.test_mode(), is_media=True, is_cdn=True
+                return hashes
+
+            def decrypt_cdn_chunk(chunk: bytes, offset_bytes: int, hashes: list) -> bytes:
+                # https://core.telegram.org/cdn#decrypting-files
+                decrypted_chunk = aes.ctr256_decrypt(
+                    chunk,
+                    r.encryption_key,
+                    bytearray(
+                        r.encryption_iv[:-4]
+                        + (offset_bytes // 16).to_bytes(4, "big")
                     )
+                )
 
-                    try:
-                        await cdn_session.start()
+                # https://core.telegram.org/cdn#verifying-files
+                end = 0
 
-                        while True:
-                            r2 = await cdn_session.invoke(
-                                raw.functions.upload.GetCdnFile(
-                                    file_token=r.file_token,
-                                    offset=offset_bytes,
-                                    limit=chunk_size
-                                )
-                            )
+                for h in hashes:
+                    if end >= len(decrypted_chunk):
+                        break
 
-                            if isinstance(r2, raw.types.upload.CdnFileReuploadNeeded):
-                                try:
-                                    await session.invoke(
-                                        raw.functions.upload.ReuploadCdnFile(
-                                            file_token=r.file_token,
-                                            request_token=r2.request_token
-                                        )
-                                    )
-                                except VolumeLocNotFound:
-                                    break
-                                else:
-                                    continue
-
-                            chunk = r2.bytes
-
-                            # https://core.telegram.org/cdn#decrypting-files
-                            decrypted_chunk = aes.ctr256_decrypt(
-                                chunk,
-                                r.encryption_key,
-                                bytearray(
-                                    r.encryption_iv[:-4]
-                                    + (offset_bytes // 16).to_bytes(4, "big")
-                                )
-                            )
+                    start = end
+                    end += h.limit
+
+                    CDNFileHashMismatch.check(
+                        h.offset == offset_bytes + start,
+                        "h.offset == offset_bytes + start"
+                    )
+
+                    cdn_chunk = decrypted_chunk[start:end]
+                    CDNFileHashMismatch.check(
+                        h.hash == sha256(cdn_chunk).digest(),
+                        "h.hash == sha256(cdn_chunk).digest()"
+                    )
 
-                            hashes = await session.invoke(
-                                raw.functions.upload.GetCdnFileHashes(
+                # Every byte handed out must belong to a verified part
+                CDNFileHashMismatch.check(
+                    end >= len(decrypted_chunk),
+                    "end >= len(decrypted_chunk)"
+                )
+
+                return decrypted_chunk
+
+            async def get_cdn_chunk(offset_bytes: int, chunk_size: int) -> bytes:
+                # Hashes cover whole parts, so smaller requests fetch the part they lie in and are sliced once verified.
+                # Larger requests are already aligned to parts, their limits being powers of two dividing their offsets.
+                part_offset = offset_bytes - offset_bytes % self.CDN_HASH_PART_SIZE
+                part_size = max(chunk_size, self.CDN_HASH_PART_SIZE)
+
+                hashes = self.loop.create_task(get_cdn_hashes(part_offset, part_size))
+
+                try:
+                    while True:
+                        r2 = await invoke(
+                            raw.functions.upload.GetCdnFile(
+                                file_token=r.file_token,
+                                offset=part_offset,
+                                limit=part_size
+                            ),
+                            is_cdn=True
+                        )
+
+                        if not isinstance(r2, raw.types.upload.CdnFileReuploadNeeded):
+                            break
+
+                        try:
+                            await invoke(
+                                raw.functions.upload.ReuploadCdnFile(
                                     file_token=r.file_token,
-                                    offset=offset_bytes
+                                    request_token=r2.request_token
                                 )
                             )
+                        except VolumeLocNotFound:
+                            return b""
 
-                            # https://core.telegram.org/cdn#verifying-files
-                            for i, h in enumerate(hashes):
-                                cdn_chunk = decrypted_chunk[h.limit * i: h.limit * (i + 1)]
-                                CDNFileHashMismatch.check(
-                                    h.hash == sha256(cdn_chunk).digest(),
-                                    "h.hash == sha256(cdn_chunk).digest()"
-                                )
+                    decrypted_chunk = await kurimypyrogram.crypto_scheduler.run(
+                        decrypt_cdn_chunk, r2.bytes, part_offset, await hashes,
+                        size=len(r2.bytes)
+                    )
 
-                            yield decrypted_chunk
+                    start = offset_bytes - part_offset
 
-                            current += 1
-                            offset_bytes += chunk_size
+                    return decrypted_chunk[start:start + chunk_size]
+                finally:
+                    if not hashes.done():
+                        hashes.cancel()
+                    elif not hashes.cancelled():
+                        hashes.exception()
 
-                            if progress:
-                                func = functools.partial(
-                                    progress,
-                                    min(offset_bytes, file_size) if file_size != 0 else offset_bytes,
-                                    file_size,
-                                    *progress_args
-                                )
+            # Chunk requests in flight, in file order, along with their offset and limit
+            pending = deque()
 
-                                if inspect.iscoroutinefunction(progress):
-                                    await func()
-                                else:
-                                    await self.loop.run_in_executor(self.executor, func)
+            offset_bytes, chunk_size = next(parts, (None, None))
 
-                            if len(chunk) < chunk_size or current >= total:
-                                break
-                    except Exception as e:
-                        raise e
-                    finally:
-                        await cdn_session.stop()
+            if offset_bytes is None:
+                return
+
+            try:
+                r = await invoke(
+                    raw.functions.upload.GetFile(
+                        location=location,
+                        offset=offset_bytes,
+                        limit=chunk_size
+                    ),
+                    sleep_threshold=30
+                )
+
+                if isinstance(r, raw.types.upload.File):
+                    fetch = get_chunk
+
+                    first = self.loop.create_future()
+                    first.set_result(r.bytes)
+                    pending.append((offset_bytes, chunk_size, first))
+                elif isinstance(r, raw.types.upload.FileCdnRedirect):
+                    fetch = get_cdn_chunk
+
+                    for h in r.file_hashes:
+                        cdn_hashes[h.offset] = h
+
+                    await self.get_cdn_session(r.dc_id)
+
+                    parts = itertools.chain([(offset_bytes, chunk_size)], parts)
+                else:
+                    return
+
+                while True:
+                    while parts is not None and len(pending) < self.download_window:
+                        part = next(parts, None)
+
+                        if part is None or file_size != 0 and part[0] >= file_size:
+                            parts = None
+                        else:
+                            pending.append((*part, self.loop.create_task(fetch(*part))))
+
+                    if not pending:
+                        break
+
+                    offset_bytes, chunk_size, task = pending.popleft()
+                    chunk = await task
+
+                    if start_byte is None:
+                        yield chunk
+                    else:
+                        # Trim the parts of the first and last chunks which are outside the requested range
+                        lower = max(start_byte - offset_bytes, 0)
+                        upper = None if end_byte is None else end_byte + 1 - offset_bytes
+
+                        yield chunk[lower:upper] if lower or upper is not None and upper < len(chunk) else chunk
+
+                    offset_bytes += chunk_size
+
+                    if progress:
+                        func = functools.partial(
+                            progress,
+                            min(offset_bytes, file_size)
+                            if file_size != 0
+                            else offset_bytes,
+                            file_size,
+                            *progress_args
+                        )
+
+                        if inspect.iscoroutinefunction(progress):
+                            await func()
+                        else:
+                            await self.loop.run_in_executor(self.executor, func)
+
+                    if len(chunk) < chunk_size:
+                        break
             except kurimypyrogram.StopTransmission:
                 raise
             except (FloodWait, FloodPremiumWait):
                 raise
+            except AuthKeyUnregistered as e:
+                # Still unauthorized after importing new authorizations, give up instead of ending the file early
+                log.warning("[%s] Unable to download from DC%s: %s", self.name, dc_id, e)
+                raise
             except Exception as e:
                 log.exception(e)
+            finally:
+                for _, _, task in pending:
+                    task.cancel()
+
+                await asyncio.gather(*[task for _, _, task in pending], return_exceptions=True)
+
+                for task in cdn_hash_requests.values():
+                    task.cancel()
+
+    async def get_media_session(self, dc_id: int) -> Session:
+        """Get the least busy media session for a DC, creating and authorizing the first one if needed.
+
+        The authorization keys of DCs other than the main one are kept in the storage, so that the key exchange and
+        the authorization import only happen the first time a DC is used.
+        """
+        pool = self.media_sessions.get(dc_id)
+
+        if pool:
+            return pool.get()
+
+        lock = self.media_session_locks.setdefault(dc_id, asyncio.Lock())
+
+        async with lock:
+            pool = self.media_sessions.get(dc_id)
+
+            if pool:
+                return pool.get()
+
+            test_mode = await self.storage.test_mode()
+
+            if dc_id == await self.storage.dc_id():
+                auth_key = await self.storage.auth_key()
+                is_authorized = True
+            else:
+                auth_key = await self.storage.dc_auth_key(dc_id)
+                is_authorized = auth_key is not None
+
+                if auth_key is None:
+                    auth_key = await Auth(self, dc_id, test_mode).create()
+
+            session = Session(self, dc_id, auth_key, test_mode, is_media=True)
+            await session.start()
+
+            if not is_authorized:
+                for _ in range(3):
+                    exported_auth = await self.invoke(
+                        raw.functions.auth.ExportAuthorization(
+                            dc_id=dc_id
+                        )
+                    )
+
+                    try:
+                        await session.invoke(
+                            raw.functions.auth.ImportAuthorization(
+                                id=exported_auth.id,
+                                bytes=exported_auth.bytes
+                            )
+                        )
+                    except AuthBytesInvalid:
+                        continue
+                    else:
+                        break
+                else:
+                    await session.stop()
+                    raise AuthBytesInvalid
+
+                await self.storage.dc_auth_key(dc_id, auth_key)
+
+            pool = self.media_sessions[dc_id] = MediaSessionPool(
+                self, session,
+                max_size=self.max_media_sessions,
+                idle_timeout=self.media_session_idle_timeout
+            )
+
+            return pool.get()
+
+    async def get_cdn_session(self, dc_id: int) -> Session:
+        """Get the least busy session for a CDN DC, creating the first one if needed.
+
+        CDN DCs don't need any authorization import, their authorization keys are kept in the storage as well.
+        """
+        pool = self.cdn_sessions.get(dc_id)
+
+        if pool:
+            return pool.get()
+
+        lock = self.media_session_locks.setdefault(("cdn", dc_id), asyncio.Lock())
+
+        async with lock:
+            pool = self.cdn_sessions.get(dc_id)
+
+            if pool:
+                return pool.get()
+
+            test_mode = await self.storage.test_mode()
+            auth_key = await self.storage.dc_auth_key(dc_id)
+
+            if auth_key is None:
+                auth_key = await Auth(self, dc_id, test_mode).create()
+                await self.storage.dc_auth_key(dc_id, auth_key)
+
+            session = Session(self, dc_id, auth_key, test_mode, is_media=True, is_cdn=True)
+            await session.start()
+
+            pool = self.cdn_sessions[dc_id] = MediaSessionPool(
+                self, session,
+                max_size=self.max_media_sessions,
+                idle_timeout=self.media_session_idle_timeout
+            )
+
+            return pool.get()
+
+    async def forget_media_session(self, dc_id: int, is_cdn: bool = False):
+        """Stop the media (or CDN) sessions of a DC and drop its stored authorization key."""
+        pool = (self.cdn_sessions if is_cdn else self.media_sessions).pop(dc_id, None)
+
+        if is_cdn or dc_id != await self.storage.dc_id():
+            await self.storage.dc_auth_key(dc_id, None)
+
+        if pool:
+            await pool.stop()
+
+    async def get_file_digest(self, path: str) -> Optional[str]:
+        stamp = await self.loop.run_in_executor(self.executor, utils.file_stamp, path)
+
+        if stamp is None:
+            return None
+
+        digest = self.upload_hashes.get(stamp)
+
+        if digest is None:
+            digest = await self.loop.run_in_executor(self.executor, utils.file_sha256, path)
+
+            if len(self.upload_hashes) >= self.UPLOAD_HASHES_MAX_SIZE:
+                self.upload_hashes.pop(next(iter(self.upload_hashes)))
+
+            self.upload_hashes[stamp] = digest
+
+        return digest
+
+    async def get_upload_key(
+        self,
+        path: Union[str, BinaryIO],
+        file_type: FileType,
+        *attributes,
+        thumb: Union[str, BinaryIO] = None
+    ) -> Optional[str]:
+        """Get the key identifying a local file in the upload cache, if enabled.
+
+        Besides the content of the file, the key covers the attributes and the thumbnail the media is uploaded with,
+        so that sending the same file with, e.g., another name is uploaded again instead of reusing the old media.
+        """
+        if not self.upload_cache or not isinstance(path, str) or thumb is not None and not isinstance(thumb, str):
+            return None
+
+        digest = await self.get_file_digest(path)
+
+        if digest is None:
+            return None
+
+        # Apart from photos, the file name and mime type of the media derive from the name of the file
+        if file_type != FileType.PHOTO:
+            attributes = (os.path.basename(path),) + attributes
+
+        if thumb is not None:
+            thumb_digest = await self.get_file_digest(thumb)
+
+            if thumb_digest is None:
+                return None
+
+            attributes += (thumb_digest,)
+
+        if attributes:
+            digest += ":" + sha256(repr(attributes).encode()).hexdigest()
+
+        return f"{file_type.name.lower()}:{digest}"
+
+    async def get_cached_upload(self, key: Optional[str]) -> Optional[str]:
+        return await self.storage.upload_file_id(key) if key else None
+
+    async def get_cached_upload_media(
+        self,
+        key: Optional[str],
+        file_type: FileType,
+        peer: "raw.base.InputPeer",
+        business_connection_id: str = None
+    ) -> Optional["raw.base.MessageMedia"]:
+        file_id = await self.get_cached_upload(key)
+
+        if not file_id:
+            return None
+
+        try:
+            return await self.invoke(
+                raw.functions.messages.UploadMedia(
+                    peer=peer,
+                    media=utils.get_input_media_from_file_id(file_id, file_type),
+                    business_connection_id=business_connection_id
+                )
+            )
+        except (FileReferenceExpired, MediaEmpty):
+            await self.storage.upload_file_id(key, None)
+            return None
+
+    async def set_cached_upload(self, key: Optional[str], media: "raw.base.MessageMedia", file_type: FileType):
+        if not key:
+            return
+
+        file_id = utils.get_file_id_from_media(media, file_type)
+
+        if file_id:
+            await self.storage.upload_file_id(key, file_id)
 
     def guess_mime_type(self, filename: str) -> Optional[str]:
         return self.mimetypes.guess_type(filename)[0]
@@ -20,8 +20,7 @@ import asyncio
 import ipaddress
 import logging
 import socket
-from concurrent.futures import ThreadPoolExecutor
-from typing import Tuple, Dict, TypedDict, Optional
+from typing import Tuple, Dict, TypedDict, Optional, Callable, Union
 
 import socks
 
@@ -42,6 +41,189 @@ class Proxy(TypedDict):
     password: Optional[str]
 
 
+class FrameBuffer(asyncio.BufferedProtocol):
+    """Receive side of a TCP connection.
+
+    Small reads (lengths, headers) are served from a reusable staging buffer. Reads of at least ``FRAME_THRESHOLD``
+    bytes get a dedicated buffer the socket reads straight into, which is then handed out as a memoryview, without
+    any further copy.
+
+    Reading from the socket is paused while more than ``HIGH_WATER`` bytes are staged and nobody reads them, and
+    resumed once they drop to ``LOW_WATER``.
+    """
+
+    SIZE = 64 * 1024
+    FRAME_THRESHOLD = 4 * 1024
+    HIGH_WATER = 4 * SIZE
+    LOW_WATER = SIZE
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.transport: Optional[asyncio.Transport] = None
+
+        self.buffer = bytearray(self.SIZE)
+        self.view = memoryview(self.buffer)
+        self.start = 0
+        self.end = 0
+        self.needed = 0
+
+        self.frame: Optional[memoryview] = None
+        self.frame_filled = 0
+
+        # Total amount of bytes received, used to tell a slow read from a stalled one
+        self.received = 0
+
+        self.is_paused = False
+
+        self.waiter: Optional[asyncio.Future] = None
+        self.drain_waiter: Optional[asyncio.Future] = None
+        self.is_closed = False
+        self.closed = loop.create_future()
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.is_closed = True
+        self.wake()
+
+        if self.drain_waiter is not None and not self.drain_waiter.done():
+            self.drain_waiter.set_result(None)
+
+        if not self.closed.done():
+            self.closed.set_result(None)
+
+    def eof_received(self) -> bool:
+        self.is_closed = True
+        self.wake()
+
+        return False
+
+    def pause_writing(self) -> None:
+        if self.drain_waiter is None or self.drain_waiter.done():
+            self.drain_waiter = self.loop.create_future()
+
+    def resume_writing(self) -> None:
+        if self.drain_waiter is not None and not self.drain_waiter.done():
+            self.drain_waiter.set_result(None)
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        if self.frame is not None:
+            return self.frame[self.frame_filled:]
+
+        if self.start == self.end:
+            self.start = self.end = 0
+        elif self.end == len(self.buffer):
+            length = self.end - self.start
+
+            if self.start:
+                self.buffer[:length] = bytes(self.view[self.start:self.end])
+            else:
+                self.view.release()
+                self.buffer.extend(bytes(self.SIZE))
+                self.view = memoryview(self.buffer)
+
+            self.start, self.end = 0, length
+
+        return self.view[self.end:]
+
+    def buffer_updated(self, nbytes: int) -> None:
+        self.received += nbytes
+
+        if self.frame is not None:
+            self.frame_filled += nbytes
+
+            if self.frame_filled == len(self.frame):
+                self.frame = None
+                self.wake()
+        else:
+            self.end += nbytes
+
+            if self.end - self.start >= self.needed:
+                self.wake()
+
+            if self.end - self.start > self.HIGH_WATER and not self.is_paused:
+                self.is_paused = True
+                self.transport.pause_reading()
+
+    def resume(self, force: bool = False) -> None:
+        if self.is_paused and (force or self.end - self.start <= self.LOW_WATER):
+            self.is_paused = False
+
+            if not self.transport.is_closing():
+                self.transport.resume_reading()
+
+    def wake(self) -> None:
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(None)
+
+    async def wait(self, is_done: Callable[[], bool], timeout: float) -> bool:
+        while not is_done():
+            if self.is_closed:
+                return False
+
+            # More data is needed, whatever is staged
+            self.resume(True)
+
+            received = self.received
+            self.waiter = self.loop.create_future()
+
+            try:
+                await asyncio.wait_for(self.waiter, timeout)
+            except asyncio.TimeoutError:
+                if self.received == received:
+                    return False
+            finally:
+                self.waiter = None
+
+        return True
+
+    async def drain(self) -> None:
+        if self.is_closed:
+            raise ConnectionResetError("Connection lost")
+
+        if self.drain_waiter is not None:
+            await self.drain_waiter
+
+    async def read(self, length: int, timeout: float) -> Optional[Union[bytes, memoryview]]:
+        available = self.end - self.start
+
+        if length <= available:
+            data = bytes(self.view[self.start:self.start + length])
+            self.start += length
+            self.resume()
+
+            return data
+
+        if length < self.FRAME_THRESHOLD:
+            self.needed = length
+
+            if not await self.wait(lambda: self.end - self.start >= length, timeout):
+                return None
+
+            data = bytes(self.view[self.start:self.start + length])
+            self.start += length
+            self.resume()
+
+            return data
+
+        frame = memoryview(bytearray(length))
+        frame[:available] = self.view[self.start:self.end]
+
+        self.start = self.end = 0
+        self.resume()
+        self.frame = frame
+        self.frame_filled = available
+
+        try:
+            if not await self.wait(lambda: self.frame_filled == length, timeout):
+                return None
+        finally:
+            self.frame = None
+
+        return frame
+
+
 class TCP:
     TIMEOUT = 10
 
@@ -49,8 +231,8 @@ class TCP:
         self.ipv6 = ipv6
         self.proxy = proxy
 
-        self.reader: Optional[asyncio.StreamReader] = None
-        self.writer: Optional[asyncio.StreamWriter] = None
+        self.transport: Optional[asyncio.Transport] = None
+        self.buffer: Optional[FrameBuffer] = None
 
         self.lock = asyncio.Lock()
         self.loop = asyncio.get_event_loop()
@@ -98,7 +280,8 @@ class TCP:
 
         sock.setblocking(False)
 
-        self.reader, self.writer = await asyncio.open_connection(
+        self.transport, self.buffer = await self.loop.create_connection(
+            lambda: FrameBuffer(self.loop),
             sock=sock
         )
 
@@ -108,7 +291,8 @@ class TCP:
     ) -> None:
         host, port = destination
         family = socket.AF_INET6 if self.ipv6 else socket.AF_INET
-        self.reader, self.writer = await asyncio.open_connection(
+        self.transport, self.buffer = await self.loop.create_connection(
+            lambda: FrameBuffer(self.loop),
             host=host,
             port=port,
             family=family
@@ -127,42 +311,29 @@ class TCP:
             raise TimeoutError("Connection timed out")
 
     async def close(self) -> None:
-        if self.writer is None:
+        if self.transport is None:
             return None
 
         try:
-            self.writer.close()
-            await asyncio.wait_for(self.writer.wait_closed(), TCP.TIMEOUT)
+            self.transport.close()
+            await asyncio.wait_for(asyncio.shield(self.buffer.closed), TCP.TIMEOUT)
         except Exception as e:
             log.info("Close exception: %s %s", type(e).__name__, e)
 
     async def send(self, data: bytes) -> None:
-        if self.writer is None:
+        if self.transport is None:
             return None
 
         async with self.lock:
             try:
-                self.writer.write(data)
-                await self.writer.drain()
+                self.transport.write(data)
+                await self.buffer.drain()
             except Exception as e:
                 log.info("Send exception: %s %s", type(e).__name__, e)
                 raise OSError(e)
 
-    async def recv(self, length: int = 0) -> Optional[bytes]:
-        data = b""
-
-        while len(data) < length:
-            try:
-                chunk = await asyncio.wait_for(
-                    self.reader.read(length - len(data)),
-                    TCP.TIMEOUT
-                )
-            except (OSError, asyncio.TimeoutError):
-                return None
-            else:
-                if chunk:
-                    data += chunk
-                else:
-                    return None
+    async def recv(self, length: int = 0) -> Optional[Union[bytes, memoryview]]:
+        if self.buffer is None:
+            return None
 
-        return data
+        return await self.buffer.read(length, TCP.TIMEOUT)
@@ -58,7 +58,11 @@ class TCPAbridgedO(TCP):
     async def send(self, data: bytes, *args) -> None:
         length = len(data) // 4
         data = (bytes([length]) if length <= 126 else b"\x7f" + length.to_bytes(3, "little")) + data
-        payload = await self.loop.run_in_executor(kurimypyrogram.crypto_executor, aes.ctr256_encrypt, data, *self.encrypt)
+        payload = await kurimypyrogram.crypto_scheduler.run(
+            aes.ctr256_encrypt, data, *self.encrypt,
+            key=(self, True),
+            size=len(data)
+        )
 
         await super().send(payload)
 
@@ -83,4 +87,8 @@ class TCPAbridgedO(TCP):
         if data is None:
             return None
 
-        return await self.loop.run_in_executor(kurimypyrogram.crypto_executor, aes.ctr256_decrypt, data, *self.decrypt)
+        return await kurimypyrogram.crypto_scheduler.run(
+            aes.ctr256_decrypt, data, *self.decrypt,
+            key=(self, False),
+            size=len(data)
+        )
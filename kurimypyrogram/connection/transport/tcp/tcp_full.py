@@ -19,7 +19,7 @@
 import logging
 from binascii import crc32
 from struct import pack, unpack
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Union
 
 from .tcp import TCP, Proxy
 
@@ -43,7 +43,7 @@ class TCPFull(TCP):
 
         await super().send(data)
 
-    async def recv(self, length: int = 0) -> Optional[bytes]:
+    async def recv(self, length: int = 0) -> Optional[Union[bytes, memoryview]]:
         length = await super().recv(4)
 
         if length is None:
@@ -54,11 +54,10 @@ class TCPFull(TCP):
         if packet is None:
             return None
 
-        packet = length + packet
         checksum = packet[-4:]
         packet = packet[:-4]
 
-        if crc32(packet) != unpack("<I", checksum)[0]:
+        if crc32(packet, crc32(length)) != unpack("<I", checksum)[0]:
             return None
 
-        return packet[8:]
+        return packet[4:]
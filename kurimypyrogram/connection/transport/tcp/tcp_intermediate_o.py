@@ -21,6 +21,7 @@ import os
 from struct import pack, unpack
 from typing import Optional, Tuple
 
+import kurimypyrogram
 from kurimypyrogram.crypto import aes
 from .tcp import TCP, Proxy
 
@@ -56,13 +57,15 @@ class TCPIntermediateO(TCP):
         await super().send(nonce)
 
     async def send(self, data: bytes, *args) -> None:
-        await super().send(
-            aes.ctr256_encrypt(
-                pack("<i", len(data)) + data,
-                *self.encrypt
-            )
+        data = pack("<i", len(data)) + data
+        payload = await kurimypyrogram.crypto_scheduler.run(
+            aes.ctr256_encrypt, data, *self.encrypt,
+            key=(self, True),
+            size=len(data)
         )
 
+        await super().send(payload)
+
     async def recv(self, length: int = 0) -> Optional[bytes]:
         length = await super().recv(4)
 
@@ -76,4 +79,8 @@ class TCPIntermediateO(TCP):
         if data is None:
             return None
 
-        return aes.ctr256_decrypt(data, *self.decrypt)
+        return await kurimypyrogram.crypto_scheduler.run(
+            aes.ctr256_decrypt, data, *self.decrypt,
+            key=(self, False),
+            size=len(data)
+        )
@@ -19,6 +19,7 @@
 from hashlib import sha256
 from io import BytesIO
 from os import urandom
+from typing import Union
 
 from kurimypyrogram.errors import SecurityCheckMismatch
 from kurimypyrogram.raw.core import Message, Long
@@ -39,35 +40,42 @@ def kdf(auth_key: bytes, msg_key: bytes, outgoing: bool) -> tuple:
 
 
 def pack(message: Message, salt: int, session_id: bytes, auth_key: bytes, auth_key_id: bytes) -> bytes:
-    data = Long(salt) + session_id + message.write()
-    padding = urandom(-(len(data) + 12) % 16 + 12)
+    # The whole plaintext is built in a single buffer, messages and containers are written straight into it
+    data = bytearray(Long(salt))
+    data += session_id
+    message.write_into(data)
+    data += urandom(-(len(data) + 12) % 16 + 12)
 
     # 88 = 88 + 0 (outgoing message)
-    msg_key_large = sha256(auth_key[88: 88 + 32] + data + padding).digest()
-    msg_key = msg_key_large[8:24]
+    msg_key_large = sha256(auth_key[88: 88 + 32])
+    msg_key_large.update(data)
+    msg_key = msg_key_large.digest()[8:24]
     aes_key, aes_iv = kdf(auth_key, msg_key, True)
 
-    return auth_key_id + msg_key + aes.ige256_encrypt(data + padding, aes_key, aes_iv)
+    return auth_key_id + msg_key + aes.ige256_encrypt(data, aes_key, aes_iv)
 
 
 def unpack(
-    b: BytesIO,
+    b: Union[BytesIO, bytes, memoryview],
     session_id: bytes,
     auth_key: bytes,
     auth_key_id: bytes
 ) -> Message:
-    SecurityCheckMismatch.check(b.read(8) == auth_key_id, "b.read(8) == auth_key_id")
+    packet = memoryview(b.read() if isinstance(b, BytesIO) else b)
 
-    msg_key = b.read(16)
+    SecurityCheckMismatch.check(packet[:8] == auth_key_id, "packet[:8] == auth_key_id")
+
+    msg_key = bytes(packet[8:24])
     aes_key, aes_iv = kdf(auth_key, msg_key, False)
-    data = BytesIO(aes.ige256_decrypt(b.read(), aes_key, aes_iv))
+    plain = aes.ige256_decrypt(packet[24:], aes_key, aes_iv)
+    data = BytesIO(plain)
     data.read(8)  # Salt
 
     # https://core.telegram.org/mtproto/security_guidelines#checking-session-id
     SecurityCheckMismatch.check(data.read(8) == session_id, "data.read(8) == session_id")
 
     try:
-        message = Message.read(data)
+        message, _ = Message.read_from(memoryview(plain), data.tell())
     except KeyError as e:
         if e.args[0] == 0:
             raise ConnectionError(f"Received empty data. Check your internet connection.")
@@ -0,0 +1,123 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional
+
+log = logging.getLogger(__name__)
+
+
+class CryptoScheduler:
+    """Run crypto work (MTProto packing, AES) on a pool of worker threads.
+
+    Jobs sharing the same *key* are executed one after the other, in submission order, while jobs with different keys
+    run in parallel. Payloads not bigger than ``INLINE_SIZE`` bytes are processed right away on the event loop thread,
+    as long as no job with the same key is still pending.
+
+    Parameters:
+        workers (``int``, *optional*):
+            Number of worker threads.
+            Defaults to ``min(4, os.cpu_count())``.
+    """
+
+    WORKERS = min(4, os.cpu_count() or 1)
+    INLINE_SIZE = 256
+
+    def __init__(self, workers: int = WORKERS):
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="CryptoWorker")
+
+        self.tails: Dict[Hashable, asyncio.Future] = {}
+
+        self.lock = threading.Lock()
+        self.jobs = 0
+        self.inline_jobs = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def average_wait(self) -> float:
+        """Average time in seconds a job spent queued before a worker picked it up."""
+        return self.total_wait / self.jobs if self.jobs else 0.0
+
+    def set_workers(self, workers: int):
+        """Change the number of worker threads.
+
+        Jobs already queued keep running on the previous threads.
+        """
+        executor = self.executor
+
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="CryptoWorker")
+
+        executor.shutdown(wait=False)
+
+    def job(self, queued_at: float, func: Callable, args: tuple) -> Any:
+        wait = time.perf_counter() - queued_at
+
+        with self.lock:
+            self.jobs += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+        return func(*args)
+
+    async def run(self, func: Callable, *args: Any, key: Optional[Hashable] = None, size: Optional[int] = None) -> Any:
+        loop = asyncio.get_running_loop()
+        previous = self.tails.get(key) if key is not None else None
+
+        if size is not None and size <= self.INLINE_SIZE and previous is None:
+            self.inline_jobs += 1
+            return func(*args)
+
+        if key is None:
+            return await asyncio.wrap_future(self.executor.submit(self.job, time.perf_counter(), func, args))
+
+        turn = loop.create_future()
+        self.tails[key] = turn
+
+        def release(*_):
+            if not turn.done():
+                turn.set_result(None)
+
+            if self.tails.get(key) is turn:
+                del self.tails[key]
+
+        job = None
+
+        try:
+            if previous is not None:
+                await asyncio.shield(previous)
+
+            job = self.executor.submit(self.job, time.perf_counter(), func, args)
+
+            return await asyncio.wrap_future(job)
+        finally:
+            # Pass the turn on only once the work of this job (or the one before, if this was cancelled while waiting)
+            # is actually over, so that jobs with the same key never overlap.
+            if job is not None and not job.done():
+                job.add_done_callback(lambda _: loop.call_soon_threadsafe(release))
+            elif job is None and previous is not None and not previous.done():
+                previous.add_done_callback(release)
+            else:
+                release()
@@ -168,6 +168,24 @@ class Dispatcher:
 
         self.update_parsers = {key: value for key_tuple, value in self.update_parsers.items() for key in key_tuple}
 
+        # Handlers of the parsed updates, known before parsing so that updates no handler consumes are left as they are
+        self.update_handlers = {
+            Dispatcher.NEW_MESSAGE_UPDATES: MessageHandler,
+            Dispatcher.EDIT_MESSAGE_UPDATES: EditedMessageHandler,
+            Dispatcher.DELETE_MESSAGES_UPDATES: DeletedMessagesHandler,
+            Dispatcher.CALLBACK_QUERY_UPDATES: CallbackQueryHandler,
+            Dispatcher.USER_STATUS_UPDATES: UserStatusHandler,
+            Dispatcher.BOT_INLINE_QUERY_UPDATES: InlineQueryHandler,
+            Dispatcher.POLL_UPDATES: PollHandler,
+            Dispatcher.CHOSEN_INLINE_RESULT_UPDATES: ChosenInlineResultHandler,
+            Dispatcher.CHAT_MEMBER_UPDATES: ChatMemberUpdatedHandler,
+            Dispatcher.CHAT_JOIN_REQUEST_UPDATES: ChatJoinRequestHandler,
+            Dispatcher.NEW_STORY_UPDATES: StoryHandler,
+            Dispatcher.PRE_CHECKOUT_QUERY_UPDATES: PreCheckoutQueryHandler
+        }
+
+        self.update_handlers = {key: value for key_tuple, value in self.update_handlers.items() for key in key_tuple}
+
     async def start(self):
         if not self.client.no_updates:
             for i in range(self.client.workers):
@@ -314,6 +332,9 @@ class Dispatcher:
 
         self.loop.create_task(fn())
 
+    def has_handler(self, handler_type) -> bool:
+        return any(isinstance(handler, handler_type) for group in self.groups.values() for handler in group)
+
     async def handler_worker(self, lock):
         while True:
             packet = await self.updates_queue.get()
@@ -324,10 +345,13 @@ class Dispatcher:
             try:
                 update, users, chats = packet
                 parser = self.update_parsers.get(type(update), None)
+                handler_type = self.update_handlers.get(type(update), None)
 
+                # With lazy updates, those no handler consumes are left undecoded, which also keeps their messages
+                # out of the message cache
                 parsed_update, handler_type = (
                     await parser(update, users, chats)
-                    if parser is not None
+                    if parser is not None and (not self.client.lazy_updates or self.has_handler(handler_type))
                     else (None, type(None))
                 )
 
@@ -0,0 +1,363 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import heapq
+import itertools
+import logging
+import os
+import time
+from collections import deque
+from typing import Optional, Union, Iterable, AsyncIterable, AsyncGenerator
+
+import kurimypyrogram
+from kurimypyrogram import types
+from kurimypyrogram.errors import FloodWait, FloodPremiumWait
+from kurimypyrogram.file_id import FileId
+from kurimypyrogram.methods.messages.download_media import get_media, prepare_download
+
+log = logging.getLogger(__name__)
+
+
+class DownloadResult:
+    """Outcome of a single download of a batch.
+
+    Parameters:
+        message (:obj:`~kurimypyrogram.types.Message` | :obj:`~kurimypyrogram.types.Story` | ``str``):
+            The message (or media, or file id) the download was requested for.
+
+        path (``str``, *optional*):
+            Absolute path of the downloaded file, None in case the download failed.
+
+        size (``int``, *optional*):
+            Size of the downloaded file, in bytes.
+
+        error (``Exception``, *optional*):
+            The error that made the download fail, if known.
+    """
+
+    def __init__(
+        self,
+        message: Union["types.Message", "types.Story", str],
+        path: Optional[str] = None,
+        size: int = 0,
+        error: Optional[Exception] = None
+    ):
+        self.message = message
+        self.path = path
+        self.size = size
+        self.error = error
+
+    def __repr__(self) -> str:
+        return f"DownloadResult(path={self.path!r}, size={self.size}, error={self.error!r})"
+
+
+class DownloadManager:
+    """Scheduler of a batch of downloads, iterated asynchronously to get their results as they complete.
+
+    Pending downloads are queued per DC and the DCs are served in turn, with at most *per_dc_limit* downloads running
+    on the same DC, so that a single busy or flooded DC doesn't hold the whole batch back. Within a DC the smallest
+    files go first. Messages whose file reference expired are refreshed together with the queued messages of the same
+    chat, in as few requests as possible.
+
+    Parameters:
+        client (:obj:`~kurimypyrogram.Client`):
+            The client downloading the files.
+
+        messages (Iterable | AsyncIterable):
+            Messages, medias or file ids to download.
+
+        dest (``str``, *optional*):
+            Directory the files are downloaded into.
+
+        concurrency (``int``, *optional*):
+            Maximum amount of downloads running at once.
+
+        per_dc_limit (``int``, *optional*):
+            Maximum amount of downloads running at once on the same DC.
+
+        resume (``bool``, *optional*):
+            Whether interrupted downloads are resumed instead of being started over. Files are then named after their
+            unique id, so messages sharing the same media are downloaded once and all get the same file.
+    """
+
+    CONCURRENCY = 8
+    PER_DC_LIMIT = 4
+    # Time expired file references are collected for before being refreshed all together
+    REFRESH_DELAY = 0.1
+    REFRESH_LIMIT = 200
+
+    def __init__(
+        self,
+        client: "kurimypyrogram.Client",
+        messages: Union[Iterable, AsyncIterable],
+        dest: str,
+        concurrency: int = CONCURRENCY,
+        per_dc_limit: int = PER_DC_LIMIT,
+        resume: bool = True
+    ):
+        if concurrency < 1 or per_dc_limit < 1:
+            raise ValueError("concurrency and per_dc_limit must be positive")
+
+        self.client = client
+        self.messages = messages
+        self.dest = dest
+        self.concurrency = concurrency
+        self.per_dc_limit = per_dc_limit
+        self.resume = resume
+
+        self.semaphore = asyncio.Semaphore(concurrency)
+
+        # Pending downloads of each DC as [size, order, message, file_unique_id] heaps, and the DCs in the order they
+        # are served
+        self.queues = {}
+        self.dcs = deque()
+        self.order = itertools.count()
+
+        # Messages waiting for the download of the same media by an earlier message, by file unique id
+        self.duplicates = {}
+
+        # Running download tasks along with their DC and file unique id, and the amount of them on each DC
+        self.running = {}
+        self.active = {}
+
+        self.refresh_requests = {}
+        self.refresh_tasks = {}
+
+        self.completed = 0
+        self.failed = 0
+        self.downloaded = 0
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Aggregate download speed so far, in bytes per second."""
+        elapsed = self.elapsed
+        return self.downloaded / elapsed if elapsed else 0.0
+
+    @property
+    def pending(self) -> int:
+        return (
+            sum(len(queue) for queue in self.queues.values())
+            + sum(len(messages) for messages in self.duplicates.values())
+        )
+
+    def add(self, message) -> Optional[DownloadResult]:
+        media = get_media(message)
+
+        if not media:
+            return DownloadResult(message, error=ValueError("This message doesn't contain any downloadable media"))
+
+        try:
+            file_id = FileId.decode(media if isinstance(media, str) else media.file_id)
+        except Exception as e:
+            return DownloadResult(message, error=e)
+
+        # Medias passed directly are turned into their file id by get_media
+        size = getattr(media, "file_size", 0) or getattr(message, "file_size", 0) or 0
+        file_unique_id = getattr(media, "file_unique_id", None) if self.resume else None
+
+        if file_unique_id in self.duplicates:
+            self.duplicates[file_unique_id].append(message)
+            return None
+
+        if file_unique_id:
+            self.duplicates[file_unique_id] = []
+
+        if file_id.dc_id not in self.queues:
+            self.queues[file_id.dc_id] = []
+            self.active[file_id.dc_id] = 0
+            self.dcs.append(file_id.dc_id)
+
+        heapq.heappush(self.queues[file_id.dc_id], [size, next(self.order), message, file_unique_id])
+
+    def next(self) -> Optional[tuple]:
+        for _ in range(len(self.dcs)):
+            dc_id = self.dcs[0]
+            self.dcs.rotate(-1)
+
+            if self.queues[dc_id] and self.active[dc_id] < self.per_dc_limit:
+                _, _, message, file_unique_id = heapq.heappop(self.queues[dc_id])
+                return dc_id, message, file_unique_id
+
+        return None
+
+    def schedule(self):
+        while len(self.running) < self.concurrency:
+            item = self.next()
+
+            if item is None:
+                break
+
+            dc_id, message, file_unique_id = item
+
+            self.active[dc_id] += 1
+            self.running[self.client.loop.create_task(self.download(message))] = dc_id, file_unique_id
+
+    async def download(self, message) -> DownloadResult:
+        try:
+            refresh = None
+
+            if isinstance(message, types.Message) and message.chat:
+                async def refresh():
+                    return await self.refresh(message)
+
+            # A trailing separator makes sure dest is taken as a directory rather than the name of the file
+            packet = prepare_download(
+                self.client, message, os.path.join(self.dest, ""), resume=self.resume, refresh=refresh
+            )
+
+            while True:
+                try:
+                    path = await self.client.handle_download(packet, semaphore=self.semaphore)
+                except (FloodWait, FloodPremiumWait) as e:
+                    log.warning("Waiting for %s seconds before downloading again", e.value)
+                    await asyncio.sleep(e.value)
+                else:
+                    break
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return DownloadResult(message, error=e)
+
+        if path is None:
+            return DownloadResult(message)
+
+        return DownloadResult(message, path, os.path.getsize(path))
+
+    async def refresh(self, message: "types.Message") -> FileId:
+        chat_id = message.chat.id
+        future = self.client.loop.create_future()
+
+        self.refresh_requests.setdefault(chat_id, {}).setdefault(message.id, []).append(future)
+
+        if chat_id not in self.refresh_tasks:
+            self.refresh_tasks[chat_id] = self.client.loop.create_task(self.refresh_chat(chat_id))
+
+        media = get_media(await future)
+
+        if not media:
+            raise ValueError("The message doesn't contain any downloadable media anymore")
+
+        return FileId.decode(media.file_id)
+
+    async def refresh_chat(self, chat_id: int):
+        await asyncio.sleep(self.REFRESH_DELAY)
+
+        del self.refresh_tasks[chat_id]
+        requests = self.refresh_requests.pop(chat_id)
+
+        # Queued messages of the same chat are likely to have expired as well, refresh them in the same requests
+        queued = {
+            item[2].id: item
+            for queue in self.queues.values()
+            for item in queue
+            if isinstance(item[2], types.Message) and item[2].chat and item[2].chat.id == chat_id
+        }
+
+        message_ids = list(requests) + [i for i in queued if i not in requests]
+
+        try:
+            for i in range(0, len(message_ids), self.REFRESH_LIMIT):
+                messages = await self.client.get_messages(chat_id, message_ids[i:i + self.REFRESH_LIMIT])
+
+                for message in messages:
+                    if message.id in queued and not message.empty:
+                        queued[message.id][2] = message
+
+                    for future in requests.pop(message.id, []):
+                        if not future.done():
+                            future.set_result(message)
+        except Exception as e:
+            for futures in requests.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+        finally:
+            for futures in requests.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(ValueError("The message couldn't be refreshed"))
+
+    async def __aiter__(self) -> AsyncGenerator[DownloadResult, None]:
+        self.started_at = time.monotonic()
+
+        if isinstance(self.messages, AsyncIterable):
+            messages = [message async for message in self.messages]
+        else:
+            messages = self.messages
+
+        for message in messages:
+            result = self.add(message)
+
+            if result is not None:
+                self.failed += 1
+                yield result
+
+        self.schedule()
+
+        try:
+            while self.running:
+                done, _ = await asyncio.wait(self.running, return_when=asyncio.FIRST_COMPLETED)
+                results = []
+
+                for task in done:
+                    dc_id, file_unique_id = self.running.pop(task)
+                    self.active[dc_id] -= 1
+                    result = task.result()
+
+                    if result.path is not None:
+                        self.downloaded += result.size
+
+                    results.append(result)
+                    results.extend(
+                        DownloadResult(message, result.path, result.size, result.error)
+                        for message in self.duplicates.pop(file_unique_id, ())
+                    )
+
+                for result in results:
+                    if result.path is None:
+                        self.failed += 1
+                    else:
+                        self.completed += 1
+
+                # Keep the slots busy while the results are being consumed
+                self.schedule()
+
+                for result in results:
+                    yield result
+        finally:
+            self.finished_at = time.monotonic()
+
+            for task in itertools.chain(self.running, self.refresh_tasks.values()):
+                task.cancel()
+
+            await asyncio.gather(*self.running, *self.refresh_tasks.values(), return_exceptions=True)
+
+            log.info(
+                "Downloaded %s files (%s failed), %s bytes in %.2f seconds (%.0f bytes/s)",
+                self.completed, self.failed, self.downloaded, self.elapsed, self.throughput
+            )
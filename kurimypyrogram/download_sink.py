@@ -0,0 +1,227 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import logging
+import os
+import struct
+import threading
+from concurrent.futures import Executor
+from typing import Optional
+
+log = logging.getLogger(__name__)
+
+
+class DownloadSink:
+    """File a download is written into, chunk by chunk and in any order.
+
+    The file is preallocated to its final size and chunks are written at their own offset with positional writes
+    running in an executor, so that the event loop never blocks on disk I/O. Completed chunks are tracked in a bitmap
+    which is kept in a small sidecar file next to the data, allowing interrupted downloads to be resumed.
+
+    Parameters:
+        path (``str``):
+            Path of the file to write.
+
+        file_size (``int``, *optional*):
+            Final size of the file, used to preallocate it. Pass 0 in case it's unknown.
+
+        chunk_size (``int``, *optional*):
+            Size of the chunks the file is downloaded in.
+
+        executor (``Executor``, *optional*):
+            Executor the disk operations run in. Defaults to the event loop's default executor.
+
+        resumable (``bool``, *optional*):
+            Pass False to skip the chunk map: the file always starts empty and can't be resumed later.
+            Defaults to True.
+    """
+
+    SIDECAR_EXTENSION = ".parts"
+    # file size, chunk size
+    HEADER = struct.Struct("<QI")
+
+    def __init__(
+        self,
+        path: str,
+        file_size: int = 0,
+        chunk_size: int = 1024 * 1024,
+        executor: Optional[Executor] = None,
+        resumable: bool = True
+    ):
+        self.path = path
+        self.sidecar_path = path + self.SIDECAR_EXTENSION
+        self.file_size = file_size
+        self.chunk_size = chunk_size
+        self.executor = executor
+        self.resumable = resumable
+
+        self.bitmap = bytearray((self.chunks + 7) // 8)
+        self.fd: Optional[int] = None
+        self.sidecar_fd: Optional[int] = None
+
+        # Used in place of positional writes where the platform lacks them
+        self.lock = threading.RLock()
+
+    @property
+    def chunks(self) -> int:
+        return (self.file_size + self.chunk_size - 1) // self.chunk_size
+
+    @property
+    def is_complete(self) -> bool:
+        return self.file_size > 0 and self.first_missing() >= self.chunks
+
+    def has(self, index: int) -> bool:
+        byte = index >> 3
+        return byte < len(self.bitmap) and bool(self.bitmap[byte] & (1 << (index & 7)))
+
+    def first_missing(self) -> int:
+        """Index of the first chunk which hasn't been written yet."""
+        for byte, value in enumerate(self.bitmap):
+            if value != 0xFF:
+                for bit in range(8):
+                    if not value & (1 << bit):
+                        return byte * 8 + bit
+
+        return len(self.bitmap) * 8
+
+    async def run(self, func, *args):
+        return await asyncio.get_event_loop().run_in_executor(self.executor, func, *args)
+
+    async def open(self):
+        await self.run(self._open)
+
+    def _open(self):
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o666)
+
+        if self.resumable:
+            self.sidecar_fd = os.open(self.sidecar_path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o666)
+            self._load()
+        else:
+            # A chunk map left by an earlier resumable download would describe content that is about to be overwritten
+            self._remove(self.sidecar_path)
+            os.ftruncate(self.fd, 0)
+
+        if self.file_size and os.fstat(self.fd).st_size < self.file_size:
+            try:
+                os.posix_fallocate(self.fd, 0, self.file_size)
+            except (AttributeError, OSError):
+                # Not available on every platform and filesystem, a sparse file does the job as well
+                os.ftruncate(self.fd, self.file_size)
+
+    def _load(self):
+        data = self._pread(self.sidecar_fd, os.fstat(self.sidecar_fd).st_size, 0)
+
+        if len(data) >= self.HEADER.size:
+            file_size, chunk_size = self.HEADER.unpack_from(data)
+            bitmap = data[self.HEADER.size:]
+
+            if file_size == self.file_size and chunk_size == self.chunk_size and len(bitmap) >= len(self.bitmap):
+                self.bitmap = bytearray(bitmap)
+                return
+
+        # Missing or stale chunk map: whatever is in the file can't be trusted
+        self.bitmap = bytearray(len(self.bitmap))
+        os.ftruncate(self.fd, 0)
+        self._write_sidecar()
+
+    def _write_sidecar(self):
+        data = self.HEADER.pack(self.file_size, self.chunk_size) + self.bitmap
+
+        os.ftruncate(self.sidecar_fd, len(data))
+        self._pwrite(self.sidecar_fd, data, 0)
+
+    def _pwrite(self, fd: int, data: bytes, offset: int):
+        if hasattr(os, "pwrite"):
+            view = memoryview(data)
+
+            while view:
+                written = os.pwrite(fd, view, offset)
+                view = view[written:]
+                offset += written
+        else:
+            with self.lock:
+                os.lseek(fd, offset, os.SEEK_SET)
+                os.write(fd, data)
+
+    def _pread(self, fd: int, length: int, offset: int) -> bytes:
+        if hasattr(os, "pread"):
+            return os.pread(fd, length, offset)
+
+        with self.lock:
+            os.lseek(fd, offset, os.SEEK_SET)
+            return os.read(fd, length)
+
+    async def write(self, index: int, data: bytes):
+        """Write the chunk with the given index and mark it as completed."""
+        await self.run(self._write, index, data)
+
+    def _write(self, index: int, data: bytes):
+        self._pwrite(self.fd, data, index * self.chunk_size)
+
+        with self.lock:
+            byte = index >> 3
+
+            if byte >= len(self.bitmap):
+                self.bitmap.extend(bytes(byte + 1 - len(self.bitmap)))
+
+            self.bitmap[byte] |= 1 << (index & 7)
+
+            if self.resumable:
+                self._write_sidecar()
+
+    async def close(self):
+        """Close the file, keeping the chunk map so that the download can be resumed."""
+        await self.run(self._close)
+
+    def _close(self):
+        for fd in (self.fd, self.sidecar_fd):
+            if fd is not None:
+                os.close(fd)
+
+        self.fd = self.sidecar_fd = None
+
+    async def finish(self, size: int = None):
+        """Close the file once the download is complete, trimming it to its actual size and removing the chunk map."""
+        await self.run(self._finish, size)
+
+    def _finish(self, size: int = None):
+        if size is not None:
+            os.ftruncate(self.fd, size)
+
+        self._close()
+
+        if self.resumable:
+            os.remove(self.sidecar_path)
+
+    async def discard(self):
+        """Close and remove both the file and its chunk map."""
+        await self.run(self._discard)
+
+    def _discard(self):
+        self._close()
+
+        for path in (self.path, self.sidecar_path):
+            self._remove(path)
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
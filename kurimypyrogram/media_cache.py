@@ -0,0 +1,259 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import hashlib
+import logging
+import mmap
+import os
+import shutil
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Optional, Union, Iterator
+
+from .file_id import FileId, FileUniqueId, FileUniqueType, ThumbnailSource
+
+log = logging.getLogger(__name__)
+
+
+class MediaCache:
+    """On-disk cache of downloaded media, shared by every download of the same file.
+
+    Entries are keyed by the file unique id together with the thumbnail size, so that the different sizes of a photo
+    are cached separately. Files are published atomically, so a partially written entry is never visible, and the least
+    recently used entries are evicted once the cache grows bigger than *max_size*. Entries being read are only evicted
+    once they are no longer in use.
+
+    Parameters:
+        path (``str`` | ``Path``):
+            Directory the cached files are kept in. It's created if it doesn't exist.
+
+        max_size (``int``, *optional*):
+            Maximum total size of the cached files, in bytes.
+            Defaults to 1 GiB.
+
+        executor (``Executor``, *optional*):
+            Executor the disk operations run in. Defaults to the event loop's default executor.
+    """
+
+    MAX_SIZE = 1024 * 1024 * 1024
+    TEMP_EXTENSION = ".temp"
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_size: int = MAX_SIZE,
+        executor: Optional[Executor] = None
+    ):
+        self.path = Path(path)
+        self.max_size = max_size
+        self.executor = executor
+
+        # Cached file names and their sizes, least recently used first
+        self.entries = OrderedDict()
+        self.size = 0
+        # Amount of copies, reads and streams using each cached file
+        self.readers = Counter()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.load()
+
+    @property
+    def hit_ratio(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    @staticmethod
+    def key(file_id: FileId) -> str:
+        file_unique_id = FileUniqueId(
+            file_unique_type=FileUniqueType.DOCUMENT,
+            media_id=file_id.media_id
+        ).encode()
+
+        if file_id.thumbnail_source == ThumbnailSource.THUMBNAIL:
+            variant = file_id.thumbnail_size
+        elif file_id.thumbnail_source in (ThumbnailSource.CHAT_PHOTO_SMALL, ThumbnailSource.CHAT_PHOTO_BIG):
+            variant = file_id.thumbnail_source.name.lower()
+        else:
+            variant = ""
+
+        # File unique ids are case-sensitive, hashing keeps entries apart on case-insensitive filesystems as well
+        return hashlib.sha256(f"{file_unique_id}:{variant}".encode()).hexdigest()
+
+    def load(self):
+        for temp in self.path.glob("*" + self.TEMP_EXTENSION):
+            temp.unlink()
+
+        files = [(f.stat(), f.name) for f in self.path.iterdir() if f.is_file()]
+
+        for stat, name in sorted(files, key=lambda f: f[0].st_mtime):
+            self.entries[name] = stat.st_size
+            self.size += stat.st_size
+
+    async def run(self, func, *args):
+        return await asyncio.get_event_loop().run_in_executor(self.executor, func, *args)
+
+    async def get(self, file_id: FileId) -> Optional[Path]:
+        """Get the path of the cached copy of a file, if any."""
+        name = self.key(file_id)
+
+        if name not in self.entries:
+            self.misses += 1
+            return None
+
+        path = self.path / name
+
+        try:
+            # Persist the access order across restarts
+            await self.run(os.utime, path)
+        except FileNotFoundError:
+            self.size -= self.entries.pop(name)
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(name)
+        self.hits += 1
+
+        return path
+
+    async def put(self, file_id: FileId, source: Union[str, Path, bytes]):
+        """Add a file to the cache, given either its path or its content."""
+        name = self.key(file_id)
+        size = await self.run(self._publish, name, source)
+
+        if name in self.entries:
+            self.size -= self.entries.pop(name)
+
+        self.entries[name] = size
+        self.size += size
+
+        await self.evict()
+
+    def _publish(self, name: str, source: Union[str, Path, bytes]) -> int:
+        temp = self.path / (name + "." + os.urandom(4).hex() + self.TEMP_EXTENSION)
+
+        try:
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                with open(temp, "wb") as f:
+                    f.write(source)
+            else:
+                shutil.copyfile(source, temp)
+
+            os.replace(temp, self.path / name)
+        except BaseException:
+            temp.unlink(missing_ok=True)
+            raise
+
+        return os.path.getsize(self.path / name)
+
+    async def evict(self):
+        # The most recent entry is always kept. Entries being read are skipped and evicted by a later call
+        for name in list(self.entries)[:-1]:
+            if self.size <= self.max_size:
+                break
+
+            if self.readers[name]:
+                continue
+
+            size = self.entries.pop(name)
+            self.size -= size
+            self.evictions += 1
+
+            try:
+                await self.run(os.remove, self.path / name)
+            except FileNotFoundError:
+                pass
+
+    def pin(self, path: Path):
+        self.readers[path.name] += 1
+
+    def unpin(self, path: Path):
+        self.readers[path.name] -= 1
+
+        if not self.readers[path.name]:
+            del self.readers[path.name]
+
+    async def copy(self, path: Path, destination: str):
+        """Copy a cached file to its destination."""
+        self.pin(path)
+
+        try:
+            await self.run(shutil.copyfile, path, destination)
+        finally:
+            self.unpin(path)
+
+    async def read(self, path: Path) -> bytes:
+        """Read a cached file into memory."""
+        self.pin(path)
+
+        try:
+            return await self.run(path.read_bytes)
+        finally:
+            self.unpin(path)
+
+    def stream(self, path: Path, start: int = 0, end: Optional[int] = None, chunk_size: int = 1024 * 1024):
+        """Yield the bytes between two offsets of a cached file (end included), read through a memory map."""
+        # Pinned right away rather than on the first iteration, the entry can't be evicted in between
+        self.pin(path)
+
+        return self._stream(path, start, end, chunk_size)
+
+    async def _stream(self, path: Path, start: int, end: Optional[int], chunk_size: int):
+        chunks = self._iter_range(path, start, end, chunk_size)
+        lock = threading.Lock()
+
+        def read() -> Optional[bytes]:
+            with lock:
+                return next(chunks, None)
+
+        def close():
+            with lock:
+                chunks.close()
+
+        try:
+            while True:
+                chunk = await self.run(read)
+
+                if chunk is None:
+                    break
+
+                yield chunk
+        finally:
+            # A cancelled stream may still be reading in the executor, the file is closed there once the read is done
+            asyncio.get_event_loop().run_in_executor(self.executor, close)
+            self.unpin(path)
+
+    @staticmethod
+    def _iter_range(path: Path, start: int, end: Optional[int], chunk_size: int) -> Iterator[bytes]:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+
+            if size == 0:
+                return
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                end = size - 1 if end is None else min(end, size - 1)
+
+                for offset in range(start, end + 1, chunk_size):
+                    yield m[offset:min(offset + chunk_size, end + 1)]
@@ -16,6 +16,7 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 import logging
 
 import kurimypyrogram
@@ -75,30 +76,60 @@ class Invoke:
         if not self.is_connected:
             raise ConnectionError("Client has not been started yet")
 
-        session = self.session
+        async def send(query: TLObject):
+            if self.flood_control is not None:
+                await self.flood_control.acquire(query)
 
-        if business_connection_id:
-            query = raw.functions.InvokeWithBusinessConnection(
-                connection_id=business_connection_id,
-                query=query
+            session = self.session
+
+            if business_connection_id:
+                query = raw.functions.InvokeWithBusinessConnection(
+                    connection_id=business_connection_id,
+                    query=query
+                )
+
+                session = await get_session(self, business_connection_id)
+            elif self.session_pool:
+                session = min([self.session, *self.session_pool], key=lambda s: len(s.results))
+
+            if self.no_updates or session.is_pooled:
+                query = raw.functions.InvokeWithoutUpdates(query=query)
+
+            if self.takeout_id:
+                query = raw.functions.InvokeWithTakeout(takeout_id=self.takeout_id, query=query)
+
+            r = await session.invoke(
+                query, retries, timeout,
+                (sleep_threshold
+                 if sleep_threshold is not None
+                 else self.sleep_threshold)
             )
 
-            session = await get_session(self, business_connection_id)
+            await self.fetch_peers(getattr(r, "users", []))
+            await self.fetch_peers(getattr(r, "chats", []))
+
+            return r
+
+        # Identical read-only queries already in flight share the same request and result, as long as they are sent
+        # with the same retries, timeout and sleep threshold
+        if not business_connection_id and query.QUALNAME in self.SINGLE_FLIGHT_QUERIES:
+            key = (query.write(), retries, timeout, sleep_threshold)
+            task = self.inflight_queries.get(key)
+
+            if task is None:
+                self.single_flight_misses += 1
 
-        if self.no_updates:
-            query = raw.functions.InvokeWithoutUpdates(query=query)
+                def forget(t):
+                    self.inflight_queries.pop(key, None)
 
-        if self.takeout_id:
-            query = raw.functions.InvokeWithTakeout(takeout_id=self.takeout_id, query=query)
+                    if not t.cancelled():
+                        t.exception()
 
-        r = await session.invoke(
-            query, retries, timeout,
-            (sleep_threshold
-             if sleep_threshold is not None
-             else self.sleep_threshold)
-        )
+                task = self.inflight_queries[key] = self.loop.create_task(send(query))
+                task.add_done_callback(forget)
+            else:
+                self.single_flight_hits += 1
 
-        await self.fetch_peers(getattr(r, "users", []))
-        await self.fetch_peers(getattr(r, "chats", []))
+            return await asyncio.shield(task)
 
-        return r
+        return await send(query)
@@ -23,6 +23,7 @@ import io
 import logging
 import math
 import os
+import time
 from hashlib import md5
 from pathlib import PurePath
 from typing import Union, BinaryIO, Callable
@@ -30,12 +31,143 @@ from typing import Union, BinaryIO, Callable
 import kurimypyrogram
 from kurimypyrogram import StopTransmission
 from kurimypyrogram import raw
-from kurimypyrogram.session import Session
+from kurimypyrogram.errors import FloodWait
 
 log = logging.getLogger(__name__)
 
 
+class PartUploader:
+    """Uploads file parts with a number of workers adapting to the observed throughput.
+
+    A worker is added whenever the last round of parts (one per worker) went noticeably faster than the best round
+    so far. The workers are halved on flood waits: the parts already in flight are left out of the rounds, and the
+    next round sets the throughput to beat from then on, so that workers aren't added right back. Failed parts are
+    retried on their own.
+    """
+
+    MAX_RETRIES = 5
+
+    def __init__(self, client: "kurimypyrogram.Client", dc_id: int, workers: int, max_workers: int):
+        self.client = client
+        self.dc_id = dc_id
+        self.target = workers
+        self.max_workers = max(workers, max_workers)
+
+        self.queue = asyncio.Queue(self.max_workers)
+        self.workers = set()
+        self.error = None
+
+        self.round_start = time.monotonic()
+        self.round_parts = 0
+        self.round_bytes = 0
+        self.best_rate = 0.0
+        self.measure_only = False
+        self.skipped_parts = 0
+
+        self.spawn()
+
+    def spawn(self):
+        while len(self.workers) < self.target:
+            task = self.client.loop.create_task(self.worker())
+            self.workers.add(task)
+            task.add_done_callback(self.workers.discard)
+
+    async def put(self, rpc):
+        if self.error:
+            raise self.error
+
+        await self.queue.put(rpc)
+
+    async def join(self):
+        await self.queue.join()
+
+        if self.error:
+            raise self.error
+
+    async def close(self):
+        for task in self.workers:
+            task.cancel()
+
+        await asyncio.gather(*self.workers, return_exceptions=True)
+
+    async def worker(self):
+        while True:
+            if len(self.workers) > self.target:
+                self.workers.discard(asyncio.current_task())
+                return
+
+            rpc = await self.queue.get()
+
+            try:
+                # Once a part has failed for good, the remaining ones are only drained
+                if not self.error:
+                    await self.send(rpc)
+            finally:
+                self.queue.task_done()
+
+    async def send(self, rpc):
+        attempt = 0
+
+        while True:
+            try:
+                session = await self.client.get_media_session(self.dc_id)
+                await session.invoke(rpc)
+            except FloodWait as e:
+                self.target = max(1, self.target // 2)
+                self.best_rate = 0.0
+                self.measure_only = True
+                self.skipped_parts = len(self.workers) - 1
+                self.round_start = time.monotonic()
+                self.round_parts = 0
+                self.round_bytes = 0
+
+                log.warning("[%s] Waiting %ss before uploading part %s again", self.client.name, e.value, rpc.file_part)
+                await asyncio.sleep(e.value)
+            except Exception as e:
+                attempt += 1
+
+                if attempt >= self.MAX_RETRIES:
+                    self.error = e
+                    return
+
+                log.warning("[%s] Retrying the upload of part %s: %s", self.client.name, rpc.file_part, e)
+                await asyncio.sleep(attempt)
+            else:
+                self.record(len(rpc.bytes))
+                return
+
+    def record(self, size: int):
+        if self.skipped_parts > 0:
+            self.skipped_parts -= 1
+            self.round_start = time.monotonic()
+            return
+
+        self.round_parts += 1
+        self.round_bytes += size
+
+        if self.round_parts < self.target:
+            return
+
+        now = time.monotonic()
+        rate = self.round_bytes / max(now - self.round_start, 1e-6)
+
+        if self.measure_only:
+            self.measure_only = False
+        elif rate > self.best_rate * 1.1 and self.target < self.max_workers:
+            self.target += 1
+            self.spawn()
+
+        self.best_rate = max(self.best_rate, rate)
+        self.round_start = now
+        self.round_parts = 0
+        self.round_bytes = 0
+
+
 class SaveFile:
+    UPLOAD_WORKERS_BIG = 4
+    MAX_UPLOAD_WORKERS = 2
+    MAX_UPLOAD_WORKERS_BIG = 16
+
     async def save_file(
         self: "kurimypyrogram.Client",
         path: Union[str, BinaryIO],
@@ -98,22 +230,10 @@ class SaveFile:
             if path is None:
                 return None
 
-            async def worker(session):
-                while True:
-                    data = await queue.get()
-
-                    if data is None:
-                        return
-
-                    try:
-                        await session.invoke(data)
-                    except Exception as e:
-                        log.exception(e)
-
             part_size = 512 * 1024
 
             if isinstance(path, (str, PurePath)):
-                fp = open(path, "rb")
+                fp = await self.loop.run_in_executor(self.executor, open, path, "rb")
             elif isinstance(path, io.IOBase):
                 fp = path
             else:
@@ -121,9 +241,14 @@ class SaveFile:
 
             file_name = getattr(fp, "name", "file.jpg")
 
-            fp.seek(0, os.SEEK_END)
-            file_size = fp.tell()
-            fp.seek(0)
+            def get_size() -> int:
+                fp.seek(0, os.SEEK_END)
+                size = fp.tell()
+                fp.seek(0)
+
+                return size
+
+            file_size = await self.loop.run_in_executor(self.executor, get_size)
 
             if file_size == 0:
                 raise ValueError("File size equals to 0 B")
@@ -135,28 +260,32 @@ class SaveFile:
 
             file_total_parts = int(math.ceil(file_size / part_size))
             is_big = file_size > 10 * 1024 * 1024
-            workers_count = 4 if is_big else 1
             is_missing_part = file_id is not None
             file_id = file_id or self.rnd_id()
             md5_sum = md5() if not is_big and not is_missing_part else None
             dc_id = await self.storage.dc_id()
 
-            session = self.media_sessions.get(dc_id)
-            if not session:
-                session = self.media_sessions[dc_id] = Session(
-                    self, dc_id, await self.storage.auth_key(),
-                    await self.storage.test_mode(), is_media=True
-                )
-                await session.start()
+            await self.get_media_session(dc_id)
+
+            uploader = PartUploader(
+                self, dc_id,
+                workers=self.UPLOAD_WORKERS_BIG if is_big else 1,
+                max_workers=self.MAX_UPLOAD_WORKERS_BIG if is_big else self.MAX_UPLOAD_WORKERS
+            )
 
-            workers = [self.loop.create_task(worker(session)) for _ in range(workers_count)]
-            queue = asyncio.Queue(1)
+            def read_part() -> bytes:
+                data = fp.read(part_size)
+
+                if md5_sum is not None:
+                    md5_sum.update(data)
+
+                return data
 
             try:
-                fp.seek(part_size * file_part)
+                await self.loop.run_in_executor(self.executor, fp.seek, part_size * file_part)
 
                 while True:
-                    chunk = fp.read(part_size)
+                    chunk = await self.loop.run_in_executor(self.executor, read_part)
 
                     if not chunk:
                         if not is_big and not is_missing_part:
@@ -177,14 +306,12 @@ class SaveFile:
                             bytes=chunk
                         )
 
-                    await queue.put(rpc)
+                    await uploader.put(rpc)
 
                     if is_missing_part:
+                        await uploader.join()
                         return
 
-                    if not is_big and not is_missing_part:
-                        md5_sum.update(chunk)
-
                     file_part += 1
 
                     if progress:
@@ -199,9 +326,15 @@ class SaveFile:
                             await func()
                         else:
                             await self.loop.run_in_executor(self.executor, func)
+
+                await uploader.join()
             except StopTransmission:
                 raise
             except Exception as e:
+                # A part that couldn't be uploaded even after retrying makes the whole file unusable
+                if e is uploader.error:
+                    raise
+
                 log.exception(e)
             else:
                 if is_big:
@@ -219,10 +352,7 @@ class SaveFile:
                         md5_checksum=md5_sum
                     )
             finally:
-                for _ in workers:
-                    await queue.put(None)
-
-                await asyncio.gather(*workers)
+                await uploader.close()
 
                 if isinstance(path, (str, PurePath)):
-                    fp.close()
+                    await self.loop.run_in_executor(self.executor, fp.close)
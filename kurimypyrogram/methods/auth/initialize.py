@@ -20,6 +20,7 @@ import asyncio
 import logging
 
 import kurimypyrogram
+from kurimypyrogram.session import Session
 
 log = logging.getLogger(__name__)
 
@@ -45,6 +46,18 @@ class Initialize:
 
         self.load_plugins()
 
+        if self.main_sessions > 1:
+            dc_id = await self.storage.dc_id()
+            auth_key = await self.storage.auth_key()
+            test_mode = await self.storage.test_mode()
+
+            self.session_pool = [
+                Session(self, dc_id, auth_key, test_mode, is_pooled=True)
+                for _ in range(self.main_sessions - 1)
+            ]
+
+            await asyncio.gather(*[session.start() for session in self.session_pool])
+
         await self.dispatcher.start()
 
         self.updates_watchdog_task = asyncio.create_task(self.updates_watchdog())
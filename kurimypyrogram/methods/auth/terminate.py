@@ -51,6 +51,16 @@ class Terminate:
 
         self.media_sessions.clear()
 
+        for cdn_session in self.cdn_sessions.values():
+            await cdn_session.stop()
+
+        self.cdn_sessions.clear()
+
+        for session in self.session_pool:
+            await session.stop()
+
+        self.session_pool.clear()
+
         self.updates_watchdog_event.set()
 
         if self.updates_watchdog_task is not None:
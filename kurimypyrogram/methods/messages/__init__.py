@@ -19,6 +19,7 @@
 from .copy_media_group import CopyMediaGroup
 from .copy_message import CopyMessage
 from .delete_messages import DeleteMessages
+from .download_many import DownloadMany
 from .download_media import DownloadMedia
 from .edit_inline_caption import EditInlineCaption
 from .edit_inline_media import EditInlineMedia
@@ -110,6 +111,7 @@ class Messages(
     StopPoll,
     RetractVote,
     DownloadMedia,
+    DownloadMany,
     GetChatHistory,
     SendCachedMedia,
     GetChatHistoryCount,
@@ -0,0 +1,81 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from typing import Union, Iterable, AsyncIterable
+
+import kurimypyrogram
+from kurimypyrogram.download_manager import DownloadManager
+from .download_media import DEFAULT_DOWNLOAD_DIR
+
+
+class DownloadMany:
+    def download_many(
+        self: "kurimypyrogram.Client",
+        messages: Union[Iterable, AsyncIterable],
+        dest: str = DEFAULT_DOWNLOAD_DIR,
+        concurrency: int = DownloadManager.CONCURRENCY,
+        per_dc_limit: int = DownloadManager.PER_DC_LIMIT,
+        resume: bool = True
+    ) -> DownloadManager:
+        """Download the media from many messages at once.
+
+        Downloads are spread fairly across the DCs the files are stored in and the smallest files of each DC are
+        downloaded first. Expired file references are refreshed in bulk, and flood waits only pause the affected
+        downloads. Batch downloads aren't limited by *max_concurrent_transmissions*, but by *concurrency* instead.
+
+        .. include:: /_includes/usable-by/users-bots.rst
+
+        Parameters:
+            messages (Iterable | AsyncIterable):
+                Messages, Stories, medias or file ids to download the media of, e.g. the result of
+                :meth:`~kurimypyrogram.Client.get_chat_history`. Asynchronous iterables are consumed entirely before
+                the first download starts, in order to sort the files by size.
+
+            dest (``str``, *optional*):
+                Directory the files are downloaded into. Non-existent folders will be created automatically.
+                Defaults to the *downloads* folder in your working directory.
+
+            concurrency (``int``, *optional*):
+                Maximum amount of files downloaded at once.
+                Defaults to 8.
+
+            per_dc_limit (``int``, *optional*):
+                Maximum amount of files downloaded at once from the same DC.
+                Defaults to 4.
+
+            resume (``bool``, *optional*):
+                Pass False to start over the downloads interrupted in a previous run instead of resuming them.
+                Defaults to True.
+
+        Returns:
+            ``DownloadManager``: An asynchronous iterable of results, one for each message, in the order the
+            downloads complete. Each result has the *message*, the *path* of the downloaded file (None on failure),
+            its *size* and the *error*, if any. The manager keeps the aggregate *completed*, *failed*, *downloaded*
+            (bytes), *elapsed* and *throughput* (bytes per second) statistics.
+
+        Example:
+            .. code-block:: python
+
+                downloads = app.download_many(app.get_chat_history(chat_id), "archive/")
+
+                async for result in downloads:
+                    print(result.path or result.error)
+
+                print(f"{downloads.throughput / 1024 / 1024:.1f} MiB/s")
+        """
+        return DownloadManager(self, messages, dest, concurrency, per_dc_limit, resume)
@@ -28,6 +28,112 @@ from kurimypyrogram.file_id import FileId, FileType, PHOTO_TYPES
 DEFAULT_DOWNLOAD_DIR = "downloads/"
 
 
+def get_media(message: Union["types.Message", "types.Story", str]):
+    available_media = ("audio", "document", "photo", "sticker", "animation", "video", "voice", "video_note",
+                       "new_chat_photo")
+
+    media = None
+
+    if isinstance(message, types.Message) and message.media:
+        for kind in available_media:
+            story = message.story or message.reply_to_story
+            if story:
+                media = getattr(story, kind, None)
+            else:
+                media = getattr(message, kind, None)
+
+            if media is not None:
+                break
+    elif isinstance(message, types.Story):
+        media = getattr(message, message.media.value, None)
+    elif isinstance(message, str):
+        media = message
+    elif hasattr(message, "file_id"):
+        media = getattr(message, "file_id")
+
+    return media
+
+
+def prepare_download(
+    client: "kurimypyrogram.Client",
+    message: Union["types.Message", "types.Story", str],
+    file_name: str = DEFAULT_DOWNLOAD_DIR,
+    in_memory: bool = False,
+    progress: Callable = None,
+    progress_args: tuple = (),
+    resume: bool = False,
+    refresh: Callable = None
+) -> tuple:
+    """Build the packet :meth:`~kurimypyrogram.Client.handle_download` takes for the media of a message."""
+    media = get_media(message)
+
+    if not media:
+        raise ValueError("This message doesn't contain any downloadable media")
+
+    if isinstance(media, str):
+        file_id_str = media
+    else:
+        file_id_str = media.file_id
+
+    file_id_obj = FileId.decode(file_id_str)
+
+    if refresh is None and isinstance(message, types.Message) and message.chat:
+        async def refresh():
+            fresh_media = get_media(await client.get_messages(message.chat.id, message.id))
+
+            if not fresh_media:
+                raise ValueError("The message doesn't contain any downloadable media anymore")
+
+            return FileId.decode(fresh_media.file_id)
+
+    file_type = file_id_obj.file_type
+    media_file_name = getattr(media, "file_name", "")
+    file_size = getattr(media, "file_size", 0)
+    mime_type = getattr(media, "mime_type", "")
+    date = getattr(media, "date", None)
+
+    directory, file_name = os.path.split(file_name)
+    file_name = file_name or media_file_name or ""
+
+    if not os.path.isabs(file_name):
+        directory = client.PARENT_DIR / (directory or DEFAULT_DOWNLOAD_DIR)
+
+    if not file_name:
+        guessed_extension = client.guess_extension(mime_type)
+
+        if file_type in PHOTO_TYPES:
+            extension = ".jpg"
+        elif file_type == FileType.VOICE:
+            extension = guessed_extension or ".ogg"
+        elif file_type in (FileType.VIDEO, FileType.ANIMATION, FileType.VIDEO_NOTE):
+            extension = guessed_extension or ".mp4"
+        elif file_type == FileType.DOCUMENT:
+            extension = guessed_extension or ".zip"
+        elif file_type == FileType.STICKER:
+            extension = guessed_extension or ".webp"
+        elif file_type == FileType.AUDIO:
+            extension = guessed_extension or ".mp3"
+        else:
+            extension = ".unknown"
+
+        if resume and getattr(media, "file_unique_id", None):
+            file_name = "{}_{}{}".format(
+                FileType(file_id_obj.file_type).name.lower(),
+                media.file_unique_id,
+                extension
+            )
+        else:
+            file_name = "{}_{}_{}{}".format(
+                FileType(file_id_obj.file_type).name.lower(),
+                (date or datetime.now()).strftime("%Y-%m-%d_%H-%M-%S"),
+                client.rnd_id(),
+                extension
+            )
+
+    return (file_id_obj, directory, file_name, in_memory, file_size, progress, progress_args,
+            resume and not in_memory, refresh)
+
+
 class DownloadMedia:
     async def download_media(
         self: "kurimypyrogram.Client",
@@ -36,7 +142,8 @@ class DownloadMedia:
         in_memory: bool = False,
         block: bool = True,
         progress: Callable = None,
-        progress_args: tuple = ()
+        progress_args: tuple = (),
+        resume: bool = False
     ) -> Optional[Union[str, BinaryIO]]:
         """Download the media from a message.
 
@@ -73,6 +180,14 @@ class DownloadMedia:
                 You can pass anything you need to be available in the progress callback scope; for example, a Message
                 object or a Client instance in order to edit the message with the updated progress status.
 
+            resume (``bool``, *optional*):
+                Pass True to resume an interrupted download instead of starting over. The partial file left by a
+                previous attempt is kept when the download fails and the next call continues from its first missing
+                chunk, refreshing the file reference from the message if it expired meanwhile.
+                Files named automatically get a stable name based on their unique id so that they can be found again.
+                Not available for in-memory downloads.
+                Defaults to False.
+
         Other Parameters:
             current (``int``):
                 The amount of bytes transmitted so far.
@@ -113,6 +228,9 @@ class DownloadMedia:
 
                 await app.download_media(message, progress=progress)
 
+                # Continue a previously interrupted download
+                await app.download_media(message, resume=True)
+
             Download media in-memory
 
             .. code-block:: python
@@ -122,77 +240,8 @@ class DownloadMedia:
                 file_name = file.name
                 file_bytes = bytes(file.getbuffer())
         """
-        available_media = ("audio", "document", "photo", "sticker", "animation", "video", "voice", "video_note",
-                           "new_chat_photo")
-
-        media = None
-
-        if isinstance(message, types.Message) and message.media:
-            for kind in available_media:
-                story = message.story or message.reply_to_story
-                if story:
-                    media = getattr(story, kind, None)
-                else:
-                    media = getattr(message, kind, None)
-
-                if media is not None:
-                    break
-        elif isinstance(message, types.Story):
-            media = getattr(message, message.media.value, None)
-        elif isinstance(message, str):
-            media = message
-        elif hasattr(message, "file_id"):
-            media = getattr(message, "file_id")
-
-        if not media:
-            raise ValueError("This message doesn't contain any downloadable media")
-
-        if isinstance(media, str):
-            file_id_str = media
-        else:
-            file_id_str = media.file_id
-
-        file_id_obj = FileId.decode(file_id_str)
-
-        file_type = file_id_obj.file_type
-        media_file_name = getattr(media, "file_name", "")
-        file_size = getattr(media, "file_size", 0)
-        mime_type = getattr(media, "mime_type", "")
-        date = getattr(media, "date", None)
-
-        directory, file_name = os.path.split(file_name)
-        file_name = file_name or media_file_name or ""
-
-        if not os.path.isabs(file_name):
-            directory = self.PARENT_DIR / (directory or DEFAULT_DOWNLOAD_DIR)
-
-        if not file_name:
-            guessed_extension = self.guess_extension(mime_type)
-
-            if file_type in PHOTO_TYPES:
-                extension = ".jpg"
-            elif file_type == FileType.VOICE:
-                extension = guessed_extension or ".ogg"
-            elif file_type in (FileType.VIDEO, FileType.ANIMATION, FileType.VIDEO_NOTE):
-                extension = guessed_extension or ".mp4"
-            elif file_type == FileType.DOCUMENT:
-                extension = guessed_extension or ".zip"
-            elif file_type == FileType.STICKER:
-                extension = guessed_extension or ".webp"
-            elif file_type == FileType.AUDIO:
-                extension = guessed_extension or ".mp3"
-            else:
-                extension = ".unknown"
-
-            file_name = "{}_{}_{}{}".format(
-                FileType(file_id_obj.file_type).name.lower(),
-                (date or datetime.now()).strftime("%Y-%m-%d_%H-%M-%S"),
-                self.rnd_id(),
-                extension
-            )
-
         downloader = self.handle_download(
-            (file_id_obj, directory, file_name, in_memory, file_size, progress, progress_args)
+            prepare_download(self, message, file_name, in_memory, progress, progress_args, resume)
         )
 
         if block:
@@ -16,6 +16,7 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 import os
 import re
 from datetime import datetime
@@ -212,8 +213,10 @@ class SendAnimation:
         try:
             if isinstance(animation, str):
                 if os.path.isfile(animation):
-                    thumb = await self.save_file(thumb)
-                    file = await self.save_file(animation, progress=progress, progress_args=progress_args)
+                    thumb, file = await asyncio.gather(
+                        self.save_file(thumb),
+                        self.save_file(animation, progress=progress, progress_args=progress_args)
+                    )
                     media = raw.types.InputMediaUploadedDocument(
                         mime_type=self.guess_mime_type(animation) or "video/mp4",
                         file=file,
@@ -238,8 +241,10 @@ class SendAnimation:
                 else:
                     media = utils.get_input_media_from_file_id(animation, FileType.ANIMATION, has_spoiler=has_spoiler)
             else:
-                thumb = await self.save_file(thumb)
-                file = await self.save_file(animation, progress=progress, progress_args=progress_args)
+                thumb, file = await asyncio.gather(
+                    self.save_file(thumb),
+                    self.save_file(animation, progress=progress, progress_args=progress_args)
+                )
                 media = raw.types.InputMediaUploadedDocument(
                     mime_type=self.guess_mime_type(file_name or animation.name) or "video/mp4",
                     file=file,
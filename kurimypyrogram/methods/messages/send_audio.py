@@ -16,6 +16,7 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 import os
 import re
 from datetime import datetime
@@ -209,8 +210,10 @@ class SendAudio:
                     mime_type = self.guess_mime_type(audio) or "audio/mpeg"
                     if mime_type == "audio/ogg":
                         mime_type = "audio/opus"
-                    thumb = await self.save_file(thumb)
-                    file = await self.save_file(audio, progress=progress, progress_args=progress_args)
+                    thumb, file = await asyncio.gather(
+                        self.save_file(thumb),
+                        self.save_file(audio, progress=progress, progress_args=progress_args)
+                    )
                     media = raw.types.InputMediaUploadedDocument(
                         mime_type=mime_type,
                         file=file,
@@ -234,8 +237,10 @@ class SendAudio:
                 mime_type = self.guess_mime_type(file_name or audio.name) or "audio/mpeg"
                 if mime_type == "audio/ogg":
                     mime_type = "audio/opus"
-                thumb = await self.save_file(thumb)
-                file = await self.save_file(audio, progress=progress, progress_args=progress_args)
+                thumb, file = await asyncio.gather(
+                    self.save_file(thumb),
+                    self.save_file(audio, progress=progress, progress_args=progress_args)
+                )
                 media = raw.types.InputMediaUploadedDocument(
                     mime_type=mime_type,
                     file=file,
@@ -16,6 +16,7 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 import os
 import re
 from datetime import datetime
@@ -26,7 +27,7 @@ from kurimypyrogram import StopTransmission, enums
 from kurimypyrogram import raw
 from kurimypyrogram import types
 from kurimypyrogram import utils
-from kurimypyrogram.errors import FilePartMissing
+from kurimypyrogram.errors import FilePartMissing, FileReferenceExpired, MediaEmpty
 from kurimypyrogram.file_id import FileType
 
 
@@ -191,10 +192,17 @@ class SendDocument:
         file = None
 
         try:
-            if isinstance(document, str):
+            upload_key = await self.get_upload_key(document, FileType.DOCUMENT, file_name, force_document, thumb=thumb)
+            cached_file_id = await self.get_cached_upload(upload_key)
+
+            if cached_file_id:
+                media = utils.get_input_media_from_file_id(cached_file_id, FileType.DOCUMENT)
+            elif isinstance(document, str):
                 if os.path.isfile(document):
-                    thumb = await self.save_file(thumb)
-                    file = await self.save_file(document, progress=progress, progress_args=progress_args)
+                    thumb, file = await asyncio.gather(
+                        self.save_file(thumb),
+                        self.save_file(document, progress=progress, progress_args=progress_args)
+                    )
                     media = raw.types.InputMediaUploadedDocument(
                         mime_type=self.guess_mime_type(document) or "application/zip",
                         file=file,
@@ -211,8 +219,10 @@ class SendDocument:
                 else:
                     media = utils.get_input_media_from_file_id(document, FileType.DOCUMENT)
             else:
-                thumb = await self.save_file(thumb)
-                file = await self.save_file(document, progress=progress, progress_args=progress_args)
+                thumb, file = await asyncio.gather(
+                    self.save_file(thumb),
+                    self.save_file(document, progress=progress, progress_args=progress_args)
+                )
                 media = raw.types.InputMediaUploadedDocument(
                     mime_type=self.guess_mime_type(file_name or document.name) or "application/zip",
                     file=file,
@@ -252,12 +262,36 @@ class SendDocument:
                     )
                 except FilePartMissing as e:
                     await self.save_file(document, file_id=file.id, file_part=e.value)
+                except (FileReferenceExpired, MediaEmpty):
+                    if not cached_file_id:
+                        raise
+
+                    # The previously uploaded document can't be reused anymore, upload it again
+                    await self.storage.upload_file_id(upload_key, None)
+                    cached_file_id = None
+
+                    thumb, file = await asyncio.gather(
+                        self.save_file(thumb),
+                        self.save_file(document, progress=progress, progress_args=progress_args)
+                    )
+                    media = raw.types.InputMediaUploadedDocument(
+                        mime_type=self.guess_mime_type(document) or "application/zip",
+                        file=file,
+                        force_file=force_document or None,
+                        thumb=thumb,
+                        attributes=[
+                            raw.types.DocumentAttributeFilename(file_name=file_name or os.path.basename(document))
+                        ]
+                    )
                 else:
                     for i in r.updates:
                         if isinstance(i, (raw.types.UpdateNewMessage,
                                           raw.types.UpdateNewChannelMessage,
                                           raw.types.UpdateNewScheduledMessage,
                                           raw.types.UpdateBotNewBusinessMessage)):
+                            if not cached_file_id:
+                                await self.set_cached_upload(upload_key, i.message.media, FileType.DOCUMENT)
+
                             return await types.Message._parse(
                                 self, i.message,
                                 {i.id: i for i in r.users},
@@ -16,6 +16,7 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 import logging
 import os
 import re
@@ -135,23 +136,29 @@ class SendMediaGroup:
                     ]
                 )
         """
-        multi_media = []
-
-        for i in media:
+        async def get_media(i):
             if isinstance(i, types.InputMediaPhoto):
                 if isinstance(i.media, str):
                     if os.path.isfile(i.media):
-                        media = await self.invoke(
-                            raw.functions.messages.UploadMedia(
-                                peer=await self.resolve_peer(chat_id),
-                                media=raw.types.InputMediaUploadedPhoto(
-                                    file=await self.save_file(i.media),
-                                    spoiler=i.has_spoiler
-                                ),
-                                business_connection_id=business_connection_id
-                            )
+                        upload_key = await self.get_upload_key(i.media, FileType.PHOTO)
+                        media = await self.get_cached_upload_media(
+                            upload_key, FileType.PHOTO, await self.resolve_peer(chat_id), business_connection_id
                         )
 
+                        if media is None:
+                            media = await self.invoke(
+                                raw.functions.messages.UploadMedia(
+                                    peer=await self.resolve_peer(chat_id),
+                                    media=raw.types.InputMediaUploadedPhoto(
+                                        file=await self.save_file(i.media),
+                                        spoiler=i.has_spoiler
+                                    ),
+                                    business_connection_id=business_connection_id
+                                )
+                            )
+
+                            await self.set_cached_upload(upload_key, media, FileType.PHOTO)
+
                         media = raw.types.InputMediaPhoto(
                             id=raw.types.InputPhoto(
                                 id=media.photo.id,
@@ -205,28 +212,42 @@ class SendMediaGroup:
             elif isinstance(i, types.InputMediaVideo):
                 if isinstance(i.media, str):
                     if os.path.isfile(i.media):
-                        media = await self.invoke(
-                            raw.functions.messages.UploadMedia(
-                                peer=await self.resolve_peer(chat_id),
-                                media=raw.types.InputMediaUploadedDocument(
-                                    file=await self.save_file(i.media),
-                                    thumb=await self.save_file(i.thumb),
-                                    spoiler=i.has_spoiler,
-                                    mime_type=self.guess_mime_type(i.media) or "video/mp4",
-                                    nosound_video=True,
-                                    attributes=[
-                                        raw.types.DocumentAttributeVideo(
-                                            supports_streaming=i.supports_streaming or None,
-                                            duration=i.duration,
-                                            w=i.width,
-                                            h=i.height
-                                        ),
-                                        raw.types.DocumentAttributeFilename(file_name=os.path.basename(i.media))
-                                    ]
-                                ),
-                                business_connection_id=business_connection_id
-                            )
+                        upload_key = await self.get_upload_key(
+                            i.media, FileType.VIDEO,
+                            i.supports_streaming, i.duration, i.width, i.height,
+                            thumb=i.thumb
                         )
+                        media = await self.get_cached_upload_media(
+                            upload_key, FileType.VIDEO, await self.resolve_peer(chat_id), business_connection_id
+                        )
+
+                        if media is None:
+                            file, thumb = await asyncio.gather(self.save_file(i.media), self.save_file(i.thumb))
+
+                            media = await self.invoke(
+                                raw.functions.messages.UploadMedia(
+                                    peer=await self.resolve_peer(chat_id),
+                                    media=raw.types.InputMediaUploadedDocument(
+                                        file=file,
+                                        thumb=thumb,
+                                        spoiler=i.has_spoiler,
+                                        mime_type=self.guess_mime_type(i.media) or "video/mp4",
+                                        nosound_video=True,
+                                        attributes=[
+                                            raw.types.DocumentAttributeVideo(
+                                                supports_streaming=i.supports_streaming or None,
+                                                duration=i.duration,
+                                                w=i.width,
+                                                h=i.height
+                                            ),
+                                            raw.types.DocumentAttributeFilename(file_name=os.path.basename(i.media))
+                                        ]
+                                    ),
+                                    business_connection_id=business_connection_id
+                                )
+                            )
+
+                            await self.set_cached_upload(upload_key, media, FileType.VIDEO)
 
                         media = raw.types.InputMediaDocument(
                             id=raw.types.InputDocument(
@@ -259,12 +280,14 @@ class SendMediaGroup:
                     else:
                         media = utils.get_input_media_from_file_id(i.media, FileType.VIDEO, has_spoiler=i.has_spoiler)
                 else:
+                    file, thumb = await asyncio.gather(self.save_file(i.media), self.save_file(i.thumb))
+
                     media = await self.invoke(
                         raw.functions.messages.UploadMedia(
                             peer=await self.resolve_peer(chat_id),
                             media=raw.types.InputMediaUploadedDocument(
-                                file=await self.save_file(i.media),
-                                thumb=await self.save_file(i.thumb),
+                                file=file,
+                                thumb=thumb,
                                 spoiler=i.has_spoiler,
                                 mime_type=self.guess_mime_type(getattr(i.media, "name", "video.mp4")) or "video/mp4",
                                 nosound_video=True,
@@ -293,26 +316,40 @@ class SendMediaGroup:
             elif isinstance(i, types.InputMediaAudio):
                 if isinstance(i.media, str):
                     if os.path.isfile(i.media):
-                        media = await self.invoke(
-                            raw.functions.messages.UploadMedia(
-                                peer=await self.resolve_peer(chat_id),
-                                media=raw.types.InputMediaUploadedDocument(
-                                    mime_type=self.guess_mime_type(i.media) or "audio/mpeg",
-                                    file=await self.save_file(i.media),
-                                    thumb=await self.save_file(i.thumb),
-                                    attributes=[
-                                        raw.types.DocumentAttributeAudio(
-                                            duration=i.duration,
-                                            performer=i.performer,
-                                            title=i.title
-                                        ),
-                                        raw.types.DocumentAttributeFilename(file_name=os.path.basename(i.media))
-                                    ]
-                                ),
-                                business_connection_id=business_connection_id
-                            )
+                        upload_key = await self.get_upload_key(
+                            i.media, FileType.AUDIO,
+                            i.duration, i.performer, i.title,
+                            thumb=i.thumb
+                        )
+                        media = await self.get_cached_upload_media(
+                            upload_key, FileType.AUDIO, await self.resolve_peer(chat_id), business_connection_id
                         )
 
+                        if media is None:
+                            file, thumb = await asyncio.gather(self.save_file(i.media), self.save_file(i.thumb))
+
+                            media = await self.invoke(
+                                raw.functions.messages.UploadMedia(
+                                    peer=await self.resolve_peer(chat_id),
+                                    media=raw.types.InputMediaUploadedDocument(
+                                        mime_type=self.guess_mime_type(i.media) or "audio/mpeg",
+                                        file=file,
+                                        thumb=thumb,
+                                        attributes=[
+                                            raw.types.DocumentAttributeAudio(
+                                                duration=i.duration,
+                                                performer=i.performer,
+                                                title=i.title
+                                            ),
+                                            raw.types.DocumentAttributeFilename(file_name=os.path.basename(i.media))
+                                        ]
+                                    ),
+                                    business_connection_id=business_connection_id
+                                )
+                            )
+
+                            await self.set_cached_upload(upload_key, media, FileType.AUDIO)
+
                         media = raw.types.InputMediaDocument(
                             id=raw.types.InputDocument(
                                 id=media.document.id,
@@ -341,13 +378,15 @@ class SendMediaGroup:
                     else:
                         media = utils.get_input_media_from_file_id(i.media, FileType.AUDIO)
                 else:
+                    file, thumb = await asyncio.gather(self.save_file(i.media), self.save_file(i.thumb))
+
                     media = await self.invoke(
                         raw.functions.messages.UploadMedia(
                             peer=await self.resolve_peer(chat_id),
                             media=raw.types.InputMediaUploadedDocument(
                                 mime_type=self.guess_mime_type(getattr(i.media, "name", "audio.mp3")) or "audio/mpeg",
-                                file=await self.save_file(i.media),
-                                thumb=await self.save_file(i.thumb),
+                                file=file,
+                                thumb=thumb,
                                 attributes=[
                                     raw.types.DocumentAttributeAudio(
                                         duration=i.duration,
@@ -371,21 +410,31 @@ class SendMediaGroup:
             elif isinstance(i, types.InputMediaDocument):
                 if isinstance(i.media, str):
                     if os.path.isfile(i.media):
-                        media = await self.invoke(
-                            raw.functions.messages.UploadMedia(
-                                peer=await self.resolve_peer(chat_id),
-                                media=raw.types.InputMediaUploadedDocument(
-                                    mime_type=self.guess_mime_type(i.media) or "application/zip",
-                                    file=await self.save_file(i.media),
-                                    thumb=await self.save_file(i.thumb),
-                                    attributes=[
-                                        raw.types.DocumentAttributeFilename(file_name=os.path.basename(i.media))
-                                    ]
-                                ),
-                                business_connection_id=business_connection_id
-                            )
+                        upload_key = await self.get_upload_key(i.media, FileType.DOCUMENT, thumb=i.thumb)
+                        media = await self.get_cached_upload_media(
+                            upload_key, FileType.DOCUMENT, await self.resolve_peer(chat_id), business_connection_id
                         )
 
+                        if media is None:
+                            file, thumb = await asyncio.gather(self.save_file(i.media), self.save_file(i.thumb))
+
+                            media = await self.invoke(
+                                raw.functions.messages.UploadMedia(
+                                    peer=await self.resolve_peer(chat_id),
+                                    media=raw.types.InputMediaUploadedDocument(
+                                        mime_type=self.guess_mime_type(i.media) or "application/zip",
+                                        file=file,
+                                        thumb=thumb,
+                                        attributes=[
+                                            raw.types.DocumentAttributeFilename(file_name=os.path.basename(i.media))
+                                        ]
+                                    ),
+                                    business_connection_id=business_connection_id
+                                )
+                            )
+
+                            await self.set_cached_upload(upload_key, media, FileType.DOCUMENT)
+
                         media = raw.types.InputMediaDocument(
                             id=raw.types.InputDocument(
                                 id=media.document.id,
@@ -414,6 +463,8 @@ class SendMediaGroup:
                     else:
                         media = utils.get_input_media_from_file_id(i.media, FileType.DOCUMENT)
                 else:
+                    file, thumb = await asyncio.gather(self.save_file(i.media), self.save_file(i.thumb))
+
                     media = await self.invoke(
                         raw.functions.messages.UploadMedia(
                             peer=await self.resolve_peer(chat_id),
@@ -421,8 +472,8 @@ class SendMediaGroup:
                                 mime_type=self.guess_mime_type(
                                     getattr(i.media, "name", "file.zip")
                                 ) or "application/zip",
-                                file=await self.save_file(i.media),
-                                thumb=await self.save_file(i.thumb),
+                                file=file,
+                                thumb=thumb,
                                 attributes=[
                                     raw.types.DocumentAttributeFilename(file_name=getattr(i.media, "name", "file.zip"))
                                 ]
@@ -441,9 +492,27 @@ class SendMediaGroup:
             else:
                 raise ValueError(f"{i.__class__.__name__} is not a supported type for send_media_group")
 
+            return media
+
+        # Items are uploaded concurrently, the number of simultaneous uploads is bounded by save_file
+        tasks = [self.loop.create_task(get_media(i)) for i in media]
+
+        try:
+            medias = await asyncio.gather(*tasks)
+        except BaseException:
+            # The group can't be sent without every item, stop uploading the others
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        multi_media = []
+
+        for i, m in zip(media, medias):
             multi_media.append(
                 raw.types.InputSingleMedia(
-                    media=media,
+                    media=m,
                     random_id=self.rnd_id(),
                     **await self.parser.parse(i.caption, i.parse_mode)
                 )
@@ -25,7 +25,7 @@ import kurimypyrogram
 from kurimypyrogram import raw, enums
 from kurimypyrogram import types
 from kurimypyrogram import utils
-from kurimypyrogram.errors import FilePartMissing
+from kurimypyrogram.errors import FilePartMissing, FileReferenceExpired, MediaEmpty
 from kurimypyrogram.file_id import FileType
 
 
@@ -187,7 +187,12 @@ class SendPhoto:
         file = None
 
         try:
-            if isinstance(photo, str):
+            upload_key = await self.get_upload_key(photo, FileType.PHOTO)
+            cached_file_id = await self.get_cached_upload(upload_key)
+
+            if cached_file_id:
+                media = utils.get_input_media_from_file_id(cached_file_id, FileType.PHOTO, ttl_seconds=(1 << 31) - 1 if view_once else ttl_seconds, has_spoiler=has_spoiler)
+            elif isinstance(photo, str):
                 if os.path.isfile(photo):
                     file = await self.save_file(photo, progress=progress, progress_args=progress_args)
                     media = raw.types.InputMediaUploadedPhoto(
@@ -241,12 +246,29 @@ class SendPhoto:
                     )
                 except FilePartMissing as e:
                     await self.save_file(photo, file_id=file.id, file_part=e.value)
+                except (FileReferenceExpired, MediaEmpty):
+                    if not cached_file_id:
+                        raise
+
+                    # The previously uploaded photo can't be reused anymore, upload it again
+                    await self.storage.upload_file_id(upload_key, None)
+                    cached_file_id = None
+
+                    file = await self.save_file(photo, progress=progress, progress_args=progress_args)
+                    media = raw.types.InputMediaUploadedPhoto(
+                        file=file,
+                        ttl_seconds=(1 << 31) - 1 if view_once else ttl_seconds,
+                        spoiler=has_spoiler
+                    )
                 else:
                     for i in r.updates:
                         if isinstance(i, (raw.types.UpdateNewMessage,
                                           raw.types.UpdateNewChannelMessage,
                                           raw.types.UpdateNewScheduledMessage,
                                           raw.types.UpdateBotNewBusinessMessage)):
+                            if not cached_file_id:
+                                await self.set_cached_upload(upload_key, i.message.media, FileType.PHOTO)
+
                             return await types.Message._parse(
                                 self, i.message,
                                 {i.id: i for i in r.users},
@@ -16,6 +16,7 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 import os
 import re
 from datetime import datetime
@@ -222,8 +223,10 @@ class SendVideo:
         try:
             if isinstance(video, str):
                 if os.path.isfile(video):
-                    thumb = await self.save_file(thumb)
-                    file = await self.save_file(video, progress=progress, progress_args=progress_args)
+                    thumb, file = await asyncio.gather(
+                        self.save_file(thumb),
+                        self.save_file(video, progress=progress, progress_args=progress_args)
+                    )
                     media = raw.types.InputMediaUploadedDocument(
                         mime_type=self.guess_mime_type(video) or "video/mp4",
                         file=file,
@@ -250,8 +253,10 @@ class SendVideo:
                 else:
                     media = utils.get_input_media_from_file_id(video, FileType.VIDEO, ttl_seconds=ttl_seconds, has_spoiler=has_spoiler)
             else:
-                thumb = await self.save_file(thumb)
-                file = await self.save_file(video, progress=progress, progress_args=progress_args)
+                thumb, file = await asyncio.gather(
+                    self.save_file(thumb),
+                    self.save_file(video, progress=progress, progress_args=progress_args)
+                )
                 media = raw.types.InputMediaUploadedDocument(
                     mime_type=self.guess_mime_type(file_name or video.name) or "video/mp4",
                     file=file,
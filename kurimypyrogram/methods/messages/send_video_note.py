@@ -16,6 +16,7 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 import os
 from datetime import datetime
 from typing import Union, BinaryIO, Optional, Callable, List
@@ -185,8 +186,10 @@ class SendVideoNote:
         try:
             if isinstance(video_note, str):
                 if os.path.isfile(video_note):
-                    thumb = await self.save_file(thumb)
-                    file = await self.save_file(video_note, progress=progress, progress_args=progress_args)
+                    thumb, file = await asyncio.gather(
+                        self.save_file(thumb),
+                        self.save_file(video_note, progress=progress, progress_args=progress_args)
+                    )
                     media = raw.types.InputMediaUploadedDocument(
                         mime_type=self.guess_mime_type(video_note) or "video/mp4",
                         file=file,
@@ -204,8 +207,10 @@ class SendVideoNote:
                 else:
                     media = utils.get_input_media_from_file_id(video_note, FileType.VIDEO_NOTE)
             else:
-                thumb = await self.save_file(thumb)
-                file = await self.save_file(video_note, progress=progress, progress_args=progress_args)
+                thumb, file = await asyncio.gather(
+                    self.save_file(thumb),
+                    self.save_file(video_note, progress=progress, progress_args=progress_args)
+                )
                 media = raw.types.InputMediaUploadedDocument(
                     mime_type=self.guess_mime_type(video_note.name) or "video/mp4",
                     file=file,
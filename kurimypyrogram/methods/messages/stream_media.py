@@ -29,13 +29,18 @@ class StreamMedia:
         self: "kurimypyrogram.Client",
         message: Union["types.Message", str],
         limit: int = 0,
-        offset: int = 0
+        offset: int = 0,
+        start_byte: int = None,
+        end_byte: int = None
     ) -> Optional[Union[str, BinaryIO]]:
         """Stream the media from a message chunk by chunk.
 
         You can use this method to partially download a file into memory or to selectively download chunks of file.
         The chunk maximum size is 1 MiB (1024 * 1024 bytes).
 
+        Alternatively, pass *start_byte* and/or *end_byte* to stream an exact byte range, for example to serve an HTTP
+        range request: the needed requests are planned automatically and the chunks at both ends are trimmed.
+
         .. include:: /_includes/usable-by/users-bots.rst
 
         Parameters:
@@ -51,6 +56,15 @@ class StreamMedia:
                 How many chunks to skip before starting to stream.
                 Defaults to 0 (start from the beginning).
 
+            start_byte (``int``, *optional*):
+                Offset of the first byte to stream. Can't be used together with *limit* and *offset*.
+                Negative values count from the end of the media.
+                Defaults to 0 (start from the beginning).
+
+            end_byte (``int``, *optional*):
+                Offset of the last byte to stream, included. Can't be used together with *limit* and *offset*.
+                Defaults to None (stream until the end of the media).
+
         Returns:
             ``Generator``: A generator yielding bytes chunk by chunk
 
@@ -72,6 +86,10 @@ class StreamMedia:
                 # Stream the last 3 chunks only (negative offset)
                 async for chunk in app.stream_media(message, offset=-3):
                     print(len(chunk))
+
+                # Stream the bytes of an HTTP "Range: bytes=1000-1999" request
+                async for chunk in app.stream_media(message, start_byte=1000, end_byte=1999):
+                    print(len(chunk))
         """
         available_media = ("audio", "document", "photo", "sticker", "animation", "video", "voice", "video_note",
                            "new_chat_photo")
@@ -95,6 +113,33 @@ class StreamMedia:
         file_id_obj = FileId.decode(file_id_str)
         file_size = getattr(media, "file_size", 0)
 
+        if start_byte is not None or end_byte is not None:
+            if limit or offset:
+                raise ValueError("Byte ranges can't be combined with chunk limit and offset")
+
+            start_byte = start_byte or 0
+
+            if start_byte < 0:
+                if file_size == 0:
+                    raise ValueError("Negative offsets are not supported for file ids, pass a Message object instead")
+
+                start_byte = max(file_size + start_byte, 0)
+
+            if end_byte is not None and end_byte < start_byte:
+                raise ValueError("The end of the range must not come before its start")
+
+            cached = await self.media_cache.get(file_id_obj) if self.media_cache else None
+
+            if cached:
+                chunks = self.media_cache.stream(cached, start_byte, end_byte)
+            else:
+                chunks = self.get_file(file_id_obj, file_size, start_byte=start_byte, end_byte=end_byte)
+
+            async for chunk in chunks:
+                yield chunk
+
+            return
+
         if offset < 0:
             if file_size == 0:
                 raise ValueError("Negative offsets are not supported for file ids, pass a Message object instead")
@@ -102,5 +147,18 @@ class StreamMedia:
             chunks = math.ceil(file_size / 1024 / 1024)
             offset += chunks
 
-        async for chunk in self.get_file(file_id_obj, file_size, limit, offset):
+        cached = await self.media_cache.get(file_id_obj) if self.media_cache else None
+
+        if cached:
+            chunk_size = 1024 * 1024
+            chunks = self.media_cache.stream(
+                cached,
+                offset * chunk_size,
+                (offset + abs(limit)) * chunk_size - 1 if limit else None,
+                chunk_size
+            )
+        else:
+            chunks = self.get_file(file_id_obj, file_size, limit, offset)
+
+        async for chunk in chunks:
             yield chunk
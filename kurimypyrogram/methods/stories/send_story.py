@@ -16,6 +16,7 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 import os
 import re
 from typing import List, Union, BinaryIO, Callable
@@ -147,8 +148,10 @@ class SendStory:
         try:
             if isinstance(media, str):
                 if os.path.isfile(media):
-                    thumb = await self.save_file(thumb)
-                    file = await self.save_file(media, progress=progress, progress_args=progress_args)
+                    thumb, file = await asyncio.gather(
+                        self.save_file(thumb),
+                        self.save_file(media, progress=progress, progress_args=progress_args)
+                    )
                     mime_type = self.guess_mime_type(file.name)
                     if mime_type == "video/mp4":
                         media = raw.types.InputMediaUploadedDocument(
@@ -171,8 +174,10 @@ class SendStory:
                 else:
                     media = utils.get_input_media_from_file_id(media)
             else:
-                thumb = await self.save_file(thumb)
-                file = await self.save_file(media, progress=progress, progress_args=progress_args)
+                thumb, file = await asyncio.gather(
+                    self.save_file(thumb),
+                    self.save_file(media, progress=progress, progress_args=progress_args)
+                )
                 mime_type = self.guess_mime_type(file.name)
                 if mime_type == "video/mp4":
                     media = raw.types.InputMediaUploadedDocument(
@@ -16,7 +16,9 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+import asyncio
 import logging
+from typing import List
 
 import kurimypyrogram
 from kurimypyrogram import raw
@@ -26,13 +28,19 @@ log = logging.getLogger(__name__)
 
 class Start:
     async def start(
-        self: "kurimypyrogram.Client"
+        self: "kurimypyrogram.Client",
+        prewarm_dcs: List[int] = None
     ):
         """Start the client.
 
         This method connects the client to Telegram and, in case of new sessions, automatically manages the
         authorization process using an interactive prompt.
 
+        Parameters:
+            prewarm_dcs (List of ``int``, *optional*):
+                IDs of the DCs whose media sessions should be connected and authorized right away, so that the first
+                download from them doesn't pay for the key exchange.
+
         Returns:
             :obj:`~kurimypyrogram.Client`: The started client itself.
 
@@ -73,4 +81,14 @@ class Start:
             self.me = await self.get_me()
             await self.initialize()
 
+            if prewarm_dcs:
+                results = await asyncio.gather(
+                    *[self.get_media_session(dc_id) for dc_id in prewarm_dcs],
+                    return_exceptions=True
+                )
+
+                for dc_id, result in zip(prewarm_dcs, results):
+                    if isinstance(result, Exception):
+                        log.warning("Unable to prewarm the media session of DC%s: %s", dc_id, result)
+
             return self
@@ -28,4 +28,4 @@ from .primitives.double import Double
 from .primitives.int import Int, Long, Int128, Int256
 from .primitives.string import String
 from .primitives.vector import Vector
-from .tl_object import TLObject
+from .tl_object import TLObject, Combinator
@@ -17,7 +17,7 @@
 #  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 from io import BytesIO
-from typing import Any, List
+from typing import Any, List, Tuple
 
 from .future_salt import FutureSalt
 from .primitives.int import Int, Long
@@ -46,18 +46,30 @@ class FutureSalts(TLObject):
 
         return FutureSalts(req_msg_id, now, salts)
 
-    def write(self, *args: Any) -> bytes:
-        b = BytesIO()
+    @staticmethod
+    def read_from(data: memoryview, cursor: int, *args: Any) -> Tuple["FutureSalts", int]:
+        req_msg_id, cursor = Long.read_from(data, cursor)
+        now, cursor = Int.read_from(data, cursor)
+        count, cursor = Int.read_from(data, cursor)
 
-        b.write(Int(self.ID, False))
+        salts = []
 
-        b.write(Long(self.req_msg_id))
-        b.write(Int(self.now))
+        for _ in range(count):
+            salt, cursor = FutureSalt.read_from(data, cursor)
+            salts.append(salt)
 
-        count = len(self.salts)
-        b.write(Int(count))
+        return FutureSalts(req_msg_id, now, salts), cursor
+
+    def write_into(self, b: bytearray, *args: Any) -> None:
+        Int.write_into(b, self.ID, False)
+        Long.write_into(b, self.req_msg_id)
+        Int.write_into(b, self.now)
+        Int.write_into(b, len(self.salts))
 
         for salt in self.salts:
-            b.write(salt.write())
+            salt.write_into(b)
 
-        return b.getvalue()
+    def write(self, *args: Any) -> bytes:
+        b = bytearray()
+        self.write_into(b)
+        return bytes(b)
@@ -18,7 +18,7 @@
 
 from gzip import compress, decompress
 from io import BytesIO
-from typing import cast, Any
+from typing import cast, Any, Tuple
 
 from .primitives.bytes import Bytes
 from .primitives.int import Int
@@ -46,17 +46,20 @@ class GzipPacked(TLObject):
             )
         ))
 
-    def write(self, *args: Any) -> bytes:
-        b = BytesIO()
+    @staticmethod
+    def read_from(data: memoryview, cursor: int, *args: Any) -> Tuple[TLObject, int]:
+        packed_data, cursor = Bytes.read_view(data, cursor)
+        return TLObject.read_from(memoryview(decompress(packed_data)), 0)[0], cursor
 
-        b.write(Int(self.ID, False))
+    @staticmethod
+    def skip_from(data: memoryview, cursor: int, *args: Any) -> int:
+        return Bytes.skip_from(data, cursor)
 
-        b.write(
-            Bytes(
-                compress(
-                    self.packed_data.write()
-                )
-            )
-        )
+    def write_into(self, b: bytearray, *args: Any) -> None:
+        Int.write_into(b, self.ID, False)
+        Bytes.write_into(b, compress(self.packed_data.write()))
 
-        return b.getvalue()
+    def write(self, *args: Any) -> bytes:
+        b = bytearray()
+        self.write_into(b)
+        return bytes(b)
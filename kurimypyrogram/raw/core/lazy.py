@@ -0,0 +1,52 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import sys
+from importlib import import_module
+from typing import Callable, Dict, Iterable, List, Tuple
+
+
+def lazy_attributes(
+    name: str,
+    classes: Dict[str, str],
+    namespaces: Iterable[str] = ()
+) -> Tuple[Callable[[str], object], Callable[[], List[str]]]:
+    """Build the module-level ``__getattr__`` and ``__dir__`` of a raw API package.
+
+    Classes are imported from their own modules, given by *classes*, and sub-packages from *namespaces*, the first time
+    they are accessed. They are then kept in the package like regular attributes.
+    """
+    module = sys.modules[name]
+    namespaces = set(namespaces)
+
+    def __getattr__(attr: str) -> object:
+        if attr in classes:
+            value = getattr(import_module(f"{name}.{classes[attr]}"), attr)
+        elif attr in namespaces:
+            value = import_module(f"{name}.{attr}")
+        else:
+            raise AttributeError(f"module {name!r} has no attribute {attr!r}")
+
+        setattr(module, attr, value)
+
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted({*vars(module), *classes, *namespaces})
+
+    return __getattr__, __dir__
@@ -17,7 +17,8 @@
 #  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 from io import BytesIO
-from typing import Any
+from struct import Struct
+from typing import Any, Tuple
 
 from .primitives.int import Int, Long
 from .tl_object import TLObject
@@ -26,15 +27,20 @@ from .tl_object import TLObject
 class Message(TLObject):
     ID = 0x5BB8E511  # hex(crc32(b"message msg_id:long seqno:int bytes:int body:Object = Message"))
 
-    __slots__ = ["msg_id", "seq_no", "length", "body"]
+    __slots__ = ["msg_id", "seq_no", "length", "body", "data"]
 
     QUALNAME = "Message"
 
-    def __init__(self, body: TLObject, msg_id: int, seq_no: int, length: int):
+    # msg_id, seq_no, length
+    HEADER = Struct("<qii")
+
+    def __init__(self, body: TLObject, msg_id: int, seq_no: int, length: int, data: bytes = None):
         self.msg_id = msg_id
         self.seq_no = seq_no
         self.length = length
         self.body = body
+        # The serialized body, if known already
+        self.data = data
 
     @staticmethod
     def read(data: BytesIO, *args: Any) -> "Message":
@@ -45,12 +51,25 @@ class Message(TLObject):
 
         return Message(TLObject.read(BytesIO(body)), msg_id, seq_no, length)
 
-    def write(self, *args: Any) -> bytes:
-        b = BytesIO()
+    @staticmethod
+    def read_from(data: memoryview, cursor: int, *args: Any) -> Tuple["Message", int]:
+        msg_id, seq_no, length = Message.HEADER.unpack_from(data, cursor)
+        cursor += Message.HEADER.size
+
+        # The body is decoded from its own slice, bare vectors take the size of their elements from its end
+        body = TLObject.read_from(data[cursor:cursor + length], 0)[0]
 
-        b.write(Long(self.msg_id))
-        b.write(Int(self.seq_no))
-        b.write(Int(self.length))
-        b.write(self.body.write())
+        return Message(body, msg_id, seq_no, length), cursor + length
 
-        return b.getvalue()
+    def write_into(self, b: bytearray, *args: Any) -> None:
+        b += Message.HEADER.pack(self.msg_id, self.seq_no, self.length)
+
+        if self.data is None:
+            self.body.write_into(b)
+        else:
+            b += self.data
+
+    def write(self, *args: Any) -> bytes:
+        b = bytearray()
+        self.write_into(b)
+        return bytes(b)
@@ -17,7 +17,7 @@
 #  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 from io import BytesIO
-from typing import List, Any
+from typing import List, Any, Tuple
 
 from .message import Message
 from .primitives.int import Int
@@ -39,15 +39,29 @@ class MsgContainer(TLObject):
         count = Int.read(data)
         return MsgContainer([Message.read(data) for _ in range(count)])
 
-    def write(self, *args: Any) -> bytes:
-        b = BytesIO()
+    @staticmethod
+    def read_from(data: memoryview, cursor: int, *args: Any) -> Tuple["MsgContainer", int]:
+        count, cursor = Int.read_from(data, cursor)
+        messages = []
+
+        for _ in range(count):
+            message, cursor = Message.read_from(data, cursor)
+            messages.append(message)
 
-        b.write(Int(self.ID, False))
+        return MsgContainer(messages), cursor
 
-        count = len(self.messages)
-        b.write(Int(count))
+    def write_into(self, b: bytearray, *args: Any) -> None:
+        Int.write_into(b, self.ID, False)
+        Int.write_into(b, len(self.messages))
 
         for message in self.messages:
-            b.write(message.write())
+            message.write_into(b)
+
+    def write(self, *args: Any) -> bytes:
+        b = bytearray()
+        self.write_into(b)
+        return bytes(b)
 
-        return b.getvalue()
+    def __len__(self) -> int:
+        # 8 = ID (4) + count (4), 16 = msg_id (8) + seq_no (4) + length (4)
+        return 8 + sum(16 + message.length for message in self.messages)
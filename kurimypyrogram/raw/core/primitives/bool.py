@@ -17,7 +17,7 @@
 #  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 from io import BytesIO
-from typing import Any
+from typing import Any, Tuple
 
 from ..tl_object import TLObject
 
@@ -30,6 +30,10 @@ class BoolFalse(bytes, TLObject):
     def read(cls, *args: Any) -> bool:
         return cls.value
 
+    @classmethod
+    def read_from(cls, data: memoryview, cursor: int, *args: Any) -> Tuple[bool, int]:
+        return cls.value, cursor
+
     def __new__(cls) -> bytes:  # type: ignore
         return cls.ID.to_bytes(4, "little")
 
@@ -44,5 +48,17 @@ class Bool(bytes, TLObject):
     def read(cls, data: BytesIO, *args: Any) -> bool:
         return int.from_bytes(data.read(4), "little") == BoolTrue.ID
 
+    @classmethod
+    def read_from(cls, data: memoryview, cursor: int, *args: Any) -> Tuple[bool, int]:
+        return int.from_bytes(data[cursor:cursor + 4], "little") == BoolTrue.ID, cursor + 4
+
+    @classmethod
+    def skip_from(cls, data: memoryview, cursor: int, *args: Any) -> int:
+        return cursor + 4
+
+    @classmethod
+    def write_into(cls, b: bytearray, value: bool) -> None:
+        b += BoolTrue.ID.to_bytes(4, "little") if value else BoolFalse.ID.to_bytes(4, "little")
+
     def __new__(cls, value: bool) -> bytes:  # type: ignore
         return BoolTrue() if value else BoolFalse()
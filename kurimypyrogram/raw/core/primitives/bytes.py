@@ -17,7 +17,7 @@
 #  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 from io import BytesIO
-from typing import Any
+from typing import Any, Tuple
 
 from ..tl_object import TLObject
 
@@ -37,6 +37,49 @@ class Bytes(bytes, TLObject):
 
         return x
 
+    @staticmethod
+    def read_view(data: memoryview, cursor: int) -> Tuple[memoryview, int]:
+        length = data[cursor]
+
+        if length <= 253:
+            start = cursor + 1
+            end = start + length
+            return data[start:end], end + (-(length + 1) % 4)
+        else:
+            length = int.from_bytes(data[cursor + 1:cursor + 4], "little")
+            start = cursor + 4
+            end = start + length
+            return data[start:end], end + (-length % 4)
+
+    @classmethod
+    def read_from(cls, data: memoryview, cursor: int, *args: Any) -> Tuple[bytes, int]:
+        view, cursor = Bytes.read_view(data, cursor)
+        return bytes(view), cursor
+
+    @classmethod
+    def skip_from(cls, data: memoryview, cursor: int, *args: Any) -> int:
+        length = data[cursor]
+
+        if length <= 253:
+            return cursor + 1 + length + (-(length + 1) % 4)
+        else:
+            length = int.from_bytes(data[cursor + 1:cursor + 4], "little")
+            return cursor + 4 + length + (-length % 4)
+
+    @classmethod
+    def write_into(cls, b: bytearray, value: bytes) -> None:
+        length = len(value)
+
+        if length <= 253:
+            b.append(length)
+            b += value
+            b += bytes(-(length + 1) % 4)
+        else:
+            b.append(254)
+            b += length.to_bytes(3, "little")
+            b += value
+            b += bytes(-length % 4)
+
     def __new__(cls, value: bytes) -> bytes:  # type: ignore
         length = len(value)
 
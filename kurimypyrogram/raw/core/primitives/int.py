@@ -17,7 +17,7 @@
 #  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 from io import BytesIO
-from typing import Any
+from typing import Any, Tuple
 
 from ..tl_object import TLObject
 
@@ -29,6 +29,19 @@ class Int(bytes, TLObject):
     def read(cls, data: BytesIO, signed: bool = True, *args: Any) -> int:
         return int.from_bytes(data.read(cls.SIZE), "little", signed=signed)
 
+    @classmethod
+    def read_from(cls, data: memoryview, cursor: int, signed: bool = True, *args: Any) -> Tuple[int, int]:
+        end = cursor + cls.SIZE
+        return int.from_bytes(data[cursor:end], "little", signed=signed), end
+
+    @classmethod
+    def skip_from(cls, data: memoryview, cursor: int, *args: Any) -> int:
+        return cursor + cls.SIZE
+
+    @classmethod
+    def write_into(cls, b: bytearray, value: int, signed: bool = True) -> None:
+        b += value.to_bytes(cls.SIZE, "little", signed=signed)
+
     def __new__(cls, value: int, signed: bool = True) -> bytes:  # type: ignore
         return value.to_bytes(cls.SIZE, "little", signed=signed)
 
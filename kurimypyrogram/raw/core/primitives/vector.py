@@ -17,9 +17,11 @@
 #  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 from io import BytesIO
-from typing import cast, Union, Any
+from struct import unpack_from, pack
+from typing import Union, Any, Tuple
 
 from .bool import BoolFalse, BoolTrue, Bool
+from .double import Double
 from .int import Int, Long
 from ..list import List
 from ..tl_object import TLObject
@@ -28,6 +30,9 @@ from ..tl_object import TLObject
 class Vector(bytes, TLObject):
     ID = 0x1CB5C415
 
+    # struct format and size of the elements of number vectors
+    FORMATS = {Int: ("i", 4), Long: ("q", 8), Double: ("d", 8)}
+
     # Method added to handle the special case when a query returns a bare Vector (of Ints);
     # i.e., RpcResult body starts with 0x1cb5c415 (Vector Id) - e.g., messages.GetMessagesViews.
     @staticmethod
@@ -46,21 +51,102 @@ class Vector(bytes, TLObject):
 
         return TLObject.read(b)
 
+    @staticmethod
+    def read_bare_from(b: memoryview, cursor: int, size: float) -> Tuple[Union[int, Any], int]:
+        if size == 4:
+            e = int.from_bytes(b[cursor:cursor + 4], "little")
+
+            if e in {BoolFalse.ID, BoolTrue.ID}:
+                return Bool.read_from(b, cursor)
+
+            return Int.read_from(b, cursor)
+
+        if size == 8:
+            return Long.read_from(b, cursor)
+
+        return TLObject.read_from(b, cursor)
+
+    @staticmethod
+    def left(b: BytesIO) -> int:
+        position = b.tell()
+        end = b.seek(0, 2)
+        b.seek(position)
+
+        return end - position
+
     @classmethod
     def read(cls, data: BytesIO, t: Any = None, *args: Any) -> List:
         count = Int.read(data)
-        left = len(data.read())
-        size = (left / count) if count else 0
-        data.seek(-left, 1)
 
-        return List(
-            t.read(data) if t
-            else Vector.read_bare(data, size)
-            for _ in range(count)
-        )
+        if t:
+            return List(t.read(data) for _ in range(count))
+
+        # Element type unknown, only happens for bare vectors returned by queries, which end with the buffer
+        size = (Vector.left(data) / count) if count else 0
+
+        return List(Vector.read_bare(data, size) for _ in range(count))
+
+    @classmethod
+    def read_from(cls, data: memoryview, cursor: int, t: Any = None, *args: Any) -> Tuple[List, int]:
+        count, cursor = Int.read_from(data, cursor)
+
+        # Vectors of numbers are unpacked all at once
+        if t in cls.FORMATS:
+            fmt, size = cls.FORMATS[t]
+            return List(unpack_from(f"<{count}{fmt}", data, cursor)), cursor + count * size
+
+        items = List()
+
+        if t:
+            read = t.read_from
+
+            for _ in range(count):
+                item, cursor = read(data, cursor)
+                items.append(item)
+        else:
+            size = ((len(data) - cursor) / count) if count else 0
+
+            for _ in range(count):
+                item, cursor = Vector.read_bare_from(data, cursor, size)
+                items.append(item)
+
+        return items, cursor
+
+    @classmethod
+    def skip_from(cls, data: memoryview, cursor: int, t: Any = None, *args: Any) -> int:
+        count, cursor = Int.read_from(data, cursor)
+
+        if t in cls.FORMATS:
+            return cursor + count * cls.FORMATS[t][1]
+
+        # Bare vectors of unknown elements end with the buffer
+        if not t:
+            return len(data)
+
+        skip = t.skip_from
+
+        for _ in range(count):
+            cursor = skip(data, cursor)
+
+        return cursor
+
+    @classmethod
+    def write_into(cls, b: bytearray, value: list, t: Any = None) -> None:
+        count = len(value)
+        b += pack("<Ii", cls.ID, count)
+
+        if t in cls.FORMATS:
+            b += pack(f"<{count}{cls.FORMATS[t][0]}", *value)
+        elif t:
+            write = t.write_into
+
+            for i in value:
+                write(b, i)
+        else:
+            for i in value:
+                i.write_into(b)
 
     def __new__(cls, value: list, t: Any = None) -> bytes:  # type: ignore
-        return b"".join(
-            [Int(cls.ID, False), Int(len(value))]
-            + [cast(bytes, t(i)) if t else i.write() for i in value]
-        )
+        b = bytearray()
+        Vector.write_into(b, value, t)
+        return bytes(b)
@@ -16,11 +16,31 @@
 #  You should have received a copy of the GNU Lesser General Public License
 #  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
+from importlib import import_module
 from io import BytesIO
 from json import dumps
-from typing import cast, List, Any, Union, Dict
+from struct import Struct
+from typing import cast, List, Any, Union, Dict, Tuple, Set
 
-from ..all import objects
+from ..all import objects as paths
+
+CONSTRUCTOR_ID = Struct("<I")
+
+
+class Objects(dict):
+    """Classes of the constructors by ID, each imported the first time it's needed."""
+
+    def __missing__(self, key: int) -> Any:
+        path, name = paths[key].rsplit(".", 1)
+        self[key] = getattr(import_module(path), name)
+
+        return self[key]
+
+
+objects = Objects()
+
+# Constructors that TLObject.read_from() reads lazily, see Combinator.read_lazy()
+lazy: Set[int] = set()
 
 
 class TLObject:
@@ -32,12 +52,31 @@ class TLObject:
     def read(cls, b: BytesIO, *args: Any) -> Any:
         return cast(TLObject, objects[int.from_bytes(b.read(4), "little")]).read(b, *args)
 
+    @classmethod
+    def read_from(cls, b: memoryview, cursor: int, *args: Any) -> Tuple[Any, int]:
+        """Decode the object starting at *cursor*, returning it along with the position right after its end."""
+        constructor_id = CONSTRUCTOR_ID.unpack_from(b, cursor)[0]
+
+        if constructor_id in lazy:
+            return objects[constructor_id].read_lazy(b, cursor + 4)
+
+        return objects[constructor_id].read_from(b, cursor + 4, *args)
+
+    @classmethod
+    def skip_from(cls, b: memoryview, cursor: int, *args: Any) -> int:
+        """Find the end of the object starting at *cursor*, without decoding it."""
+        return objects[CONSTRUCTOR_ID.unpack_from(b, cursor)[0]].skip_from(b, cursor + 4, *args)
+
     def write(self, *args: Any) -> bytes:
         pass
 
+    def write_into(self, b: bytearray, *args: Any) -> None:
+        """Append the serialized object to *b*."""
+        b += self.write(*args)
+
     @staticmethod
     def default(obj: "TLObject") -> Union[str, Dict[str, str]]:
-        if isinstance(obj, bytes):
+        if isinstance(obj, (bytes, bytearray)):
             return repr(obj)
 
         return {
@@ -80,3 +119,41 @@ class TLObject:
 
     def __call__(self, *args: Any, **kwargs: Any) -> Any:
         pass
+
+
+class Combinator(TLObject):
+    """Base of the generated types and functions.
+
+    Objects read with read_lazy() only keep a copy of their bytes, which are decoded the first time one of their fields
+    is accessed. The copy lets the packet they were read from be freed meanwhile.
+    """
+
+    __slots__: List[str] = ["_view"]
+
+    @classmethod
+    def read_lazy(cls, b: memoryview, cursor: int) -> Tuple[Any, int]:
+        end = cls.skip_from(b, cursor)
+
+        # The hook is only installed on classes actually read lazily, the others keep failing lookups natively
+        if "__getattr__" not in cls.__dict__:
+            cls.__getattr__ = decode_lazy
+
+        obj = cls.__new__(cls)
+        obj._view = bytes(b[cursor:end])
+
+        return obj, end
+
+
+def decode_lazy(self: Combinator, name: str) -> Any:
+    # Only reached for unset slots, the fields of a lazily read object are unset until it's decoded
+    if name not in self.__slots__:
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    view = self._view
+    obj, _ = self.read_from(memoryview(view), 0)
+    del self._view
+
+    for attr in self.__slots__:
+        setattr(self, attr, getattr(obj, attr))
+
+    return getattr(self, name)
@@ -17,4 +17,7 @@
 #  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 from .auth import Auth
+from .flood_control import FloodControl, TokenBucket
+from .media_pool import MediaSessionPool
+from .retry_policy import RetryPolicy, CircuitBreaker
 from .session import Session
@@ -0,0 +1,212 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import logging
+import time
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from kurimypyrogram.raw.core import TLObject
+
+log = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket that lets callers reserve a token and tells them how long to wait for it.
+
+    Tokens can go negative: every reservation made while the bucket is empty is queued behind the previous ones.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.default_rate = rate
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def refill(self, now: float):
+        elapsed = now - self.updated
+        self.updated = now
+
+        # Slowly recover the original rate after a penalty
+        if self.rate < self.default_rate:
+            self.rate = min(self.default_rate, self.rate + (self.default_rate - self.rate) * elapsed / 60)
+
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+
+    def reserve(self) -> float:
+        now = time.monotonic()
+        self.refill(now)
+        self.tokens -= 1
+
+        delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+
+        return max(delay, self.blocked_until - now)
+
+    def penalize(self, seconds: float):
+        now = time.monotonic()
+        self.refill(now)
+
+        self.blocked_until = max(self.blocked_until, now + seconds)
+        self.rate = max(self.rate / 2, self.default_rate / 16)
+        self.tokens = min(self.tokens, 0)
+
+    @property
+    def is_idle(self) -> bool:
+        now = time.monotonic()
+        return self.blocked_until <= now and self.tokens + (now - self.updated) * self.rate >= self.capacity
+
+
+class FloodControl:
+    """Client-side rate limiter that delays requests instead of letting the server reject them with a flood wait.
+
+    Sending methods go through token buckets matching the limits documented by Telegram: about one message per second
+    in the same chat, 20 messages per minute in the same group and 30 messages per second overall. Every flood wait
+    received afterwards, for any method, blocks that method (for that peer, if any) for the required time and halves
+    the rate of the buckets involved, which then slowly recovers.
+
+    Parameters:
+        chat_rate (``float``, *optional*):
+            Messages per second allowed in the same chat.
+            Defaults to 1.
+
+        group_rate (``float``, *optional*):
+            Messages per second allowed in the same group or channel.
+            Defaults to 20 per minute.
+
+        global_rate (``float``, *optional*):
+            Messages per second allowed across all chats.
+            Defaults to 30.
+    """
+
+    CHAT_RATE = 1
+    GROUP_RATE = 20 / 60
+    GLOBAL_RATE = 30
+    MAX_BUCKETS = 10000
+
+    SEND_METHODS = {
+        "messages.SendMessage",
+        "messages.SendMedia",
+        "messages.SendMultiMedia",
+        "messages.ForwardMessages",
+        "messages.SendInlineBotResult",
+        "messages.EditMessage",
+    }
+
+    def __init__(
+        self,
+        chat_rate: float = CHAT_RATE,
+        group_rate: float = GROUP_RATE,
+        global_rate: float = GLOBAL_RATE
+    ):
+        self.chat_rate = chat_rate
+        self.group_rate = group_rate
+        self.global_rate = global_rate
+
+        self.buckets: Dict[Hashable, TokenBucket] = {}
+
+        # Deadlines learnt from flood waits, keyed by method name and peer (if any)
+        self.blocked: Dict[Tuple[str, Optional[Tuple[str, int]]], float] = {}
+
+        # Metrics
+        self.delayed = 0
+        self.delayed_time = 0.0
+        self.flood_waits = 0
+
+    @staticmethod
+    def get_name(query: TLObject) -> str:
+        return ".".join(query.QUALNAME.split(".")[1:])
+
+    @staticmethod
+    def get_peer(query: TLObject) -> Optional[Tuple[str, int]]:
+        peer = getattr(query, "to_peer", None) or getattr(query, "peer", None)
+
+        if peer is None:
+            return None
+
+        for attr in ("user_id", "chat_id", "channel_id"):
+            value = getattr(peer, attr, None)
+
+            if value is not None:
+                return attr, value
+
+        return type(peer).__name__, 0
+
+    def bucket(self, key: Hashable, rate: float, capacity: float) -> TokenBucket:
+        bucket = self.buckets.get(key)
+
+        if bucket is None:
+            if len(self.buckets) >= self.MAX_BUCKETS:
+                for k in [k for k, b in self.buckets.items() if b.is_idle]:
+                    del self.buckets[k]
+
+            bucket = self.buckets[key] = TokenBucket(rate, capacity)
+
+        return bucket
+
+    def get_buckets(self, name: str, peer: Optional[Tuple[str, int]]) -> List[TokenBucket]:
+        if name not in self.SEND_METHODS:
+            return []
+
+        buckets = [self.bucket("global", self.global_rate, self.global_rate)]
+
+        if peer is not None:
+            buckets.append(self.bucket(("chat", peer), self.chat_rate, 1))
+
+            # Only groups and channels have the per-group limit, private chats and Saved Messages (self) don't
+            if peer[0] in ("chat_id", "channel_id"):
+                buckets.append(self.bucket(("group", peer), self.group_rate, 20))
+
+        return buckets
+
+    async def acquire(self, query: TLObject):
+        name = self.get_name(query)
+        peer = self.get_peer(query)
+
+        delay = max(
+            self.blocked.get((name, None), 0.0),
+            self.blocked.get((name, peer), 0.0)
+        ) - time.monotonic()
+
+        for bucket in self.get_buckets(name, peer):
+            delay = max(delay, bucket.reserve())
+
+        if delay > 0:
+            self.delayed += 1
+            self.delayed_time += delay
+
+            log.debug('Delaying "%s" by %.2f seconds to avoid flood waits', name, delay)
+
+            await asyncio.sleep(delay)
+
+    def penalize(self, query: TLObject, seconds: float):
+        self.flood_waits += 1
+
+        name = self.get_name(query)
+        peer = self.get_peer(query)
+        now = time.monotonic()
+
+        if len(self.blocked) >= self.MAX_BUCKETS:
+            for k in [k for k, until in self.blocked.items() if until <= now]:
+                del self.blocked[k]
+
+        self.blocked[(name, peer)] = max(self.blocked.get((name, peer), 0.0), now + seconds)
+
+        for bucket in self.get_buckets(name, peer):
+            bucket.penalize(seconds)
@@ -30,9 +30,15 @@ class MsgFactory:
         self.seq_no = SeqNo()
 
     def __call__(self, body: TLObject) -> Message:
-        return Message(
-            body,
-            MsgId(),
-            self.seq_no(not isinstance(body, not_content_related)),
-            len(body)
-        )
+        msg_id = MsgId()
+        seq_no = self.seq_no(not isinstance(body, not_content_related))
+
+        # Containers are written straight into the packet, their length is known from their messages
+        if isinstance(body, MsgContainer):
+            return Message(body, msg_id, seq_no, len(body))
+
+        # Serialize the body once, the same bytes are then reused to build the packet
+        data = bytearray()
+        body.write_into(data)
+
+        return Message(body, msg_id, seq_no, len(data), data)
@@ -0,0 +1,59 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from collections import deque
+
+
+class MsgIdWindow:
+    """Replay-protection window of the most recently received msg_ids.
+
+    Membership is checked against a set, while a FIFO ring of the same ids decides which one to forget first once the
+    window is full. Ids older than the ones forgotten are rejected through the lower bound.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.ids = set()
+        self.ring = deque()
+        self.low = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, msg_id: int) -> bool:
+        return msg_id in self.ids
+
+    def is_below(self, msg_id: int) -> bool:
+        return msg_id < self.low
+
+    def add(self, msg_id: int):
+        if not self.ids:
+            self.low = msg_id
+
+        self.ids.add(msg_id)
+        self.ring.append(msg_id)
+
+        if len(self.ring) > self.size:
+            evicted = self.ring.popleft()
+            self.ids.discard(evicted)
+            self.low = max(self.low, evicted + 1)
+
+    def clear(self):
+        self.ids.clear()
+        self.ring.clear()
+        self.low = 0
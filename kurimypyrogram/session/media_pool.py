@@ -0,0 +1,140 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+
+import kurimypyrogram
+from .session import Session
+
+log = logging.getLogger(__name__)
+
+
+class MediaSessionPool:
+    """Set of media sessions connected to the same DC and sharing the same authorization key.
+
+    Requests are spread across the sessions by picking the one with the fewest requests in flight. The pool grows on
+    demand: when every connection is busy a new one is opened in the background, up to ``max_size``. Connections left
+    unused for ``idle_timeout`` seconds are closed again, except the first one.
+    """
+
+    def __init__(
+        self,
+        client: "kurimypyrogram.Client",
+        session: Session,
+        max_size: int = 1,
+        idle_timeout: float = 60
+    ):
+        self.client = client
+        self.dc_id = session.dc_id
+        self.max_size = max(1, max_size)
+        self.idle_timeout = idle_timeout
+
+        self.sessions: List[Session] = [session]
+        self.last_used: Dict[Session, float] = {session: time.monotonic()}
+
+        self.grow_task: Optional[asyncio.Task] = None
+        self.reap_task: Optional[asyncio.Task] = None
+
+        self.opened = 0
+        self.closed = 0
+
+        if self.max_size > 1:
+            self.reap_task = asyncio.get_event_loop().create_task(self.reap_worker())
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def get(self) -> Session:
+        session = min(self.sessions, key=lambda s: len(s.results))
+
+        if (
+            session.results
+            and len(self.sessions) < self.max_size
+            and self.grow_task is None
+        ):
+            self.grow_task = asyncio.get_event_loop().create_task(self.grow())
+
+        self.last_used[session] = time.monotonic()
+
+        return session
+
+    async def grow(self):
+        main = self.sessions[0]
+
+        session = Session(
+            self.client, self.dc_id, main.auth_key, main.test_mode,
+            is_media=True, is_cdn=main.is_cdn
+        )
+
+        try:
+            await session.start()
+        except asyncio.CancelledError:
+            # The pool was stopped while connecting, don't leave the connection behind
+            if session.connection is not None:
+                await session.stop()
+
+            raise
+        except Exception as e:
+            log.warning("[%s] Unable to open a new media session to DC%s: %s", self.client.name, self.dc_id, e)
+        else:
+            if self.grow_task is None:
+                # The pool was stopped meanwhile
+                await session.stop()
+                return
+
+            self.sessions.append(session)
+            self.last_used[session] = time.monotonic()
+            self.opened += 1
+
+            log.debug("[%s] Media sessions to DC%s: %s", self.client.name, self.dc_id, len(self.sessions))
+        finally:
+            self.grow_task = None
+
+    async def reap_worker(self):
+        while True:
+            await asyncio.sleep(self.idle_timeout / 2)
+
+            now = time.monotonic()
+
+            for session in self.sessions[1:]:
+                if not session.results and now - self.last_used[session] > self.idle_timeout:
+                    self.sessions.remove(session)
+                    self.last_used.pop(session)
+                    self.closed += 1
+
+                    await session.stop()
+
+    async def stop(self):
+        if self.reap_task:
+            self.reap_task.cancel()
+            self.reap_task = None
+
+        if self.grow_task:
+            # Session.start() keeps retrying while the DC is unreachable, a pending grow would never end
+            grow_task, self.grow_task = self.grow_task, None
+            grow_task.cancel()
+            await asyncio.gather(grow_task, return_exceptions=True)
+
+        for session in self.sessions:
+            await session.stop()
+
+        self.sessions.clear()
+        self.last_used.clear()
@@ -0,0 +1,185 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import logging
+import random
+import time
+from collections import Counter
+from typing import Dict, Optional
+
+log = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Track the health of a single DC.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and requests fail fast. Once
+    ``recovery_timeout`` seconds have passed, a single trial request is let through (half-open): a success closes the
+    breaker again, a failure re-opens it. A trial that ends without an outcome, or takes longer than
+    ``recovery_timeout``, lets the next request through as a new trial.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+
+        self.state = CircuitBreaker.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow(self) -> bool:
+        if self.state == CircuitBreaker.CLOSED:
+            return True
+
+        now = time.monotonic()
+
+        if now - self.opened_at >= self.recovery_timeout:
+            self.state = CircuitBreaker.HALF_OPEN
+            self.opened_at = now
+            return True
+
+        return False
+
+    def release(self):
+        # The trial request ended without telling anything about the DC, another one can be tried right away
+        if self.state == CircuitBreaker.HALF_OPEN:
+            self.state = CircuitBreaker.OPEN
+            self.opened_at = time.monotonic() - self.recovery_timeout
+
+    def record_success(self):
+        self.state = CircuitBreaker.CLOSED
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+
+        if self.state == CircuitBreaker.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = CircuitBreaker.OPEN
+            self.opened_at = time.monotonic()
+
+
+class RetryPolicy:
+    """Decide whether and when a failed request is retried.
+
+    Requests failing because of network errors, *InternalServerError* or *ServiceUnavailable* are retried with
+    exponential backoff and jitter. Optionally, each DC has its own :obj:`CircuitBreaker`, so that while a DC is
+    unhealthy new requests to it fail fast instead of piling up retries. Timeouts and requests cut short by a restart of
+    their session don't count as failures of the DC.
+
+    Parameters:
+        base_delay (``float``, *optional*):
+            Delay in seconds before the first retry, doubled at every further attempt.
+            Defaults to 0.1.
+
+        max_delay (``float``, *optional*):
+            Upper bound in seconds of the delay between two attempts.
+            Defaults to 1, so that the default 10 retries of a request take a few seconds at most.
+
+        jitter (``bool``, *optional*):
+            Pass False to wait exactly the computed delay instead of a random amount between half of it and all of it.
+            Defaults to True.
+
+        failure_threshold (``int``, *optional*):
+            Consecutive failures after which requests to a DC start failing fast.
+            Defaults to None (requests never fail fast).
+
+        recovery_timeout (``float``, *optional*):
+            Seconds to wait before letting a trial request through to a DC that is failing fast.
+            Defaults to 30.
+
+        budgets (``dict``, *optional*):
+            Maximum amount of retries per method, keyed by method name, e.g.: *{"messages.SendMessage": 2}*.
+            Methods not listed use the amount of retries passed to ``invoke``.
+    """
+
+    BASE_DELAY = 0.1
+    MAX_DELAY = 1
+    RECOVERY_TIMEOUT = 30
+
+    def __init__(
+        self,
+        base_delay: float = BASE_DELAY,
+        max_delay: float = MAX_DELAY,
+        jitter: bool = True,
+        failure_threshold: Optional[int] = None,
+        recovery_timeout: float = RECOVERY_TIMEOUT,
+        budgets: Optional[Dict[str, int]] = None
+    ):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.budgets = budgets or {}
+
+        self.breakers: Dict[int, CircuitBreaker] = {}
+
+        # Metrics
+        self.retries = Counter()
+        self.retries_by_method = Counter()
+        self.fast_failures = 0
+
+    def breaker(self, dc_id: int) -> CircuitBreaker:
+        breaker = self.breakers.get(dc_id)
+
+        if breaker is None:
+            breaker = self.breakers[dc_id] = CircuitBreaker(self.failure_threshold, self.recovery_timeout)
+
+        return breaker
+
+    def max_retries(self, query_name: str, default: int) -> int:
+        return self.budgets.get(query_name, default)
+
+    def delay(self, attempt: int) -> float:
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+
+        return random.uniform(delay / 2, delay) if self.jitter else delay
+
+    def check(self, dc_id: int):
+        if self.failure_threshold is None:
+            return
+
+        if not self.breaker(dc_id).allow():
+            self.fast_failures += 1
+            raise ConnectionError(f"DC{dc_id} is unavailable, failing fast until it recovers")
+
+    def record_success(self, dc_id: int):
+        if self.failure_threshold is not None:
+            self.breaker(dc_id).record_success()
+
+    def record_failure(self, dc_id: int):
+        if self.failure_threshold is None:
+            return
+
+        breaker = self.breaker(dc_id)
+        breaker.record_failure()
+
+        if breaker.state == CircuitBreaker.OPEN:
+            log.warning("DC%s looks unhealthy, requests will fail fast for %ss", dc_id, self.recovery_timeout)
+
+    def release(self, dc_id: int):
+        if self.failure_threshold is not None:
+            self.breaker(dc_id).release()
+
+    def record_retry(self, query_name: str, error: Exception):
+        self.retries[type(error).__name__] += 1
+        self.retries_by_method[query_name] += 1
@@ -17,7 +17,6 @@
 #  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
 
 import asyncio
-import bisect
 import logging
 import os
 from hashlib import sha1
@@ -30,11 +29,12 @@ from kurimypyrogram.connection import Connection
 from kurimypyrogram.crypto import mtproto
 from kurimypyrogram.errors import (
     RPCError, InternalServerError, AuthKeyDuplicated, FloodWait, FloodPremiumWait, ServiceUnavailable, BadMsgNotification,
-    SecurityCheckMismatch
+    SecurityCheckMismatch, AuthKeyUnregistered
 )
 from kurimypyrogram.raw.all import layer
-from kurimypyrogram.raw.core import TLObject, MsgContainer, Int, FutureSalts
-from .internals import MsgId, MsgFactory
+from kurimypyrogram.raw.core import TLObject, MsgContainer, Int, FutureSalts, Message
+from .internals import MsgId, MsgFactory, MsgIdWindow
+from .retry_policy import RetryPolicy
 
 log = logging.getLogger(__name__)
 
@@ -53,6 +53,8 @@ class Session:
     ACKS_THRESHOLD = 10
     PING_INTERVAL = 5
     STORED_MSG_IDS_MAX_SIZE = 1000 * 2
+    BATCH_MAX_MESSAGES = 100
+    BATCH_MAX_SIZE = 1024 * 1024
 
     TRANSPORT_ERRORS = {
         404: "auth key not found",
@@ -67,7 +69,9 @@ class Session:
         auth_key: bytes,
         test_mode: bool,
         is_media: bool = False,
-        is_cdn: bool = False
+        is_cdn: bool = False,
+        is_pooled: bool = False,
+        retry_policy: Optional[RetryPolicy] = None
     ):
         self.client = client
         self.dc_id = dc_id
@@ -75,6 +79,8 @@ class Session:
         self.test_mode = test_mode
         self.is_media = is_media
         self.is_cdn = is_cdn
+        self.is_pooled = is_pooled
+        self.retry_policy = retry_policy or client.retry_policy
 
         self.connection: Optional[Connection] = None
 
@@ -89,13 +95,23 @@ class Session:
 
         self.results = {}
 
-        self.stored_msg_ids = []
+        self.stored_msg_ids = MsgIdWindow(Session.STORED_MSG_IDS_MAX_SIZE)
 
         self.ping_task = None
         self.ping_task_event = asyncio.Event()
 
         self.recv_task = None
 
+        # Outgoing messages waiting to be packed together in a single MsgContainer
+        self.batch_window = client.send_batch_window
+        self.batch_queue = []
+        self.batch_queue_size = 0
+        self.batch_handle = None
+        self.containers = {}
+
+        self.batches_sent = 0
+        self.batched_messages_sent = 0
+
         self.is_started = asyncio.Event()
 
         self.loop = asyncio.get_event_loop()
@@ -162,6 +178,18 @@ class Session:
 
         self.stored_msg_ids.clear()
 
+        if self.batch_handle is not None:
+            self.batch_handle.cancel()
+            self.batch_handle = None
+
+        for _, future in self.batch_queue:
+            if not future.done():
+                future.set_exception(OSError("Session stopped"))
+
+        self.batch_queue.clear()
+        self.batch_queue_size = 0
+        self.containers.clear()
+
         self.ping_task_event.set()
 
         if self.ping_task is not None:
@@ -174,7 +202,7 @@ class Session:
         if self.recv_task:
             await self.recv_task
 
-        if not self.is_media and callable(self.client.disconnect_handler):
+        if not self.is_media and not self.is_pooled and callable(self.client.disconnect_handler):
             try:
                 await self.client.disconnect_handler(self.client)
             except Exception as e:
@@ -187,13 +215,14 @@ class Session:
         await self.start()
 
     async def handle_packet(self, packet):
-        data = await self.loop.run_in_executor(
-            kurimypyrogram.crypto_executor,
+        data = await kurimypyrogram.crypto_scheduler.run(
             mtproto.unpack,
-            BytesIO(packet),
+            packet,
             self.session_id,
             self.auth_key,
-            self.auth_key_id
+            self.auth_key_id,
+            key=(self.session_id, False),
+            size=len(packet)
         )
 
         messages = (
@@ -212,11 +241,8 @@ class Session:
                     self.pending_acks.add(msg.msg_id)
 
             try:
-                if len(self.stored_msg_ids) > Session.STORED_MSG_IDS_MAX_SIZE:
-                    del self.stored_msg_ids[:Session.STORED_MSG_IDS_MAX_SIZE // 2]
-
                 if self.stored_msg_ids:
-                    if msg.msg_id < self.stored_msg_ids[0]:
+                    if self.stored_msg_ids.is_below(msg.msg_id):
                         raise SecurityCheckMismatch("The msg_id is lower than all the stored values")
 
                     if msg.msg_id in self.stored_msg_ids:
@@ -236,7 +262,7 @@ class Session:
                 await self.connection.close()
                 return
             else:
-                bisect.insort(self.stored_msg_ids, msg.msg_id)
+                self.stored_msg_ids.add(msg.msg_id)
 
             if isinstance(msg.body, (raw.types.MsgDetailedInfo, raw.types.MsgNewDetailedInfo)):
                 self.pending_acks.add(msg.body.answer_msg_id)
@@ -254,9 +280,17 @@ class Session:
             elif isinstance(msg.body, raw.types.Pong):
                 msg_id = msg.body.msg_id
             else:
-                if self.client is not None:
+                # Pooled sessions only carry requests, updates are taken from the main session
+                if self.client is not None and not self.is_pooled:
                     self.loop.create_task(self.client.handle_updates(msg.body))
 
+            # Notifications about a container apply to every message it carried
+            if msg_id in self.containers:
+                for inner_msg_id in self.containers.pop(msg_id):
+                    if inner_msg_id in self.results:
+                        self.results[inner_msg_id].value = msg.body
+                        self.results[inner_msg_id].event.set()
+
             if msg_id in self.results:
                 self.results[msg_id].value = getattr(msg.body, "result", msg.body)
                 self.results[msg_id].event.set()
@@ -264,12 +298,14 @@ class Session:
         if len(self.pending_acks) >= self.ACKS_THRESHOLD:
             log.debug("Sending %s acks", len(self.pending_acks))
 
+            # Cleared right away, otherwise a batched send would append the same acks to its container again
+            acks = list(self.pending_acks)
+            self.pending_acks.clear()
+
             try:
-                await self.send(raw.types.MsgsAck(msg_ids=list(self.pending_acks)), False)
+                await self.send(raw.types.MsgsAck(msg_ids=acks), False)
             except OSError:
-                pass
-            else:
-                self.pending_acks.clear()
+                self.pending_acks.update(acks)
 
     async def ping_worker(self):
         log.info("PingTask started")
@@ -306,6 +342,12 @@ class Session:
                 if packet:
                     error_code = -Int.read(BytesIO(packet))
 
+                    if error_code == 404 and self.is_media:
+                        # The stored auth key of this DC is gone, the next request will create a new one
+                        log.warning("Auth key of the DC%s media session not found", self.dc_id)
+                        self.loop.create_task(self.client.forget_media_session(self.dc_id, self.is_cdn))
+                        break
+
                     if error_code == 404:
                         raise Exception(
                             "Auth key not found in the system. You must delete your session file"
@@ -335,21 +377,29 @@ class Session:
 
         log.debug("Sent: %s", message)
 
-        payload = await self.loop.run_in_executor(
-            kurimypyrogram.crypto_executor,
-            mtproto.pack,
-            message,
-            self.salt,
-            self.session_id,
-            self.auth_key,
-            self.auth_key_id
-        )
+        if self.batch_window and self.is_started.is_set() and message.length + 16 <= self.BATCH_MAX_SIZE:
+            try:
+                await self.enqueue(message)
+            except OSError as e:
+                self.results.pop(msg_id, None)
+                raise e
+        else:
+            payload = await kurimypyrogram.crypto_scheduler.run(
+                mtproto.pack,
+                message,
+                self.salt,
+                self.session_id,
+                self.auth_key,
+                self.auth_key_id,
+                key=(self.session_id, True),
+                size=message.length
+            )
 
-        try:
-            await self.connection.send(payload)
-        except OSError as e:
-            self.results.pop(msg_id, None)
-            raise e
+            try:
+                await self.connection.send(payload)
+            except OSError as e:
+                self.results.pop(msg_id, None)
+                raise e
 
         if wait_response:
             try:
@@ -377,6 +427,93 @@ class Session:
 
             return result
 
+    @property
+    def average_batch_size(self) -> float:
+        return self.batched_messages_sent / self.batches_sent if self.batches_sent else 0.0
+
+    async def enqueue(self, message: Message):
+        # 16 = msg_id (8) + seq_no (4) + length (4)
+        size = message.length + 16
+
+        if self.batch_queue_size + size > self.BATCH_MAX_SIZE:
+            self.flush()
+
+        future = self.loop.create_future()
+
+        self.batch_queue.append((message, future))
+        self.batch_queue_size += size
+
+        if len(self.batch_queue) >= self.BATCH_MAX_MESSAGES:
+            self.flush()
+        elif self.batch_handle is None:
+            self.batch_handle = self.loop.call_later(self.batch_window, self.flush)
+
+        await future
+
+    def flush(self):
+        if self.batch_handle is not None:
+            self.batch_handle.cancel()
+            self.batch_handle = None
+
+        if not self.batch_queue:
+            return
+
+        batch = self.batch_queue
+        self.batch_queue = []
+        self.batch_queue_size = 0
+
+        self.loop.create_task(self.send_batch(batch))
+
+    async def send_batch(self, batch: list):
+        messages = [message for message, _ in batch]
+        acks = None
+
+        if self.pending_acks:
+            acks = list(self.pending_acks)
+            self.pending_acks.clear()
+            messages.append(self.msg_factory(raw.types.MsgsAck(msg_ids=acks)))
+
+        if len(messages) == 1:
+            message = messages[0]
+        else:
+            # Forget containers whose messages have all been answered already
+            for container_msg_id, msg_ids in list(self.containers.items()):
+                if not any(msg_id in self.results for msg_id in msg_ids):
+                    del self.containers[container_msg_id]
+
+            message = self.msg_factory(MsgContainer(messages))
+            self.containers[message.msg_id] = [m.msg_id for m in messages]
+
+        log.debug("Sending batch of %s messages", len(messages))
+
+        try:
+            payload = await kurimypyrogram.crypto_scheduler.run(
+                mtproto.pack,
+                message,
+                self.salt,
+                self.session_id,
+                self.auth_key,
+                self.auth_key_id,
+                key=(self.session_id, True),
+                size=message.length
+            )
+
+            await self.connection.send(payload)
+        except Exception as e:
+            if acks:
+                self.pending_acks.update(acks)
+
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            self.batches_sent += 1
+            self.batched_messages_sent += len(batch)
+
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+
     async def invoke(
         self,
         query: TLObject,
@@ -389,19 +526,33 @@ class Session:
         except asyncio.TimeoutError:
             pass
 
-        if isinstance(query, (raw.functions.InvokeWithoutUpdates, raw.functions.InvokeWithTakeout)):
-            inner_query = query.query
-        else:
-            inner_query = query
+        inner_query = query
+
+        while isinstance(inner_query, (
+            raw.functions.InvokeWithoutUpdates,
+            raw.functions.InvokeWithTakeout,
+            raw.functions.InvokeWithBusinessConnection
+        )):
+            inner_query = inner_query.query
 
         query_name = ".".join(inner_query.QUALNAME.split(".")[1:])
+        retries = self.retry_policy.max_retries(query_name, retries)
+        attempt = 0
+
+        # Only new requests fail fast, those already admitted carry on with their retries
+        self.retry_policy.check(self.dc_id)
 
         while True:
             try:
-                return await self.send(query, timeout=timeout)
+                result = await self.send(query, timeout=timeout)
             except (FloodWait, FloodPremiumWait) as e:
+                self.retry_policy.record_success(self.dc_id)
+
                 amount = e.value
 
+                if self.client.flood_control is not None:
+                    self.client.flood_control.penalize(inner_query, amount)
+
                 if amount > sleep_threshold >= 0:
                     raise
 
@@ -410,15 +561,40 @@ class Session:
 
                 await asyncio.sleep(amount)
             except (OSError, InternalServerError, ServiceUnavailable) as e:
-                if retries == 0:
+                # Timeouts and requests cut short by a restart of the session tell nothing about the health of the DC
+                is_failure = not isinstance(e, TimeoutError) and self.is_started.is_set()
+
+                if is_failure:
+                    self.retry_policy.record_failure(self.dc_id)
+
+                if attempt >= retries:
+                    if not is_failure:
+                        self.retry_policy.release(self.dc_id)
+
                     raise e from None
 
-                (log.warning if retries < 2 else log.info)(
+                attempt += 1
+                self.retry_policy.record_retry(query_name, e)
+
+                (log.warning if retries - attempt < 2 else log.info)(
                     '[%s] Retrying "%s" due to: %s',
-                    Session.MAX_RETRIES - retries + 1,
-                    query_name, str(e) or repr(e)
+                    attempt, query_name, str(e) or repr(e)
                 )
 
-                await asyncio.sleep(0.5)
+                await asyncio.sleep(self.retry_policy.delay(attempt - 1))
+            except RPCError as e:
+                self.retry_policy.record_success(self.dc_id)
+
+                # The stored authorization of this DC was revoked, the next request will import a new one
+                if isinstance(e, AuthKeyUnregistered) and self.is_media:
+                    log.warning("[%s] Media session of DC%s is no longer authorized: %s", self.client.name, self.dc_id, e)
+                    await self.client.forget_media_session(self.dc_id, self.is_cdn)
 
-                return await self.invoke(query, retries - 1, timeout)
+                raise
+            except BaseException:
+                # Cancelled or failed on this side, the DC is neither healthy nor unhealthy
+                self.retry_policy.release(self.dc_id)
+                raise
+            else:
+                self.retry_policy.record_success(self.dc_id)
+                return result
@@ -47,6 +47,22 @@ CREATE TABLE update_state
 );
 """
 
+AUTH_KEYS_SCHEMA = """
+CREATE TABLE auth_keys
+(
+    dc_id    INTEGER PRIMARY KEY,
+    auth_key BLOB
+);
+"""
+
+UPLOADS_SCHEMA = """
+CREATE TABLE uploads
+(
+    key     TEXT PRIMARY KEY,
+    file_id TEXT
+);
+"""
+
 
 class FileStorage(SQLiteStorage):
     FILE_EXTENSION = ".session"
@@ -89,6 +105,18 @@ class FileStorage(SQLiteStorage):
 
             version += 1
 
+        if version == 6:
+            with self.conn:
+                self.conn.executescript(AUTH_KEYS_SCHEMA)
+
+            version += 1
+
+        if version == 7:
+            with self.conn:
+                self.conn.executescript(UPLOADS_SCHEMA)
+
+            version += 1
+
         self.version(version)
 
     async def open(self):
@@ -63,6 +63,18 @@ CREATE TABLE update_state
     seq  INTEGER
 );
 
+CREATE TABLE auth_keys
+(
+    dc_id    INTEGER PRIMARY KEY,
+    auth_key BLOB
+);
+
+CREATE TABLE uploads
+(
+    key     TEXT PRIMARY KEY,
+    file_id TEXT
+);
+
 CREATE TABLE version
 (
     number INTEGER PRIMARY KEY
@@ -106,7 +118,7 @@ def get_input_peer(peer_id: int, access_hash: int, peer_type: str):
 
 
 class SQLiteStorage(Storage):
-    VERSION = 6
+    VERSION = 8
     USERNAME_TTL = 8 * 60 * 60
 
     def __init__(self, name: str):
@@ -259,6 +271,48 @@ class SQLiteStorage(Storage):
     async def auth_key(self, value: bytes = object):
         return self._accessor(value)
 
+    async def dc_auth_key(self, dc_id: int, value: bytes = object):
+        if value == object:
+            r = self.conn.execute(
+                "SELECT auth_key FROM auth_keys WHERE dc_id = ?",
+                (dc_id,)
+            ).fetchone()
+
+            return r[0] if r else None
+        else:
+            with self.conn:
+                if value is None:
+                    self.conn.execute(
+                        "DELETE FROM auth_keys WHERE dc_id = ?",
+                        (dc_id,)
+                    )
+                else:
+                    self.conn.execute(
+                        "REPLACE INTO auth_keys (dc_id, auth_key) VALUES (?, ?)",
+                        (dc_id, value)
+                    )
+
+    async def upload_file_id(self, key: str, value: str = object):
+        if value == object:
+            r = self.conn.execute(
+                "SELECT file_id FROM uploads WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+            return r[0] if r else None
+        else:
+            with self.conn:
+                if value is None:
+                    self.conn.execute(
+                        "DELETE FROM uploads WHERE key = ?",
+                        (key,)
+                    )
+                else:
+                    self.conn.execute(
+                        "REPLACE INTO uploads (key, file_id) VALUES (?, ?)",
+                        (key, value)
+                    )
+
     async def date(self, value: int = object):
         return self._accessor(value)
 
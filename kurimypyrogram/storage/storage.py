@@ -162,6 +162,34 @@ class Storage(ABC):
         """
         raise NotImplementedError
 
+    async def dc_auth_key(self, dc_id: int, value: bytes = object):
+        """Get or set the authorization key used for media transfers on another DC.
+
+        Storages that don't implement this simply don't persist such keys and a new one is created every time.
+
+        Parameters:
+            dc_id (``int``):
+                The DC ID the authorization key belongs to.
+
+            value (``bytes``, *optional*):
+                The authorization key to set. Pass None to remove it.
+        """
+        return None
+
+    async def upload_file_id(self, key: str, value: str = object):
+        """Get or set the file id a previously uploaded file can be sent again with.
+
+        Storages that don't implement this simply don't remember uploads and files are uploaded every time.
+
+        Parameters:
+            key (``str``):
+                The key identifying the content of the uploaded file.
+
+            value (``str``, *optional*):
+                The file id to set. Pass None to remove it.
+        """
+        return None
+
     @abstractmethod
     async def date(self, value: int = object):
         """Get or set the date of the current session.
@@ -26,13 +26,13 @@ from concurrent.futures.thread import ThreadPoolExecutor
 from datetime import datetime, timezone
 from getpass import getpass
 import re
-from typing import Union, List, Dict, Optional
+from typing import Union, List, Dict, Optional, Iterator, Tuple
 
 import kurimypyrogram
 from kurimypyrogram import raw, enums
 from kurimypyrogram import types
 from kurimypyrogram.errors import AuthBytesInvalid
-from kurimypyrogram.file_id import FileId, FileType, PHOTO_TYPES, DOCUMENT_TYPES
+from kurimypyrogram.file_id import FileId, FileType, ThumbnailSource, PHOTO_TYPES, DOCUMENT_TYPES
 from kurimypyrogram.session import Session
 from kurimypyrogram.session.auth import Auth
 
@@ -91,6 +91,55 @@ def get_input_media_from_file_id(
     raise ValueError(f"Unknown file id: {file_id}")
 
 
+def get_file_id_from_media(
+    media: "raw.base.MessageMedia",
+    file_type: FileType
+) -> Optional[str]:
+    if isinstance(media, raw.types.MessageMediaPhoto) and isinstance(media.photo, raw.types.Photo):
+        return FileId(
+            file_type=file_type,
+            dc_id=media.photo.dc_id,
+            media_id=media.photo.id,
+            access_hash=media.photo.access_hash,
+            file_reference=media.photo.file_reference,
+            thumbnail_source=ThumbnailSource.THUMBNAIL,
+            thumbnail_file_type=FileType.PHOTO,
+            thumbnail_size=media.photo.sizes[-1].type,
+            volume_id=0,
+            local_id=0
+        ).encode()
+
+    if isinstance(media, raw.types.MessageMediaDocument) and isinstance(media.document, raw.types.Document):
+        return FileId(
+            file_type=file_type,
+            dc_id=media.document.dc_id,
+            media_id=media.document.id,
+            access_hash=media.document.access_hash,
+            file_reference=media.document.file_reference
+        ).encode()
+
+    return None
+
+
+def file_stamp(path: str) -> Optional[Tuple[str, int, int]]:
+    if not os.path.isfile(path):
+        return None
+
+    stat = os.stat(path)
+
+    return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+
+    with open(path, "rb") as f:
+        for chunk in iter(functools.partial(f.read, 1024 * 1024), b""):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
 async def parse_messages(
     client,
     messages: "raw.types.messages.Messages",
@@ -376,6 +425,33 @@ def get_channel_id(peer_id: int) -> int:
     return MAX_CHANNEL_ID - peer_id
 
 
+FILE_PART_MIN_SIZE = 4 * 1024
+FILE_PART_MAX_SIZE = 1024 * 1024
+
+
+def get_file_parts(start_byte: int, end_byte: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+    """Plan the (offset, limit) pairs of the file requests covering a byte range, both ends included.
+
+    Offsets and limits are multiples of 4 KiB, limits are powers of two dividing 1 MiB and no request crosses a 1 MiB
+    boundary, as required by upload.getFile. Requests are kept as large as possible, and only shrink near the end of
+    the range to avoid fetching much more than needed.
+    """
+    offset = start_byte - start_byte % FILE_PART_MIN_SIZE
+
+    while end_byte is None or offset <= end_byte:
+        limit = FILE_PART_MAX_SIZE
+
+        while offset % limit:
+            limit //= 2
+
+        while end_byte is not None and limit > FILE_PART_MIN_SIZE and offset + limit // 2 > end_byte:
+            limit //= 2
+
+        yield offset, limit
+
+        offset += limit
+
+
 def btoi(b: bytes) -> int:
     return int.from_bytes(b, "big")
 
@@ -0,0 +1,143 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+import os
+
+import pytest
+
+from kurimypyrogram.connection.transport import TCPAbridged
+from kurimypyrogram.connection.transport.tcp.tcp import FrameBuffer
+
+
+class FakeTransport:
+    def __init__(self):
+        self.is_reading = True
+
+    def pause_reading(self):
+        self.is_reading = False
+
+    def resume_reading(self):
+        self.is_reading = True
+
+    @staticmethod
+    def is_closing() -> bool:
+        return False
+
+
+def make_buffer() -> FrameBuffer:
+    buffer = FrameBuffer(asyncio.get_running_loop())
+    buffer.connection_made(FakeTransport())
+
+    return buffer
+
+
+def feed(buffer: FrameBuffer, data: bytes, chunk_size: int):
+    for i in range(0, len(data), chunk_size):
+        chunk = data[i:i + chunk_size]
+
+        while chunk:
+            target = buffer.get_buffer(len(chunk))
+            size = min(len(target), len(chunk))
+            target[:size] = chunk[:size]
+            # Like the event loop, don't hold on to the buffer, it may have to grow
+            target.release()
+            buffer.buffer_updated(size)
+            chunk = chunk[size:]
+
+
+async def feed_slowly(buffer: FrameBuffer, data: bytes, chunk_size: int):
+    for i in range(0, len(data), chunk_size):
+        await asyncio.sleep(0)
+        feed(buffer, data[i:i + chunk_size], chunk_size)
+
+
+@pytest.mark.asyncio
+async def test_small_reads():
+    buffer = make_buffer()
+    feed(buffer, b"abcdefgh", 3)
+
+    assert await buffer.read(2, 1) == b"ab"
+    assert await buffer.read(6, 1) == b"cdefgh"
+
+    read = asyncio.ensure_future(buffer.read(5, 1))
+    await feed_slowly(buffer, b"ijklm", 1)
+
+    assert await read == b"ijklm"
+
+
+@pytest.mark.asyncio
+async def test_frame_reassembly():
+    buffer = make_buffer()
+    frame = os.urandom(FrameBuffer.FRAME_THRESHOLD * 3 + 1)
+
+    # Part of the frame is already staged when it's requested, the rest goes straight into its own buffer
+    feed(buffer, frame[:100], 7)
+    read = asyncio.ensure_future(buffer.read(len(frame), 1))
+    await feed_slowly(buffer, frame[100:] + b"next", 1000)
+
+    assert bytes(await read) == frame
+    assert await buffer.read(4, 1) == b"next"
+
+
+@pytest.mark.asyncio
+async def test_backpressure():
+    buffer = make_buffer()
+    feed(buffer, bytes(FrameBuffer.HIGH_WATER + 1), 1000)
+
+    assert not buffer.transport.is_reading
+
+    await buffer.read(FrameBuffer.FRAME_THRESHOLD - 1, 1)
+
+    assert not buffer.transport.is_reading
+
+    while buffer.end - buffer.start > FrameBuffer.LOW_WATER:
+        await buffer.read(FrameBuffer.FRAME_THRESHOLD - 1, 1)
+
+    assert buffer.transport.is_reading
+
+
+@pytest.mark.asyncio
+async def test_abridged_frames():
+    frames = [os.urandom(size) for size in (4, 400, 64 * 1024, 1024 * 1024)]
+
+    async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        await reader.readexactly(1)
+
+        for frame in frames:
+            length = len(frame) // 4
+            data = (bytes([length]) if length <= 126 else b"\x7f" + length.to_bytes(3, "little")) + frame
+
+            # Frames are sent in pieces that don't line up with their boundaries
+            for i in range(0, len(data), 3001):
+                writer.write(data[i:i + 3001])
+                await writer.drain()
+
+        writer.close()
+
+    server = await asyncio.start_server(serve, "127.0.0.1", 0)
+    tcp = TCPAbridged(ipv6=False, proxy=None)
+
+    try:
+        await tcp.connect(("127.0.0.1", server.sockets[0].getsockname()[1]))
+
+        for frame in frames:
+            assert bytes(await tcp.recv()) == frame
+    finally:
+        await tcp.close()
+        server.close()
+        await server.wait_closed()
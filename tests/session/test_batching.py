@@ -0,0 +1,118 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from kurimypyrogram import raw
+from kurimypyrogram.crypto import mtproto
+from kurimypyrogram.raw.core import Message, MsgContainer
+from kurimypyrogram.session import Session, RetryPolicy
+from kurimypyrogram.session.session import Result
+
+
+class FakeConnection:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, data):
+        self.sent.append(data)
+
+
+def make_session(monkeypatch) -> Session:
+    # Packets are kept as plain messages, there's no need to encrypt them here
+    monkeypatch.setattr(mtproto, "pack", lambda message, *args: message)
+
+    client = SimpleNamespace(send_batch_window=0.01, retry_policy=RetryPolicy())
+    session = Session(client, 2, bytes(256), False)
+    session.connection = FakeConnection()
+    session.is_started.set()
+
+    return session
+
+
+def ping(ping_id: int) -> raw.functions.Ping:
+    return raw.functions.Ping(ping_id=ping_id)
+
+
+@pytest.mark.asyncio
+async def test_window(monkeypatch):
+    session = make_session(monkeypatch)
+    await asyncio.gather(session.send(ping(1), False), session.send(ping(2), False))
+
+    assert len(session.connection.sent) == 1
+
+    message = session.connection.sent[0]
+
+    assert isinstance(message.body, MsgContainer)
+    assert [m.body.ping_id for m in message.body.messages] == [1, 2]
+    assert session.containers[message.msg_id] == [m.msg_id for m in message.body.messages]
+    assert session.average_batch_size == 2
+
+
+@pytest.mark.asyncio
+async def test_flush_when_full(monkeypatch):
+    session = make_session(monkeypatch)
+    session.batch_window = 10
+    session.BATCH_MAX_MESSAGES = 2
+
+    await asyncio.wait_for(asyncio.gather(session.send(ping(1), False), session.send(ping(2), False)), 1)
+
+    assert len(session.connection.sent) == 1
+    assert session.batch_handle is None
+
+
+@pytest.mark.asyncio
+async def test_pending_acks_sent_once(monkeypatch):
+    session = make_session(monkeypatch)
+    session.pending_acks.update(range(1, 20, 2))
+
+    await session.send(ping(1), False)
+
+    acks = [m.body for m in session.connection.sent[0].body.messages if isinstance(m.body, raw.types.MsgsAck)]
+
+    assert acks == [raw.types.MsgsAck(msg_ids=list(range(1, 20, 2)))]
+    assert not session.pending_acks
+
+    # Acks sent once the threshold is reached aren't appended to their own batch again
+    session.pending_acks.update(range(1, 19, 2))
+    pong = Message(raw.types.Pong(msg_id=0, ping_id=0), 19, 1, 0)
+    monkeypatch.setattr(mtproto, "unpack", lambda *args: pong)
+
+    await session.handle_packet(b"")
+
+    assert session.connection.sent[1].body == raw.types.MsgsAck(msg_ids=list(range(1, 21, 2)))
+    assert not session.pending_acks
+
+
+@pytest.mark.asyncio
+async def test_container_notifications(monkeypatch):
+    session = make_session(monkeypatch)
+    session.containers[100] = [104, 108]
+    session.results[104] = Result()
+    session.results[108] = Result()
+
+    salt = raw.types.BadServerSalt(bad_msg_id=100, bad_msg_seqno=0, error_code=48, new_server_salt=1)
+    monkeypatch.setattr(mtproto, "unpack", lambda *args: Message(salt, 1, 0, 0))
+
+    await session.handle_packet(b"")
+
+    assert session.results[104].value is salt
+    assert session.results[108].value is salt
+    assert 100 not in session.containers
@@ -0,0 +1,123 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+from types import SimpleNamespace
+
+import pytest
+
+from kurimypyrogram import raw
+from kurimypyrogram.session import flood_control
+from kurimypyrogram.session.flood_control import FloodControl, TokenBucket
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0, sleeps=[])
+
+    async def sleep(delay: float):
+        clock.sleeps.append(round(delay, 6))
+        clock.now += delay
+
+    monkeypatch.setattr(flood_control, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    monkeypatch.setattr(flood_control, "asyncio", SimpleNamespace(sleep=sleep))
+
+    return clock
+
+
+def send_message(peer) -> raw.functions.messages.SendMessage:
+    return raw.functions.messages.SendMessage(peer=peer, message="test", random_id=0)
+
+
+def test_refill(clock):
+    bucket = TokenBucket(rate=2, capacity=2)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0.5
+    assert bucket.reserve() == 1
+
+    clock.now += 1
+
+    assert bucket.reserve() == 0.5
+
+    # Tokens don't pile up over the capacity
+    clock.now += 100
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0.5
+
+
+def test_penalize(clock):
+    bucket = TokenBucket(rate=2, capacity=2)
+    bucket.penalize(5)
+
+    assert bucket.rate == 1
+    assert bucket.reserve() == 5
+
+    # The rate slowly goes back to the original one
+    clock.now += 600
+
+    assert bucket.rate < 2
+    bucket.reserve()
+    assert bucket.rate == 2
+
+
+@pytest.mark.asyncio
+async def test_acquire(clock):
+    control = FloodControl()
+    user = raw.types.InputPeerUser(user_id=1, access_hash=0)
+
+    await control.acquire(send_message(user))
+    await control.acquire(send_message(user))
+
+    assert clock.sleeps == [1]
+    assert control.delayed == 1
+
+    # Other methods aren't throttled
+    await control.acquire(raw.functions.messages.GetHistory(
+        peer=user, offset_id=0, offset_date=0, add_offset=0, limit=1, max_id=0, min_id=0, hash=0
+    ))
+
+    assert clock.sleeps == [1]
+
+
+def test_buckets():
+    control = FloodControl()
+
+    assert len(control.get_buckets("messages.SendMessage", control.get_peer(send_message(raw.types.InputPeerSelf())))) == 2
+    assert len(control.get_buckets("messages.SendMessage", ("user_id", 1))) == 2
+    assert len(control.get_buckets("messages.SendMessage", ("channel_id", 1))) == 3
+    assert control.get_buckets("messages.GetHistory", ("channel_id", 1)) == []
+
+
+@pytest.mark.asyncio
+async def test_penalize_after_flood_wait(clock):
+    control = FloodControl()
+    chat = raw.types.InputPeerChat(chat_id=1)
+    other = raw.types.InputPeerChat(chat_id=2)
+
+    control.penalize(send_message(chat), 30)
+    await control.acquire(send_message(chat))
+
+    assert clock.sleeps == [30]
+    assert control.flood_waits == 1
+
+    clock.sleeps.clear()
+    await control.acquire(send_message(other))
+
+    assert clock.sleeps == []
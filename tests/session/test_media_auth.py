@@ -0,0 +1,71 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from kurimypyrogram import raw
+from kurimypyrogram.errors import AuthKeyUnregistered
+from kurimypyrogram.session import Session, RetryPolicy
+
+
+class FakeClient:
+    name = "test"
+    send_batch_window = None
+    flood_control = None
+
+    def __init__(self):
+        self.retry_policy = RetryPolicy()
+        self.forgotten = []
+
+    async def forget_media_session(self, dc_id: int, is_cdn: bool = False):
+        self.forgotten.append((dc_id, is_cdn))
+
+
+@pytest.mark.asyncio
+async def test_revoked_authorization():
+    client = FakeClient()
+    session = Session(client, 4, bytes(256), False, is_media=True)
+    session.is_started.set()
+
+    async def send(*args, **kwargs):
+        raise AuthKeyUnregistered()
+
+    session.send = send
+
+    with pytest.raises(AuthKeyUnregistered):
+        await session.invoke(raw.functions.upload.SaveFilePart(file_id=0, file_part=0, bytes=b""))
+
+    assert client.forgotten == [(4, False)]
+
+
+@pytest.mark.asyncio
+async def test_missing_cdn_auth_key():
+    client = FakeClient()
+    session = Session(client, 203, bytes(256), False, is_media=True, is_cdn=True)
+
+    async def recv():
+        return (-404).to_bytes(4, "little", signed=True)
+
+    session.connection = SimpleNamespace(recv=recv)
+
+    await session.recv_worker()
+    await asyncio.sleep(0)
+
+    assert client.forgotten == [(203, True)]
@@ -0,0 +1,141 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from kurimypyrogram.session import MediaSessionPool
+from kurimypyrogram.session import media_pool
+
+
+class FakeSession:
+    def __init__(self, *msg_ids):
+        self.dc_id = 2
+        self.auth_key = bytes(256)
+        self.test_mode = False
+        self.is_cdn = False
+        self.connection = None
+        self.results = dict.fromkeys(msg_ids)
+        self.stopped = False
+
+    async def stop(self):
+        self.stopped = True
+
+
+class NewSession(FakeSession):
+    """Session opened by the pool, connecting until *connected* is set."""
+
+    connected: asyncio.Event = None
+    started = []
+
+    def __init__(self, client, dc_id, auth_key, test_mode, is_media=False, is_cdn=False):
+        super().__init__()
+        NewSession.started.append(self)
+
+    async def start(self):
+        self.connection = object()
+        await NewSession.connected.wait()
+
+
+@pytest.fixture
+def new_sessions(monkeypatch):
+    monkeypatch.setattr(media_pool, "Session", NewSession)
+    NewSession.connected = asyncio.Event()
+    NewSession.started = []
+
+    return NewSession
+
+
+def test_least_busy_session():
+    first = FakeSession(1, 2)
+    second = FakeSession(3)
+
+    pool = MediaSessionPool(SimpleNamespace(name="test"), first)
+    pool.sessions.append(second)
+    pool.last_used[second] = 0
+
+    assert pool.get() is second
+    assert pool.grow_task is None
+
+    second.results.update({4: None, 5: None})
+
+    assert pool.get() is first
+
+
+@pytest.mark.asyncio
+async def test_grow_under_load(new_sessions):
+    first = FakeSession(1)
+    pool = MediaSessionPool(SimpleNamespace(name="test"), first, max_size=2)
+
+    try:
+        # Every session is busy, a new one is opened in the background
+        assert pool.get() is first
+        assert pool.grow_task is not None
+
+        new_sessions.connected.set()
+        await pool.grow_task
+
+        assert len(pool) == 2 and pool.opened == 1
+        assert pool.get() is new_sessions.started[0]
+
+        # The pool is full, it doesn't grow anymore
+        new_sessions.started[0].results[2] = None
+        pool.get()
+
+        assert pool.grow_task is None
+    finally:
+        await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_reap_idle_sessions(new_sessions):
+    first = FakeSession(1)
+    pool = MediaSessionPool(SimpleNamespace(name="test"), first, max_size=2, idle_timeout=0.02)
+
+    try:
+        new_sessions.connected.set()
+        pool.get()
+        await pool.grow_task
+
+        second = new_sessions.started[0]
+
+        await asyncio.sleep(0.1)
+
+        # The first session is kept, even though it's idle as well
+        assert pool.sessions == [first]
+        assert second.stopped and pool.closed == 1
+    finally:
+        await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_while_growing(new_sessions):
+    first = FakeSession(1)
+    pool = MediaSessionPool(SimpleNamespace(name="test"), first, max_size=2)
+
+    pool.get()
+    await asyncio.sleep(0)
+
+    # The new session never manages to connect
+    await asyncio.wait_for(pool.stop(), 1)
+
+    assert first.stopped
+    assert new_sessions.started[0].stopped
+    assert len(pool) == 0
@@ -0,0 +1,61 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from kurimypyrogram.session.internals import MsgIdWindow
+
+
+def test_duplicate():
+    window = MsgIdWindow(4)
+    window.add(100)
+    window.add(104)
+
+    assert 100 in window
+    assert 104 in window
+    assert 108 not in window
+
+
+def test_lower_than_stored():
+    window = MsgIdWindow(4)
+    window.add(100)
+    window.add(104)
+
+    assert window.is_below(96)
+    assert not window.is_below(100)
+    assert not window.is_below(102)
+
+
+def test_eviction():
+    window = MsgIdWindow(4)
+
+    for msg_id in range(100, 124, 4):
+        window.add(msg_id)
+
+    assert len(window) == 4
+    assert 100 not in window
+    assert 104 not in window
+    assert window.is_below(104)
+    assert not window.is_below(108)
+
+
+def test_clear():
+    window = MsgIdWindow(4)
+    window.add(100)
+    window.clear()
+
+    assert not window
+    assert not window.is_below(0)
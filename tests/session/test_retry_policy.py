@@ -0,0 +1,214 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from kurimypyrogram import raw
+from kurimypyrogram.session import Session, RetryPolicy
+from kurimypyrogram.session import retry_policy
+from kurimypyrogram.session.retry_policy import CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(retry_policy, "time", SimpleNamespace(monotonic=lambda: clock.now))
+
+    return clock
+
+
+def test_open_after_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10)
+
+    for _ in range(2):
+        breaker.record_failure()
+        assert breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_half_open_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+    breaker.record_failure()
+
+    clock.now += 10
+
+    # A single trial is let through
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    clock.now += 10
+
+    assert breaker.allow()
+
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+    assert breaker.allow()
+
+
+def test_trial_without_outcome(clock):
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+    breaker.record_failure()
+    clock.now += 10
+
+    assert breaker.allow()
+
+    breaker.release()
+
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    # A trial that never ends is given up on after the recovery timeout
+    clock.now += 10
+
+    assert breaker.allow()
+
+
+def test_backoff():
+    policy = RetryPolicy(base_delay=0.5, max_delay=3, jitter=False)
+
+    assert [policy.delay(attempt) for attempt in range(5)] == [0.5, 1, 2, 3, 3]
+
+    policy = RetryPolicy(base_delay=1, max_delay=30)
+
+    for _ in range(100):
+        assert 2 <= policy.delay(2) <= 4
+
+
+def test_fail_fast(clock):
+    policy = RetryPolicy(failure_threshold=1)
+    policy.record_failure(2)
+
+    with pytest.raises(ConnectionError):
+        policy.check(2)
+
+    policy.check(4)
+
+    assert policy.fast_failures == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial(clock):
+    client = SimpleNamespace(send_batch_window=None, retry_policy=RetryPolicy(failure_threshold=1), name="test")
+    session = Session(client, 2, bytes(256), False)
+    session.is_started.set()
+
+    sending = asyncio.Event()
+
+    async def send(*args, **kwargs):
+        sending.set()
+        await asyncio.sleep(10)
+
+    session.send = send
+
+    client.retry_policy.record_failure(2)
+    clock.now += RetryPolicy.RECOVERY_TIMEOUT
+
+    task = asyncio.ensure_future(session.invoke(raw.functions.help.GetConfig()))
+    await sending.wait()
+    task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # The DC doesn't fail fast forever because the trial never got an answer
+    client.retry_policy.check(2)
+
+
+def test_no_breaker_by_default():
+    policy = RetryPolicy()
+
+    for _ in range(100):
+        policy.record_failure(2)
+
+    policy.check(2)
+
+    assert policy.fast_failures == 0
+
+
+def make_session(policy: RetryPolicy, send) -> Session:
+    client = SimpleNamespace(send_batch_window=None, retry_policy=policy, name="test")
+    session = Session(client, 2, bytes(256), False)
+    session.is_started.set()
+    session.send = send
+
+    return session
+
+
+@pytest.mark.asyncio
+async def test_retries_once_admitted(clock):
+    policy = RetryPolicy(base_delay=0, failure_threshold=1)
+    attempts = 0
+
+    async def send(*args, **kwargs):
+        nonlocal attempts
+        attempts += 1
+
+        if attempts < 3:
+            raise ConnectionResetError("Connection lost")
+
+        return True
+
+    session = make_session(policy, send)
+
+    # The breaker opens on the first failure, the request keeps retrying nonetheless
+    assert await session.invoke(raw.functions.help.GetConfig())
+    assert attempts == 3
+    assert policy.breaker(2).state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_timeouts_are_not_failures(clock):
+    policy = RetryPolicy(base_delay=0, failure_threshold=1)
+
+    async def send(*args, **kwargs):
+        raise TimeoutError("Request timed out")
+
+    with pytest.raises(TimeoutError):
+        await make_session(policy, send).invoke(raw.functions.help.GetConfig(), retries=3)
+
+    policy.check(2)
+
+
+@pytest.mark.asyncio
+async def test_restarts_are_not_failures(clock):
+    policy = RetryPolicy(base_delay=0, failure_threshold=1)
+
+    async def send(*args, **kwargs):
+        session.is_started.clear()
+        raise OSError("Session stopped")
+
+    session = make_session(policy, send)
+
+    with pytest.raises(OSError):
+        await session.invoke(raw.functions.help.GetConfig(), retries=3)
+
+    policy.check(2)
@@ -0,0 +1,76 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from kurimypyrogram.storage import FileStorage, MemoryStorage
+
+
+@pytest.mark.asyncio
+async def test_dc_auth_key():
+    storage = MemoryStorage("test")
+    await storage.open()
+
+    assert await storage.dc_auth_key(4) is None
+
+    await storage.dc_auth_key(4, b"\x01" * 256)
+    assert await storage.dc_auth_key(4) == b"\x01" * 256
+
+    await storage.dc_auth_key(4, None)
+    assert await storage.dc_auth_key(4) is None
+
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_update(tmp_path):
+    storage = FileStorage("test", tmp_path)
+    await storage.open()
+
+    with storage.conn:
+        storage.conn.execute("DROP TABLE auth_keys")
+        storage.conn.execute("DROP TABLE uploads")
+
+    storage.version(6)
+    await storage.close()
+
+    storage = FileStorage("test", tmp_path)
+    await storage.open()
+
+    assert storage.version() == storage.VERSION
+    await storage.dc_auth_key(2, b"\x02" * 256)
+    assert await storage.dc_auth_key(2) == b"\x02" * 256
+    await storage.upload_file_id("photo:abc", "file_id")
+
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_upload_file_id():
+    storage = MemoryStorage("test")
+    await storage.open()
+
+    assert await storage.upload_file_id("document:abc") is None
+
+    await storage.upload_file_id("document:abc", "file_id")
+    assert await storage.upload_file_id("document:abc") == "file_id"
+
+    await storage.upload_file_id("document:abc", None)
+    assert await storage.upload_file_id("document:abc") is None
+
+    await storage.close()
@@ -0,0 +1,117 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+import os
+from hashlib import sha256
+
+import pytest
+
+from kurimypyrogram import raw
+from kurimypyrogram.client import Client
+from kurimypyrogram.crypto import aes
+from kurimypyrogram.file_id import FileId, FileType
+
+# Smaller than the real 128 KiB parts, to keep the pure Python AES fallback quick
+PART_SIZE = 16 * 1024
+KEY = bytes(range(32))
+IV = bytes(range(12)) + bytes(4)
+
+
+class FakeSession:
+    def __init__(self, client):
+        self.client = client
+
+    async def invoke(self, query, *args, **kwargs):
+        return self.client.handle(query)
+
+
+class FakeClient:
+    get_file = Client.get_file
+    CDN_HASH_PART_SIZE = PART_SIZE
+    MEDIA_AUTH_RETRIES = Client.MEDIA_AUTH_RETRIES
+
+    def __init__(self, data: bytes, tampered: int = None):
+        self.data = data
+        self.encrypted = bytearray(aes.ctr256_encrypt(data, KEY, bytearray(IV)))
+        self.hashes = [
+            raw.types.FileHash(offset=i, limit=len(data[i:i + PART_SIZE]), hash=sha256(data[i:i + PART_SIZE]).digest())
+            for i in range(0, len(data), PART_SIZE)
+        ]
+        self.requests = []
+
+        if tampered is not None:
+            self.encrypted[tampered] ^= 0xFF
+
+        self.loop = asyncio.get_event_loop()
+        self.get_file_semaphore = asyncio.Semaphore(1)
+        self.download_window = 4
+
+    async def get_media_session(self, dc_id):
+        return FakeSession(self)
+
+    async def get_cdn_session(self, dc_id):
+        return FakeSession(self)
+
+    def handle(self, query):
+        if isinstance(query, raw.functions.upload.GetFile):
+            return raw.types.upload.FileCdnRedirect(
+                dc_id=1, file_token=b"token", encryption_key=KEY, encryption_iv=IV, file_hashes=self.hashes[:1]
+            )
+
+        if isinstance(query, raw.functions.upload.GetCdnFileHashes):
+            return [h for h in self.hashes if h.offset >= query.offset][:8]
+
+        self.requests.append((query.offset, query.limit))
+
+        return raw.types.upload.CdnFile(bytes=bytes(self.encrypted[query.offset:query.offset + query.limit]))
+
+
+async def download(client: FakeClient, start_byte: int, end_byte: int) -> bytes:
+    file_id = FileId(file_type=FileType.DOCUMENT, dc_id=2, media_id=1, access_hash=1)
+
+    return b"".join([
+        chunk async for chunk in client.get_file(
+            file_id, len(client.data), start_byte=start_byte, end_byte=end_byte
+        )
+    ])
+
+
+@pytest.mark.asyncio
+async def test_unaligned_range():
+    data = os.urandom(3 * PART_SIZE + 1000)
+    client = FakeClient(data)
+
+    assert await download(client, PART_SIZE + 1000, PART_SIZE + 5000) == data[PART_SIZE + 1000:PART_SIZE + 5001]
+    assert set(client.requests) == {(PART_SIZE, PART_SIZE)}
+
+
+@pytest.mark.asyncio
+async def test_tail():
+    data = os.urandom(3 * PART_SIZE + 1000)
+    client = FakeClient(data)
+
+    assert await download(client, 3 * PART_SIZE + 100, None) == data[3 * PART_SIZE + 100:]
+
+
+@pytest.mark.asyncio
+async def test_tampered_part_outside_range():
+    data = os.urandom(3 * PART_SIZE)
+    # The corrupted byte is outside the requested range, but inside the hash part it lies in
+    client = FakeClient(data, tampered=PART_SIZE + 100)
+
+    assert await download(client, PART_SIZE + 1000, PART_SIZE + 5000) == b""
@@ -0,0 +1,91 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+import threading
+import time
+
+import pytest
+
+import kurimypyrogram
+from kurimypyrogram.crypto.scheduler import CryptoScheduler
+
+
+@pytest.mark.asyncio
+async def test_same_key_order():
+    scheduler = CryptoScheduler(4)
+    done = []
+
+    def job(i: int) -> int:
+        # Earlier jobs take longer, they would finish last if they overlapped
+        time.sleep((20 - i) / 2000)
+        done.append(i)
+        return i
+
+    # Small payloads run inline only while no job with the same key is pending
+    sizes = [CryptoScheduler.INLINE_SIZE + 1 if i % 3 == 1 else CryptoScheduler.INLINE_SIZE for i in range(20)]
+    results = await asyncio.gather(*(scheduler.run(job, i, key="a", size=size) for i, size in enumerate(sizes)))
+
+    assert results == list(range(20))
+    assert done == list(range(20))
+    assert scheduler.inline_jobs > 0
+    assert not scheduler.tails
+
+
+@pytest.mark.asyncio
+async def test_different_keys_in_parallel():
+    scheduler = CryptoScheduler(2)
+    barrier = threading.Barrier(2, timeout=1)
+
+    # Both jobs must be running at the same time to get past the barrier
+    await asyncio.gather(scheduler.run(barrier.wait, key="a"), scheduler.run(barrier.wait, key="b"))
+
+
+@pytest.mark.asyncio
+async def test_cancelled_job_keeps_order():
+    scheduler = CryptoScheduler(2)
+    done = []
+
+    def job(i: int):
+        time.sleep(0.02)
+        done.append(i)
+
+    first = asyncio.ensure_future(scheduler.run(job, 0, key="a"))
+    second = asyncio.ensure_future(scheduler.run(job, 1, key="a"))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    await second
+
+    assert done == [0, 1]
+
+
+def test_executor_after_resize():
+    scheduler = kurimypyrogram.crypto_scheduler
+    executor = kurimypyrogram.crypto_executor
+    workers = scheduler.workers
+
+    try:
+        scheduler.set_workers(2)
+
+        assert kurimypyrogram.crypto_executor is scheduler.executor
+        assert kurimypyrogram.crypto_executor is not executor
+    finally:
+        # The scheduler is shared with every other test
+        scheduler.set_workers(workers)
+
+    assert scheduler.workers == workers
@@ -0,0 +1,130 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from kurimypyrogram import enums, types
+from kurimypyrogram.download_manager import DownloadManager
+from kurimypyrogram.file_id import FileId, FileType
+
+
+def document(media_id: int, dc_id: int, file_size: int) -> SimpleNamespace:
+    file_id = FileId(file_type=FileType.DOCUMENT, dc_id=dc_id, media_id=media_id, access_hash=0, file_reference=b"")
+    return SimpleNamespace(file_id=file_id.encode(), file_size=file_size)
+
+
+def message(media_id: int, dc_id: int, file_size: int) -> types.Message:
+    file_id = FileId(file_type=FileType.DOCUMENT, dc_id=dc_id, media_id=media_id, access_hash=0, file_reference=b"")
+
+    return types.Message(
+        id=media_id,
+        media=enums.MessageMediaType.DOCUMENT,
+        document=types.Document(file_id=file_id.encode(), file_unique_id=f"unique{media_id}", file_size=file_size)
+    )
+
+
+class FakeClient:
+    def __init__(self, path: Path):
+        self.PARENT_DIR = path
+        self.loop = asyncio.get_event_loop()
+        self.active = {}
+        self.max_active = {}
+        self.started = []
+
+    @staticmethod
+    def guess_extension(mime_type: str):
+        return None
+
+    @staticmethod
+    def rnd_id() -> int:
+        return 0
+
+    async def handle_download(self, packet, semaphore=None):
+        file_id, directory, file_name, *_ = packet
+        dc_id = file_id.dc_id
+
+        self.started.append((dc_id, file_id.media_id))
+        self.active[dc_id] = self.active.get(dc_id, 0) + 1
+        self.max_active[dc_id] = max(self.max_active.get(dc_id, 0), self.active[dc_id])
+
+        await asyncio.sleep(0.01)
+
+        self.active[dc_id] -= 1
+
+        path = directory / file_name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"\0" * file_id.media_id)
+
+        return str(path)
+
+
+@pytest.mark.asyncio
+async def test_fair_scheduling(tmp_path):
+    client = FakeClient(tmp_path)
+    messages = [document(size, 1, size) for size in (50, 40, 30, 20, 10)] + [document(5, 4, 5)]
+
+    downloads = DownloadManager(client, messages, "files/", concurrency=2, per_dc_limit=1)
+    results = [result async for result in downloads]
+
+    assert len(results) == 6 and all(result.path for result in results)
+    # DCs take turns, and the smallest files of each DC go first
+    assert client.started[:3] == [(1, 10), (4, 5), (1, 20)]
+    assert client.max_active == {1: 1, 4: 1}
+    assert (downloads.completed, downloads.failed, downloads.downloaded) == (6, 0, 155)
+    assert downloads.throughput > 0
+
+
+@pytest.mark.asyncio
+async def test_missing_media(tmp_path):
+    downloads = DownloadManager(FakeClient(tmp_path), [SimpleNamespace()], "files/")
+    results = [result async for result in downloads]
+
+    assert results[0].path is None and isinstance(results[0].error, ValueError)
+    assert downloads.failed == 1
+
+
+@pytest.mark.asyncio
+async def test_dest_without_separator(tmp_path):
+    client = FakeClient(tmp_path)
+    messages = [document(10, 1, 10), message(20, 1, 20)]
+
+    results = [result async for result in DownloadManager(client, messages, "files")]
+
+    assert all(Path(result.path).parent == tmp_path / "files" for result in results)
+    assert tmp_path / "files" / "document_unique20.zip" in [Path(result.path) for result in results]
+
+
+@pytest.mark.asyncio
+async def test_duplicates(tmp_path):
+    client = FakeClient(tmp_path)
+    messages = [message(10, 1, 10), message(20, 1, 20), message(10, 1, 10)]
+
+    downloads = DownloadManager(client, messages, "files/")
+    results = [result async for result in downloads]
+
+    # The same media is downloaded once, and every message gets its file
+    assert sorted(client.started) == [(1, 10), (1, 20)]
+    shared = [result for result in results if result.size == 10]
+
+    assert [result.message for result in shared] == [messages[0], messages[2]]
+    assert shared[0].path == shared[1].path
+    assert (downloads.completed, downloads.failed, downloads.downloaded) == (3, 0, 30)
@@ -0,0 +1,112 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+
+import pytest
+
+from kurimypyrogram.download_sink import DownloadSink
+
+
+@pytest.mark.asyncio
+async def test_out_of_order_writes(tmp_path):
+    path = str(tmp_path / "file.temp")
+    data = os.urandom(10 * 16 + 5)
+
+    sink = DownloadSink(path, len(data), chunk_size=16)
+    await sink.open()
+
+    assert os.path.getsize(path) == len(data)
+
+    for index in reversed(range(sink.chunks)):
+        await sink.write(index, data[index * 16:(index + 1) * 16])
+
+    assert sink.is_complete
+
+    await sink.finish(len(data))
+
+    with open(path, "rb") as f:
+        assert f.read() == data
+
+    assert not os.path.exists(path + DownloadSink.SIDECAR_EXTENSION)
+
+
+@pytest.mark.asyncio
+async def test_chunk_map_is_kept(tmp_path):
+    path = str(tmp_path / "file.temp")
+
+    sink = DownloadSink(path, 64, chunk_size=16)
+    await sink.open()
+    await sink.write(0, b"a" * 16)
+    await sink.write(2, b"c" * 16)
+    await sink.close()
+
+    sink = DownloadSink(path, 64, chunk_size=16)
+    await sink.open()
+
+    assert sink.has(0) and sink.has(2)
+    assert sink.first_missing() == 1
+    assert not sink.is_complete
+
+    await sink.discard()
+
+    assert not os.path.exists(path)
+
+
+@pytest.mark.asyncio
+async def test_stale_chunk_map(tmp_path):
+    path = str(tmp_path / "file.temp")
+
+    sink = DownloadSink(path, 64, chunk_size=16)
+    await sink.open()
+    await sink.write(0, b"a" * 16)
+    await sink.close()
+
+    sink = DownloadSink(path, 128, chunk_size=16)
+    await sink.open()
+
+    assert sink.first_missing() == 0
+
+    await sink.discard()
+
+
+@pytest.mark.asyncio
+async def test_not_resumable(tmp_path):
+    path = str(tmp_path / "file.temp")
+
+    sink = DownloadSink(path, 64, chunk_size=16)
+    await sink.open()
+    await sink.write(0, b"a" * 16)
+    await sink.close()
+
+    # A stale chunk map would otherwise claim chunks of the overwritten file later on
+    sink = DownloadSink(path, 64, chunk_size=16, resumable=False)
+    await sink.open()
+
+    assert not os.path.exists(path + DownloadSink.SIDECAR_EXTENSION)
+    assert sink.first_missing() == 0
+
+    for index in range(4):
+        await sink.write(index, b"b" * 16)
+
+    assert not os.path.exists(path + DownloadSink.SIDECAR_EXTENSION)
+
+    await sink.finish(64)
+
+    with open(path, "rb") as f:
+        assert f.read() == b"b" * 64
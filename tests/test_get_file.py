@@ -0,0 +1,141 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+import os
+
+import pytest
+
+from kurimypyrogram import raw
+from kurimypyrogram.client import Client
+from kurimypyrogram.errors import AuthKeyUnregistered
+from kurimypyrogram.file_id import FileId, FileType
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class FakeSession:
+    def __init__(self, client):
+        self.client = client
+
+    async def invoke(self, query, *args, **kwargs):
+        return await self.client.handle(query)
+
+
+class FakeClient:
+    get_file = Client.get_file
+    name = "test"
+    MEDIA_AUTH_RETRIES = Client.MEDIA_AUTH_RETRIES
+
+    def __init__(self, data: bytes, download_window: int = 4):
+        self.data = data
+        self.loop = asyncio.get_event_loop()
+        self.get_file_semaphore = asyncio.Semaphore(1)
+        self.download_window = download_window
+        self.sessions = 0
+        self.unauthorized = 0
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self.delay = lambda offset: 0
+
+    async def get_media_session(self, dc_id):
+        self.sessions += 1
+        return FakeSession(self)
+
+    async def handle(self, query):
+        if self.unauthorized:
+            self.unauthorized -= 1
+            raise AuthKeyUnregistered()
+
+        self.requests.append(query.offset)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+
+        try:
+            await asyncio.sleep(self.delay(query.offset))
+        finally:
+            self.active -= 1
+
+        return raw.types.upload.File(
+            type=raw.types.storage.FilePartial(),
+            mtime=0,
+            bytes=self.data[query.offset:query.offset + query.limit]
+        )
+
+
+async def download(client: FakeClient, file_size: int = None, **kwargs) -> bytes:
+    file_id = FileId(file_type=FileType.DOCUMENT, dc_id=2, media_id=1, access_hash=1)
+    file_size = len(client.data) if file_size is None else file_size
+
+    return b"".join([chunk async for chunk in client.get_file(file_id, file_size, **kwargs)])
+
+
+@pytest.mark.asyncio
+async def test_window():
+    data = os.urandom(8 * CHUNK_SIZE)
+    client = FakeClient(data, download_window=3)
+    client.delay = lambda offset: 0.01
+
+    assert await download(client) == data
+    assert client.max_active == 3
+
+
+@pytest.mark.asyncio
+async def test_out_of_order_responses():
+    data = os.urandom(6 * CHUNK_SIZE)
+    client = FakeClient(data, download_window=6)
+    # Later chunks are answered first
+    client.delay = lambda offset: 0.05 - offset / CHUNK_SIZE * 0.01
+
+    assert await download(client) == data
+
+
+@pytest.mark.asyncio
+async def test_short_last_chunk():
+    data = os.urandom(2 * CHUNK_SIZE + 1000)
+    client = FakeClient(data, download_window=4)
+
+    # With an unknown size the stream stops at the first chunk shorter than requested
+    assert await download(client, file_size=0) == data
+    assert client.active == 0
+
+    client.requests.clear()
+
+    # With a known size nothing past the end of the file is requested
+    assert await download(client) == data
+    assert client.requests == [0, CHUNK_SIZE, 2 * CHUNK_SIZE]
+
+
+@pytest.mark.asyncio
+async def test_unregistered_auth_key():
+    data = os.urandom(2 * CHUNK_SIZE + 10)
+    client = FakeClient(data)
+    client.unauthorized = Client.MEDIA_AUTH_RETRIES
+
+    # The request is retried on a new session every time
+    assert await download(client) == data
+    assert client.sessions == 3 + Client.MEDIA_AUTH_RETRIES
+
+
+@pytest.mark.asyncio
+async def test_unregistered_auth_key_for_good():
+    client = FakeClient(os.urandom(10))
+    client.unauthorized = Client.MEDIA_AUTH_RETRIES + 1
+
+    with pytest.raises(AuthKeyUnregistered):
+        await download(client)
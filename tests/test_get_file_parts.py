@@ -0,0 +1,59 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import itertools
+
+from kurimypyrogram.utils import get_file_parts
+
+KiB = 1024
+MiB = 1024 * KiB
+
+
+def check(parts, start_byte, end_byte):
+    assert parts[0][0] <= start_byte
+    assert parts[-1][0] + parts[-1][1] > end_byte
+
+    for (offset, limit), (next_offset, _) in zip(parts, parts[1:]):
+        assert offset + limit == next_offset
+
+    for offset, limit in parts:
+        assert offset % (4 * KiB) == 0
+        assert MiB % limit == 0
+        assert offset // MiB == (offset + limit - 1) // MiB
+
+
+def test_small_range():
+    parts = list(get_file_parts(5000, 9000))
+
+    check(parts, 5000, 9000)
+    assert parts == [(4 * KiB, 4 * KiB), (8 * KiB, 4 * KiB)]
+
+
+def test_large_range():
+    start_byte, end_byte = 3 * KiB, 5 * MiB + 10
+
+    parts = list(get_file_parts(start_byte, end_byte))
+
+    check(parts, start_byte, end_byte)
+    assert sum(limit for _, limit in parts) < end_byte - start_byte + 2 * MiB
+
+
+def test_open_range():
+    parts = list(itertools.islice(get_file_parts(MiB - 4 * KiB), 3))
+
+    assert parts == [(MiB - 4 * KiB, 4 * KiB), (MiB, MiB), (2 * MiB, MiB)]
@@ -0,0 +1,118 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from weakref import WeakValueDictionary
+
+import pytest
+
+from kurimypyrogram.client import Client
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class FakeClient:
+    handle_download = Client.handle_download
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.media_cache = None
+        self.executor = ThreadPoolExecutor(2)
+        self.download_locks = WeakValueDictionary()
+        self.active = 0
+        self.max_active = 0
+        self.offsets = []
+
+    async def get_file(self, file_id, file_size, limit, offset, *args, **kwargs):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        self.offsets.append(offset)
+
+        try:
+            for index in range(offset, (len(self.data) + CHUNK_SIZE - 1) // CHUNK_SIZE):
+                # The file reference expires after the first chunk
+                if file_id == "expired" and index > offset:
+                    return
+
+                await asyncio.sleep(0.001)
+                yield self.data[index * CHUNK_SIZE:(index + 1) * CHUNK_SIZE]
+        finally:
+            self.active -= 1
+
+
+@pytest.mark.asyncio
+async def test_same_target(tmp_path):
+    data = os.urandom(3 * CHUNK_SIZE)
+    client = FakeClient(data)
+    packet = (None, str(tmp_path), "file.bin", False, len(data), None, (), True, None)
+
+    paths = await asyncio.gather(client.handle_download(packet), client.handle_download(packet))
+
+    assert paths == [str(tmp_path / "file.bin")] * 2
+    assert client.max_active == 1
+    assert not client.download_locks
+
+    with open(paths[0], "rb") as f:
+        assert f.read() == data
+
+
+@pytest.mark.asyncio
+async def test_no_chunk_map_without_resume(tmp_path):
+    data = os.urandom(1024)
+    client = FakeClient(data)
+    packet = (None, str(tmp_path), "file.bin", False, len(data), None, (), False, None)
+
+    path = await client.handle_download(packet)
+
+    assert os.listdir(tmp_path) == ["file.bin"]
+
+    with open(path, "rb") as f:
+        assert f.read() == data
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("resume", [False, True])
+async def test_truncated(tmp_path, resume):
+    data = os.urandom(CHUNK_SIZE + 10)
+    client = FakeClient(data)
+    # The file ends before its expected size, as when the download stops early
+    packet = (None, str(tmp_path), "file.bin", False, 3 * CHUNK_SIZE, None, (), resume, None)
+
+    assert await client.handle_download(packet) is None
+    assert not (tmp_path / "file.bin").exists()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("resume", [False, True])
+async def test_refresh(tmp_path, resume):
+    data = os.urandom(3 * CHUNK_SIZE)
+    client = FakeClient(data)
+
+    async def refresh():
+        return "fresh"
+
+    packet = ("expired", str(tmp_path), "file.bin", False, len(data), None, (), resume, refresh)
+
+    path = await client.handle_download(packet)
+
+    # The download carries on from where the expired file reference stopped it
+    assert client.offsets == [0, 1]
+
+    with open(path, "rb") as f:
+        assert f.read() == data
@@ -0,0 +1,98 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+import pytest
+
+from kurimypyrogram import raw
+from kurimypyrogram.raw.all import updates as update_constructors
+from kurimypyrogram.raw.core import TLObject, tl_object
+
+
+def updates() -> raw.types.Updates:
+    return raw.types.Updates(
+        updates=[
+            raw.types.UpdateNewMessage(
+                message=raw.types.Message(
+                    id=1,
+                    peer_id=raw.types.PeerChannel(channel_id=1),
+                    date=1700000000,
+                    message="é" * 300,
+                    entities=[raw.types.MessageEntityBold(offset=0, length=1)],
+                    views=3,
+                    forwards=4
+                ),
+                pts=2,
+                pts_count=1
+            ),
+            raw.types.UpdateUserStatus(user_id=1, status=raw.types.UserStatusOnline(expires=1))
+        ],
+        users=[raw.types.User(id=1, access_hash=-1, first_name="a", stories_max_id=7)],
+        chats=[],
+        date=1700000000,
+        seq=0
+    )
+
+
+@pytest.fixture
+def lazy():
+    tl_object.lazy.update(update_constructors)
+    yield
+    tl_object.lazy.clear()
+
+
+def test_skip_from():
+    data = updates().write() + b"trailing"
+
+    assert TLObject.skip_from(memoryview(data), 0) == TLObject.read_from(memoryview(data), 0)[1]
+
+
+def test_lazy_updates(lazy):
+    data = updates().write()
+    obj, cursor = TLObject.read_from(memoryview(data), 0)
+
+    assert cursor == len(data)
+    assert [type(u) for u in obj.updates] == [raw.types.UpdateNewMessage, raw.types.UpdateUserStatus]
+
+    status = obj.updates[1]
+
+    # Missing attributes don't decode the object
+    assert getattr(status, "pts", None) is None
+    assert hasattr(status, "_view")
+
+    assert status.status.expires == 1
+    assert not hasattr(status, "_view")
+
+
+def test_same_objects(lazy):
+    data = updates().write()
+    obj, _ = TLObject.read_from(memoryview(data), 0)
+
+    tl_object.lazy.clear()
+
+    assert obj == TLObject.read_from(memoryview(data), 0)[0]
+    assert obj.write() == TLObject.read_from(memoryview(data), 0)[0].write()
+
+
+def test_lazy_classes_only(lazy):
+    data = updates().write()
+    obj, _ = TLObject.read_from(memoryview(data), 0)
+
+    # The view is a copy, not a slice keeping the whole packet alive
+    assert type(obj.updates[1]._view) is bytes
+    assert "__getattr__" in vars(raw.types.UpdateUserStatus)
+    assert "__getattr__" not in vars(raw.types.Updates)
+    assert "__getattr__" not in vars(raw.types.Message)
@@ -0,0 +1,41 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import pytest
+
+from kurimypyrogram import raw
+from kurimypyrogram.raw.core import Vector
+
+
+def test_objects():
+    assert raw.objects[raw.types.User.ID] is raw.types.User
+    assert raw.objects[Vector.ID] is Vector
+
+    with pytest.raises(KeyError):
+        raw.objects[0]
+
+
+def test_namespaces():
+    from kurimypyrogram.raw.functions.messages import SendMessage
+
+    assert raw.functions.messages.SendMessage is SendMessage
+    assert "SendMessage" in dir(raw.functions.messages)
+    assert "messages" in dir(raw.functions)
+
+    with pytest.raises(AttributeError):
+        raw.types.NotAType
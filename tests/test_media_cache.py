@@ -0,0 +1,137 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+import os
+
+import pytest
+
+from kurimypyrogram.file_id import FileId, FileType, ThumbnailSource
+from kurimypyrogram.media_cache import MediaCache
+
+
+def document(media_id: int) -> FileId:
+    return FileId(file_type=FileType.DOCUMENT, dc_id=2, media_id=media_id, access_hash=0, file_reference=b"")
+
+
+def photo(media_id: int, size: str) -> FileId:
+    return FileId(
+        file_type=FileType.PHOTO, dc_id=2, media_id=media_id, access_hash=0, file_reference=b"",
+        thumbnail_source=ThumbnailSource.THUMBNAIL, thumbnail_file_type=FileType.PHOTO, thumbnail_size=size,
+        volume_id=0, local_id=0
+    )
+
+
+def test_key():
+    assert MediaCache.key(photo(1, "m")) != MediaCache.key(photo(1, "x"))
+    assert MediaCache.key(document(1)) == MediaCache.key(document(1))
+
+
+@pytest.mark.asyncio
+async def test_hit_and_miss(tmp_path):
+    cache = MediaCache(tmp_path)
+    data = os.urandom(3000)
+
+    assert await cache.get(document(1)) is None
+
+    await cache.put(document(1), data)
+    path = await cache.get(document(1))
+
+    assert path.read_bytes() == data
+    assert b"".join([chunk async for chunk in cache.stream(path, 1000, 1999, 512)]) == data[1000:2000]
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert not list(tmp_path.glob("*" + MediaCache.TEMP_EXTENSION))
+
+
+@pytest.mark.asyncio
+async def test_eviction(tmp_path):
+    cache = MediaCache(tmp_path, max_size=2500)
+
+    await cache.put(document(1), bytes(1000))
+    await cache.put(document(2), bytes(1000))
+    await cache.get(document(1))
+    await cache.put(document(3), bytes(1000))
+
+    assert await cache.get(document(2)) is None
+    assert await cache.get(document(1)) is not None
+    assert cache.size == 2000
+    assert cache.evictions == 1
+
+    assert MediaCache(tmp_path).size == 2000
+
+
+@pytest.mark.asyncio
+async def test_streamed_entry_not_evicted(tmp_path):
+    cache = MediaCache(tmp_path, max_size=1500)
+    data = os.urandom(1000)
+
+    await cache.put(document(1), data)
+    path = await cache.get(document(1))
+    chunks = cache.stream(path, chunk_size=100)
+
+    await cache.put(document(2), bytes(1000))
+
+    assert path.exists()
+    assert b"".join([chunk async for chunk in chunks]) == data
+    assert not cache.readers
+
+    await cache.put(document(3), bytes(100))
+
+    assert not path.exists()
+    assert cache.size == 1100
+
+
+@pytest.mark.asyncio
+async def test_stream_closed_early(tmp_path):
+    cache = MediaCache(tmp_path, max_size=1500)
+
+    await cache.put(document(1), bytes(1000))
+    path = await cache.get(document(1))
+    chunks = cache.stream(path, chunk_size=100)
+
+    assert await chunks.__anext__() == bytes(100)
+
+    await chunks.aclose()
+
+    assert not cache.readers
+
+    await cache.put(document(2), bytes(1000))
+
+    assert await cache.get(document(1)) is None
+
+
+@pytest.mark.asyncio
+async def test_copied_entry_not_evicted(tmp_path):
+    cache = MediaCache(tmp_path, max_size=1500)
+    data = os.urandom(1000)
+
+    await cache.put(document(1), data)
+    path = await cache.get(document(1))
+    copy = cache.copy(path, str(tmp_path / "copy"))
+    # Evict while the copy waits for the executor
+    run = cache.run
+
+    async def put_then_run(func, *args):
+        cache.run = run
+        await cache.put(document(2), bytes(1000))
+        return await run(func, *args)
+
+    cache.run = put_then_run
+    await copy
+
+    assert (tmp_path / "copy").read_bytes() == data
+    assert path.exists()
@@ -0,0 +1,156 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from kurimypyrogram import raw
+from kurimypyrogram.errors import FloodWait
+from kurimypyrogram.methods.advanced import save_file
+from kurimypyrogram.methods.advanced.save_file import PartUploader
+
+
+class FakeSession:
+    def __init__(self, invoke):
+        self.invoke = invoke
+
+
+class FakeClient:
+    name = "test"
+
+    def __init__(self, invoke):
+        self.loop = asyncio.get_event_loop()
+        self.session = FakeSession(invoke)
+
+    async def get_media_session(self, dc_id):
+        return self.session
+
+
+def part(index: int):
+    return raw.functions.upload.SaveFilePart(file_id=1, file_part=index, bytes=bytes(1024))
+
+
+async def upload(uploader: PartUploader, parts: int):
+    try:
+        for i in range(parts):
+            await uploader.put(part(i))
+
+        await uploader.join()
+    finally:
+        await uploader.close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Skip the waits between retries, keeping track of them."""
+    sleeps = []
+    sleep = asyncio.sleep
+
+    async def fake_sleep(delay, *args, **kwargs):
+        sleeps.append(delay)
+        await sleep(0)
+
+    monkeypatch.setattr(save_file.asyncio, "sleep", fake_sleep)
+
+    return sleeps
+
+
+@pytest.mark.asyncio
+async def test_workers_grow():
+    active = 0
+    max_active = 0
+
+    async def invoke(rpc):
+        nonlocal active, max_active
+
+        active += 1
+        max_active = max(max_active, active)
+
+        try:
+            # A fixed latency per part, so that the throughput grows with the workers
+            await asyncio.wait([asyncio.get_event_loop().create_future()], timeout=0.01)
+        finally:
+            active -= 1
+
+    uploader = PartUploader(FakeClient(invoke), 1, workers=1, max_workers=4)
+
+    await upload(uploader, 40)
+
+    assert uploader.target == 4
+    assert max_active == 4
+
+
+@pytest.mark.asyncio
+async def test_flood_wait_halves_workers(sleeps, monkeypatch):
+    # A frozen clock makes the throughput of a round depend only on its number of parts
+    monkeypatch.setattr(save_file, "time", SimpleNamespace(monotonic=lambda: 0.0))
+    flooded = set()
+
+    async def invoke(rpc):
+        if rpc.file_part == 10 and rpc.file_part not in flooded:
+            flooded.add(rpc.file_part)
+            raise FloodWait(3)
+
+        await asyncio.wait([asyncio.get_event_loop().create_future()], timeout=0.01)
+
+    uploader = PartUploader(FakeClient(invoke), 1, workers=4, max_workers=4)
+
+    await upload(uploader, 20)
+
+    assert uploader.target == 2
+    assert sleeps == [3]
+
+
+@pytest.mark.asyncio
+async def test_retries(sleeps):
+    attempts = {}
+
+    async def invoke(rpc):
+        attempts[rpc.file_part] = attempts.get(rpc.file_part, 0) + 1
+
+        if rpc.file_part == 2 and attempts[rpc.file_part] < PartUploader.MAX_RETRIES:
+            raise OSError("Connection lost")
+
+    uploader = PartUploader(FakeClient(invoke), 1, workers=2, max_workers=2)
+
+    await upload(uploader, 5)
+
+    assert attempts == {0: 1, 1: 1, 2: PartUploader.MAX_RETRIES, 3: 1, 4: 1}
+    assert sleeps == list(range(1, PartUploader.MAX_RETRIES))
+
+
+@pytest.mark.asyncio
+async def test_retry_limit(sleeps):
+    error = OSError("Connection lost")
+    attempts = 0
+
+    async def invoke(rpc):
+        nonlocal attempts
+
+        if rpc.file_part == 0:
+            attempts += 1
+            raise error
+
+    uploader = PartUploader(FakeClient(invoke), 1, workers=1, max_workers=1)
+
+    with pytest.raises(OSError) as e:
+        await upload(uploader, 5)
+
+    assert e.value is error
+    assert attempts == PartUploader.MAX_RETRIES
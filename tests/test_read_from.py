@@ -0,0 +1,63 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from io import BytesIO
+
+from kurimypyrogram import raw
+from kurimypyrogram.raw.core import TLObject, GzipPacked, Message, MsgContainer
+
+
+def updates() -> raw.types.Updates:
+    return raw.types.Updates(
+        updates=[
+            raw.types.UpdateNewMessage(
+                message=raw.types.Message(
+                    id=i,
+                    peer_id=raw.types.PeerUser(user_id=i),
+                    date=1700000000,
+                    message="é" * i,
+                    entities=[raw.types.MessageEntityBold(offset=0, length=i)]
+                ),
+                pts=i,
+                pts_count=1
+            )
+            for i in range(3)
+        ],
+        users=[raw.types.User(id=1, access_hash=-1, first_name="a" * 300, stories_max_id=7)],
+        chats=[],
+        date=1700000000,
+        seq=0
+    )
+
+
+def test_same_objects():
+    data = updates().write() + b"trailing"
+    obj, cursor = TLObject.read_from(memoryview(data), 0)
+
+    assert str(obj) == str(TLObject.read(BytesIO(data)))
+    assert data[cursor:] == b"trailing"
+
+
+def test_container():
+    body = GzipPacked(updates()).write()
+    data = MsgContainer([Message(GzipPacked(updates()), 1, 1, len(body))]).write()
+
+    container, cursor = TLObject.read_from(memoryview(data), 0)
+
+    assert cursor == len(data)
+    assert str(container.messages[0].body) == str(TLObject.read(BytesIO(updates().write())))
@@ -0,0 +1,128 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from kurimypyrogram import raw, types
+from kurimypyrogram.methods.messages.send_media_group import SendMediaGroup
+
+
+class Sent(Exception):
+    """Raised in place of sending the group, once every item is uploaded."""
+
+
+class FakeParser:
+    async def parse(self, text, mode):
+        return {"message": text or "", "entities": None}
+
+
+class FakeClient(SendMediaGroup):
+    def __init__(self, failing: str = None):
+        self.loop = asyncio.get_event_loop()
+        self.parser = FakeParser()
+        self.failing = failing
+        self.active = 0
+        self.max_active = 0
+        self.uploaded = []
+        self.cancelled = []
+
+    @staticmethod
+    def rnd_id() -> int:
+        return 0
+
+    @staticmethod
+    def guess_mime_type(file_name):
+        return None
+
+    async def resolve_peer(self, peer_id):
+        return raw.types.InputPeerSelf()
+
+    async def get_upload_key(self, *args, **kwargs):
+        return None
+
+    async def get_cached_upload_media(self, *args):
+        return None
+
+    async def set_cached_upload(self, *args):
+        pass
+
+    async def save_file(self, path):
+        if path is None:
+            return None
+
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+
+        try:
+            await asyncio.sleep(0.01 if path == self.failing else 0.1)
+
+            if path == self.failing:
+                raise OSError("Upload failed")
+
+            self.uploaded.append(path)
+        except asyncio.CancelledError:
+            self.cancelled.append(path)
+            raise
+        finally:
+            self.active -= 1
+
+        return path
+
+    async def invoke(self, query, **kwargs):
+        if isinstance(query, raw.functions.messages.SendMultiMedia):
+            raise Sent(query)
+
+        return SimpleNamespace(document=SimpleNamespace(id=1, access_hash=1, file_reference=b""))
+
+
+def documents(tmp_path, count: int) -> list:
+    paths = []
+
+    for i in range(count):
+        path = tmp_path / f"{i}.txt"
+        path.write_bytes(b"data")
+        paths.append(str(path))
+
+    return paths
+
+
+@pytest.mark.asyncio
+async def test_concurrent_uploads(tmp_path):
+    paths = documents(tmp_path, 3)
+    client = FakeClient()
+
+    with pytest.raises(Sent):
+        await client.send_media_group("me", [types.InputMediaDocument(path) for path in paths])
+
+    assert client.max_active == 3
+    assert sorted(client.uploaded) == paths
+
+
+@pytest.mark.asyncio
+async def test_failure_cancels_uploads(tmp_path):
+    paths = documents(tmp_path, 3)
+    client = FakeClient(failing=paths[1])
+
+    with pytest.raises(OSError):
+        await client.send_media_group("me", [types.InputMediaDocument(path) for path in paths])
+
+    # The other uploads were stopped and waited for, not left running
+    assert sorted(client.cancelled) == [paths[0], paths[2]]
+    assert client.active == 0 and not client.uploaded
@@ -0,0 +1,132 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from kurimypyrogram import raw
+from kurimypyrogram.client import Client
+from kurimypyrogram.crypto import mtproto
+from kurimypyrogram.methods.advanced.invoke import Invoke
+from kurimypyrogram.raw.core import Message
+from kurimypyrogram.session import Session, RetryPolicy
+
+
+class FakeSession:
+    def __init__(self, is_pooled: bool = False):
+        self.is_pooled = is_pooled
+        self.results = {}
+        self.sent = []
+
+    async def invoke(self, query, retries, timeout, sleep_threshold):
+        # Keep the request in flight for a while, like a real session does
+        self.results[len(self.sent)] = None
+        self.sent.append(query)
+        await asyncio.sleep(0.01)
+
+        return True
+
+
+class FakeClient(Invoke):
+    SINGLE_FLIGHT_QUERIES = Client.SINGLE_FLIGHT_QUERIES
+
+    def __init__(self, pool_size: int):
+        self.is_connected = True
+        self.flood_control = None
+        self.session = FakeSession()
+        self.session_pool = [FakeSession(is_pooled=True) for _ in range(pool_size)]
+        self.no_updates = False
+        self.takeout_id = None
+        self.sleep_threshold = 10
+        self.loop = asyncio.get_event_loop()
+        self.inflight_queries = {}
+
+    async def fetch_peers(self, peers):
+        pass
+
+
+def query(i: int) -> raw.functions.messages.ReadHistory:
+    return raw.functions.messages.ReadHistory(peer=raw.types.InputPeerSelf(), max_id=i)
+
+
+@pytest.mark.asyncio
+async def test_spread_across_sessions():
+    client = FakeClient(pool_size=2)
+
+    await asyncio.gather(*(client.invoke(query(i)) for i in range(6)))
+
+    # Every call goes to the session with the fewest requests in flight
+    assert [len(s.sent) for s in (client.session, *client.session_pool)] == [2, 2, 2]
+
+
+@pytest.mark.asyncio
+async def test_pooled_without_updates():
+    client = FakeClient(pool_size=1)
+
+    await asyncio.gather(client.invoke(query(1)), client.invoke(query(2)))
+
+    assert client.session.sent == [query(1)]
+    assert client.session_pool[0].sent == [raw.functions.InvokeWithoutUpdates(query=query(2))]
+
+
+class FakeConnection:
+    async def close(self):
+        pass
+
+
+def make_session(is_pooled: bool) -> Session:
+    async def handle_updates(updates):
+        client.updates.append(updates)
+
+    async def disconnect_handler(c):
+        client.disconnects += 1
+
+    client = SimpleNamespace(
+        send_batch_window=None, retry_policy=RetryPolicy(), name="test",
+        updates=[], handle_updates=handle_updates, disconnects=0, disconnect_handler=disconnect_handler
+    )
+
+    session = Session(client, 2, bytes(256), False, is_pooled=is_pooled)
+    session.connection = FakeConnection()
+
+    return session
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("is_pooled", [False, True])
+async def test_pooled_session_updates(monkeypatch, is_pooled):
+    session = make_session(is_pooled)
+    updates = raw.types.UpdatesTooLong()
+    monkeypatch.setattr(mtproto, "unpack", lambda *args: Message(updates, 2, 0, 0))
+
+    await session.handle_packet(b"")
+    await asyncio.sleep(0)
+
+    # Only the main session dispatches updates
+    assert session.client.updates == ([] if is_pooled else [updates])
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("is_pooled", [False, True])
+async def test_pooled_session_disconnect(is_pooled):
+    session = make_session(is_pooled)
+
+    await session.stop()
+
+    assert session.client.disconnects == (0 if is_pooled else 1)
@@ -0,0 +1,103 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+
+import pytest
+
+from kurimypyrogram import raw
+from kurimypyrogram.client import Client
+from kurimypyrogram.errors import UsernameNotOccupied
+from kurimypyrogram.methods.advanced.invoke import Invoke
+
+
+class FakeSession:
+    is_pooled = False
+
+    def __init__(self, result):
+        self.result = result
+        self.results = {}
+        self.sent = []
+
+    async def invoke(self, query, retries, timeout, sleep_threshold):
+        self.sent.append((query, retries, timeout, sleep_threshold))
+        await asyncio.sleep(0.01)
+
+        if isinstance(self.result, Exception):
+            raise self.result
+
+        return self.result
+
+
+class FakeClient(Invoke):
+    SINGLE_FLIGHT_QUERIES = Client.SINGLE_FLIGHT_QUERIES
+
+    def __init__(self, result):
+        self.is_connected = True
+        self.flood_control = None
+        self.session = FakeSession(result)
+        self.session_pool = []
+        self.no_updates = False
+        self.takeout_id = None
+        self.sleep_threshold = 10
+        self.loop = asyncio.get_event_loop()
+        self.inflight_queries = {}
+        self.single_flight_hits = 0
+        self.single_flight_misses = 0
+
+    async def fetch_peers(self, peers):
+        pass
+
+
+def resolve(username: str) -> raw.functions.contacts.ResolveUsername:
+    return raw.functions.contacts.ResolveUsername(username=username)
+
+
+@pytest.mark.asyncio
+async def test_single_request():
+    client = FakeClient(result=object())
+
+    results = await asyncio.gather(*(client.invoke(resolve("a")) for _ in range(3)), client.invoke(resolve("b")))
+
+    assert len(client.session.sent) == 2
+    assert results[0] is results[1] is results[2]
+    assert client.single_flight_hits == 2
+    assert not client.inflight_queries
+
+
+@pytest.mark.asyncio
+async def test_shared_exception():
+    client = FakeClient(result=UsernameNotOccupied())
+
+    results = await asyncio.gather(*(client.invoke(resolve("a")) for _ in range(3)), return_exceptions=True)
+
+    assert len(client.session.sent) == 1
+    assert all(isinstance(r, UsernameNotOccupied) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_different_options():
+    client = FakeClient(result=object())
+
+    await asyncio.gather(
+        client.invoke(resolve("a")),
+        client.invoke(resolve("a"), retries=0),
+        client.invoke(resolve("a"), timeout=1),
+        client.invoke(resolve("a"), sleep_threshold=0)
+    )
+
+    assert len(client.session.sent) == 4
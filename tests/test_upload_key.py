@@ -0,0 +1,87 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+import io
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from kurimypyrogram.client import Client
+from kurimypyrogram.file_id import FileType
+
+
+class FakeClient:
+    get_file_digest = Client.get_file_digest
+    get_upload_key = Client.get_upload_key
+    UPLOAD_HASHES_MAX_SIZE = Client.UPLOAD_HASHES_MAX_SIZE
+
+    def __init__(self):
+        self.upload_cache = True
+        self.upload_hashes = {}
+        self.executor = ThreadPoolExecutor(1)
+        self.loop = asyncio.get_event_loop()
+
+
+@pytest.mark.asyncio
+async def test_attributes(tmp_path):
+    client = FakeClient()
+    path = tmp_path / "file.bin"
+    path.write_bytes(b"content")
+
+    key = await client.get_upload_key(str(path), FileType.DOCUMENT, None, False)
+
+    assert key == await client.get_upload_key(str(path), FileType.DOCUMENT, None, False)
+    assert key != await client.get_upload_key(str(path), FileType.DOCUMENT, "other.bin", False)
+    assert key != await client.get_upload_key(str(path), FileType.DOCUMENT, None, True)
+    assert key != await client.get_upload_key(str(path), FileType.VIDEO, None, False)
+
+    shutil.copy(path, tmp_path / "file.zip")
+
+    assert key != await client.get_upload_key(str(tmp_path / "file.zip"), FileType.DOCUMENT, None, False)
+
+
+@pytest.mark.asyncio
+async def test_photo_name(tmp_path):
+    client = FakeClient()
+    (tmp_path / "a.jpg").write_bytes(b"photo")
+    (tmp_path / "b.jpg").write_bytes(b"photo")
+
+    key = await client.get_upload_key(str(tmp_path / "a.jpg"), FileType.PHOTO)
+
+    assert key is not None
+    assert key == await client.get_upload_key(str(tmp_path / "b.jpg"), FileType.PHOTO)
+
+
+@pytest.mark.asyncio
+async def test_thumb(tmp_path):
+    client = FakeClient()
+    path = tmp_path / "video.mp4"
+    thumb = tmp_path / "thumb.jpg"
+    path.write_bytes(b"video")
+    thumb.write_bytes(b"thumb")
+
+    key = await client.get_upload_key(str(path), FileType.VIDEO, thumb=str(thumb))
+
+    assert key != await client.get_upload_key(str(path), FileType.VIDEO)
+
+    thumb.write_bytes(b"other thumb")
+
+    assert key != await client.get_upload_key(str(path), FileType.VIDEO, thumb=str(thumb))
+    assert await client.get_upload_key(str(path), FileType.VIDEO, thumb=io.BytesIO(b"thumb")) is None
+    assert await client.get_upload_key(str(path), FileType.VIDEO, thumb=str(tmp_path / "missing.jpg")) is None
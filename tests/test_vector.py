@@ -0,0 +1,40 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from io import BytesIO
+
+from kurimypyrogram import raw
+from kurimypyrogram.raw.core import TLObject, Vector
+from kurimypyrogram.raw.core.primitives import Int, Long
+
+
+def test_bare_vectors():
+    assert TLObject.read(BytesIO(Vector([1, 2, 3], Int))) == [1, 2, 3]
+    assert TLObject.read(BytesIO(Vector([1, 2, 3], Long))) == [1, 2, 3]
+    assert TLObject.read(BytesIO(Vector([]))) == []
+
+
+def test_object_vectors():
+    users = [raw.types.User(id=i, first_name=str(i)) for i in range(3)]
+    data = raw.types.contacts.Contacts(contacts=[], saved_count=0, users=users).write()
+
+    b = BytesIO(data + b"trailing")
+    contacts = TLObject.read(b)
+
+    assert [(user.id, user.first_name) for user in contacts.users] == [(user.id, user.first_name) for user in users]
+    assert b.read() == b"trailing"
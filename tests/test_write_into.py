@@ -0,0 +1,51 @@
+#  kurimypyrogram - Telegram MTProto API Client Library for Python
+#  Copyright (C) 2017-present Dan <https://github.com/delivrance>
+#
+#  This file is part of kurimypyrogram.
+#
+#  kurimypyrogram is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU Lesser General Public License as published
+#  by the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#
+#  kurimypyrogram is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public License
+#  along with kurimypyrogram.  If not, see <http://www.gnu.org/licenses/>.
+
+from io import BytesIO
+
+from kurimypyrogram import raw
+from kurimypyrogram.raw.core import TLObject, MsgContainer, Message
+from kurimypyrogram.session.internals import MsgFactory
+
+
+def query() -> raw.functions.messages.SendMessage:
+    return raw.functions.messages.SendMessage(
+        peer=raw.types.InputPeerUser(user_id=1, access_hash=-1),
+        message="é" * 300,
+        random_id=2 ** 63 - 1,
+        entities=[raw.types.MessageEntityBold(offset=0, length=7)],
+        no_webpage=True
+    )
+
+
+def test_shared_buffer():
+    b = bytearray(b"head")
+    query().write_into(b)
+
+    assert b == b"head" + query().write()
+    assert TLObject.read(BytesIO(query().write())).write() == query().write()
+
+
+def test_msg_factory():
+    factory = MsgFactory()
+    messages = [factory(query()), factory(raw.types.MsgsAck(msg_ids=[1, 2]))]
+    container = factory(MsgContainer(messages))
+
+    assert messages[0].data == query().write()
+    assert container.length == len(MsgContainer(messages).write())
+    assert Message.read(BytesIO(container.write())).body.messages[0].body.write() == query().write()